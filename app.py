@@ -11,15 +11,26 @@ Endpoints:
     GET  /news       -> Obtiene noticias desde la base de datos.
     GET  /preview    -> Ejecuta la ingesta de noticias desde NewsAPI sin guardarlas.
     POST /ingest     -> Ejecuta la ingesta completa y persiste en la base de datos.
+    GET  /stats/sources    -> Artículos por día y fuente (tablas de agregados).
+    GET  /stats/categories -> Artículos por día y categoría (tablas de agregados).
 """
 
 import logging
+import re
 from flask import Flask, jsonify, request
-from datetime import datetime, timedelta, timezone
-from src.repositories.db import init_engine
-from src.config.settings import DATABASE_URL, is_enable_scheduler, is_debug
+from datetime import date, datetime, timedelta, timezone
+from src.repositories.db import init_engine, init_read_engine
+from src.config.settings import (
+    DATABASE_URL, DATABASE_READ_URL, READ_STALENESS_SECS, PREVIEW_CACHE_TTL_SECS, PREVIEW_WAIT_SECS,
+    INGEST_WAIT_SECS,
+    is_enable_scheduler, is_debug
+)
 from src.pipelines.ingestion import run_ingestion, process_ingestion
-from sqlalchemy import text
+from src.repositories.stats import get_source_stats, get_category_stats
+from src.repositories.news import NEWS_LIST_FIELDS, list_news_rows
+from src.repositories.run_coordinator import RunInProgressError
+from src.utils.query_builder import keyword_fingerprint
+from src.utils.ttl_cache import SingleFlightCache
 from scheduler import start_scheduler
 
 # Configuración global de logging
@@ -32,6 +43,16 @@ logging.basicConfig(
 # Inicialización de la aplicación Flask
 app = Flask(__name__)
 
+# Resultados recientes de /preview: peticiones idénticas simultáneas comparten una sola ingesta
+preview_cache = SingleFlightCache(ttl_secs=PREVIEW_CACHE_TTL_SECS, wait_timeout_secs=PREVIEW_WAIT_SECS)
+
+def _read_engine():
+    """
+    Motor para los endpoints de solo lectura: la réplica `DATABASE_READ_URL` si existe,
+    o la primaria justo después de una ingesta (ver `init_read_engine`).
+    """
+    return init_read_engine(DATABASE_URL, DATABASE_READ_URL, READ_STALENESS_SECS)
+
 @app.get("/")
 def check():
     """
@@ -45,44 +66,85 @@ def check():
 # -------------------------------
 # 1) GET /news -> Lectura desde DB
 # -------------------------------
+# Fecha y hora con un desfase `+hh:mm` cuyo `+` llegó sin codificar y se leyó como espacio
+_OFFSET_AS_SPACE = re.compile(r"(\d{4}-\d{2}-\d{2}[T ][\d:.]+) (\d{2}(?::?\d{2})?)")
+
+def _published_bound(value: str, end: bool = False):
+    """
+    Convierte `published_from` / `published_to` (fecha o fecha y hora ISO 8601) a datetime UTC.
+    Una fecha sin hora como límite superior incluye el día completo. Un desfase
+    `+hh:mm` sin codificar en la URL llega como espacio y se interpreta como `+`.
+    """
+    if not value:
+        return None
+    m = _OFFSET_AS_SPACE.fullmatch(value)
+    if m:
+        value = f"{m.group(1)}+{m.group(2)}"
+    dt = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        dt += timedelta(days=1)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+def _news_params():
+    """
+    Lee y valida los parámetros de `GET /news`.
+
+    Returns:
+        tuple: (limit, offset, fields | None, filtros para `list_news_rows`)
+
+    Raises:
+        ValueError: Si algún número, fecha o campo no es válido.
+    """
+    args = request.args
+    limit = max(1, min(int(args.get("limit", 50)), 200))
+    offset = max(0, int(args.get("offset", 0)))
+    fields = [f.strip() for f in args["fields"].split(",") if f.strip()] if args.get("fields") else None
+    unknown = [f for f in fields or () if f not in NEWS_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos no válidos en fields: {', '.join(unknown)}")
+    filters = {
+        "source_name": args.get("source_name") or None,
+        "author": args.get("author") or None,
+        "published_from": _published_bound(args.get("published_from")),
+        "published_to": _published_bound(args.get("published_to"), end=True),
+        "category": (args.get("category") or "").strip() or None,
+        "keyword": (args.get("keyword") or "").strip() or None,
+    }
+    return limit, offset, fields, filters
+
 @app.get("/news")
 def list_news():
     """
     Obtiene una lista paginada de noticias desde la base de datos.
-    No realiza llamadas a la API externa.
+    No realiza llamadas a la API externa. Los filtros se aplican en SQL.
 
     Query Params:
         limit (int, opcional): Número máximo de noticias a devolver (1-200, por defecto 50).
         offset (int, opcional): Número de registros a saltar para paginación (por defecto 0).
+        source_name (str, opcional): Solo noticias de esta fuente.
+        author (str, opcional): Solo noticias de este autor (sin distinguir mayúsculas).
+        published_from (str, opcional): Publicadas desde esta fecha (YYYY-MM-DD o ISO 8601;
+            el `+` de un desfase puede enviarse codificado, `%2B`, o tal cual).
+        published_to (str, opcional): Publicadas hasta esta fecha (incluida si es YYYY-MM-DD).
+        category (str, opcional): Solo noticias con alguna keyword de esta categoría (AI, MARKETING).
+        keyword (str, opcional): Solo noticias que contienen este término de `news_keywords`.
+        fields (str, opcional): Columnas a devolver separadas por comas (p. ej. `url,title`).
 
     Returns:
         JSON con estado, número de resultados y la lista de noticias.
     """
     try:
-        # Validación de parámetros
-        limit = max(1, min(int(request.args.get("limit", 50)), 200))
-        offset = max(0, int(request.args.get("offset", 0)))
+        try:
+            limit, offset, fields, filters = _news_params()
+        except ValueError as e:
+            # Parámetros mal formados (números, fechas o campos no válidos)
+            return jsonify({"status": "error", "message": str(e)}), 400
 
-        # Conexión a base de datos
-        engine = init_engine(DATABASE_URL)
-
-        # Consulta SQL parametrizada
-        sql = text("""
-            SELECT url, title, description, author, url_to_image, published_at, source_name
-            FROM news
-            ORDER BY published_at DESC NULLS LAST
-            LIMIT :limit OFFSET :offset
-        """)
-
-        with engine.connect() as conn:
-            result = conn.execute(sql, {"limit": limit, "offset": offset})
-            rows = result.mappings().all()
-            data = [dict(r) for r in rows]
-
-        # Serialización de fechas a formato ISO 8601
-        for r in data:
-            if r.get("published_at") is not None:
-                r["published_at"] = r["published_at"].isoformat()
+        # Conexión a base de datos (réplica de lectura si está configurada)
+        engine = _read_engine()
+        data = list_news_rows(engine, limit=limit, offset=offset, fields=fields, **filters)
 
         return jsonify({"status": "success", "count": len(data), "data": data}), 200
 
@@ -101,12 +163,17 @@ def preview_news():
 
     Query Params:
         days_back (int, opcional): Días hacia atrás desde la fecha actual para filtrar noticias.
-        page_size (int, opcional): Número de noticias por página.s": "error"
-        }
+        page_size (int, opcional): Número de noticias por página.
         max_pages (int, opcional): Número máximo de páginas a consultar.
 
+    El resultado se cachea durante `PREVIEW_CACHE_TTL_SECS` por (days_back, page_size,
+    max_pages, huella de las keywords activas). Las peticiones idénticas que llegan
+    mientras se calcula esperan a ese mismo cálculo en lugar de repetir la ingesta,
+    como mucho `PREVIEW_WAIT_SECS` (después responden 504).
+
     Returns:
-        JSON con estado, número de resultados, métricas y datos transformados.
+        JSON con estado, número de resultados, métricas, datos transformados y
+        `cache` ({"hit": bool, "age_secs": float}).
     """
     try:
         # Lectura de parámetros con valores por defecto
@@ -114,26 +181,36 @@ def preview_news():
         page_size = int(request.args.get("page_size", 100))
         max_pages = int(request.args.get("max_pages", 1))
 
-        # Cálculo de fechas
-        now = datetime.now(timezone.utc)
-        frm = (now - timedelta(days=days_back)).isoformat(timespec="seconds")
-        to  = now.isoformat(timespec="seconds")
-
-        # Conexión a base de datos
+        # Conexión a base de datos (primaria: la ingesta registra el consumo de NewsAPI)
         engine = init_engine(DATABASE_URL)
 
-        # Ejecución de la ingesta (fase Extract + Transform)
-        curated_df, metrics = run_ingestion(
-            engine=engine, frm=frm, to=to, page_size=page_size, max_pages=max_pages
-        )
+        def compute():
+            # Cálculo de fechas
+            now = datetime.now(timezone.utc)
+            frm = (now - timedelta(days=days_back)).isoformat(timespec="seconds")
+            to  = now.isoformat(timespec="seconds")
+
+            # Ejecución de la ingesta (fase Extract + Transform)
+            curated_df, metrics = run_ingestion(
+                engine=engine, frm=frm, to=to, page_size=page_size, max_pages=max_pages
+            )
+            return {
+                "count": int(len(curated_df)) if not curated_df.empty else 0,
+                "metrics": metrics,
+                "data": curated_df.to_dict(orient="records"),
+            }
+
+        key = (days_back, page_size, max_pages, keyword_fingerprint(engine))
+        result, cached, age = preview_cache.get_or_compute(key, compute)
 
         return jsonify({
             "status": "success",
-            "count": int(len(curated_df)) if not curated_df.empty else 0,
-            "metrics": metrics,
-            "data": curated_df.to_dict(orient="records")
+            **result,
+            "cache": {"hit": cached, "age_secs": round(age, 3)},
         }), 200
 
+    except TimeoutError as e:
+        return jsonify({"status": "error", "message": str(e)}), 504
     except Exception as e:
         logging.error(f"Error en preview_news: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -159,6 +236,10 @@ def ingest_and_save():
             "max_pages": 1
         }
 
+    Si ya hay una ingesta en curso (en este u otro proceso), la petición espera a que
+    termine, como mucho `INGEST_WAIT_SECS`. Si tenía los mismos parámetros, devuelve su
+    resultado con `coalesced: true` (200). Si no termina a tiempo, responde 409.
+
     Returns:
         JSON con estado, métricas y número de registros insertados/actualizados.
     """
@@ -171,12 +252,88 @@ def ingest_and_save():
             days_back=int(payload.get("days_back", 7)),
             page_size=int(payload.get("page_size", 100)),
             max_pages=int(payload.get("max_pages", 1)),
+            wait_timeout_secs=INGEST_WAIT_SECS,
         )
-        return jsonify({"status": "success", **res}), 201
+        return jsonify({"status": "success", **res}), 200 if res.get("coalesced") else 201
+    except RunInProgressError as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
     except Exception as e:
         logging.error(f"Error en ingest_and_save: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# ------------------------------------------------------------
+# 4) GET /stats/* -> Agregados precalculados
+# ------------------------------------------------------------
+def _stats_range():
+    """
+    Lee el rango de días opcional (`from`, `to` en formato YYYY-MM-DD) de la query.
+
+    Returns:
+        tuple: (date | None, date | None)
+    """
+    frm = request.args.get("from")
+    to = request.args.get("to")
+    return (
+        date.fromisoformat(frm) if frm else None,
+        date.fromisoformat(to) if to else None,
+    )
+
+@app.get("/stats/sources")
+def stats_by_source():
+    """
+    Devuelve el número de artículos por día y fuente.
+    Solo lee de las tablas de agregados, nunca de `news`.
+
+    Query Params:
+        from (str, opcional): Primer día incluido (YYYY-MM-DD).
+        to (str, opcional): Último día incluido (YYYY-MM-DD).
+        source_name (str, opcional): Filtra por una fuente concreta.
+
+    Returns:
+        JSON con estado, número de filas y los agregados (400 si `from` o `to` no son fechas válidas).
+    """
+    try:
+        try:
+            frm, to = _stats_range()
+        except ValueError as e:
+            return jsonify({"status": "error", "message": f"Fecha no válida: {e}"}), 400
+
+        engine = _read_engine()
+        data = get_source_stats(engine, frm=frm, to=to, source_name=request.args.get("source_name"))
+        return jsonify({"status": "success", "count": len(data), "data": data}), 200
+    except Exception as e:
+        logging.error(f"Error en stats_by_source: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.get("/stats/categories")
+def stats_by_category():
+    """
+    Devuelve el número de artículos por día y categoría de keyword.
+    Solo lee de las tablas de agregados, nunca de `news`.
+
+    Query Params:
+        from (str, opcional): Primer día incluido (YYYY-MM-DD).
+        to (str, opcional): Último día incluido (YYYY-MM-DD).
+        category (str, opcional): Filtra por una categoría concreta (AI, MARKETING; sin
+            distinguir mayúsculas, como en /news).
+
+    Returns:
+        JSON con estado, número de filas y los agregados (400 si `from` o `to` no son fechas válidas).
+    """
+    try:
+        try:
+            frm, to = _stats_range()
+        except ValueError as e:
+            return jsonify({"status": "error", "message": f"Fecha no válida: {e}"}), 400
+
+        engine = _read_engine()
+        category = (request.args.get("category") or "").strip() or None
+        data = get_category_stats(engine, frm=frm, to=to, category=category)
+        return jsonify({"status": "success", "count": len(data), "data": data}), 200
+    except Exception as e:
+        logging.error(f"Error en stats_by_category: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # ------------------------------------------------------------
 # Punto de entrada principal
 # ------------------------------------------------------------
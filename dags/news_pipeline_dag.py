@@ -39,6 +39,24 @@ def _process_ingestion():
         logging.getLogger(DAG_ID).exception("Ingestion pipeline failed: %s", e)
         raise
 
+def _enrich_news():
+    """
+    Descarga el cuerpo completo de los artículos pendientes, fuera del lock de ingestas.
+    Se omite si `ENABLE_ENRICHMENT` no está activo.
+
+    Returns:
+        Métricas de `enrich_news`
+    """
+    from src.config.settings import DATABASE_URL, is_enable_enrichment
+    from src.pipelines.enrichment import enrich_news
+    from src.repositories.db import init_engine
+
+    if not is_enable_enrichment():
+        raise AirflowSkipException("ENABLE_ENRICHMENT desactivado")
+    result = enrich_news(init_engine(DATABASE_URL))
+    logging.getLogger(DAG_ID).info("Enrichment result: %s", result)
+    return result
+
 # Argumentos por defecto de Apache Airflow
 default_args = {
     "owner": "diego",
@@ -85,6 +103,14 @@ with DAG(
         - **Fetch**: pagina NewsAPI en la ventana `[now - days_back, now]`.
         - **Clean**: normaliza campos, filtra por longitud mínima y elimina duplicados.
         - **Upsert**: inserta/actualiza en BD en modo bulk.
+        - **Enrich** (tarea `enrich_news`, solo con `ENABLE_ENRICHMENT=1`): descarga el
+          cuerpo completo de los artículos pendientes cuando ya se ha liberado el lock de ingestas.
+
+        ## Concurrencia
+        Todas las ingestas (API, scheduler y DAG) comparten un advisory lock de
+        PostgreSQL: la tarea espera a que termine la que esté en curso. Si esa ingesta
+        tenía los mismos parámetros, devuelve su resultado (`coalesced: true`) en lugar
+        de repetirla.
     """,
 ) as dag:
     run = PythonOperator(
@@ -93,3 +119,11 @@ with DAG(
         do_xcom_push=True,
         execution_timeout=timedelta(minutes=15)
     )
+    enrich = PythonOperator(
+        task_id="enrich_news",
+        python_callable=_enrich_news,
+        do_xcom_push=True,
+        execution_timeout=timedelta(minutes=30)
+    )
+
+    run >> enrich
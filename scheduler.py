@@ -1,25 +1,61 @@
 # src/scheduler.py
 import logging
+from datetime import timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
 from zoneinfo import ZoneInfo
 
-from src.pipelines.ingestion import process_ingestion
-from src.config.settings import is_debug
+from src.pipelines.planner import run_planner_tick
+from src.pipelines.enrichment import enrich_news
+from src.repositories.db import init_engine
+from src.repositories.run_coordinator import INGESTION_LOCK, run_exclusive
+from src.config.settings import DATABASE_URL, is_debug, is_enable_enrichment
 
-def scheduled_ingestion_job():
+# Intervalo entre ticks del planificador adaptativo
+TICK_INTERVAL = timedelta(minutes=15)
+DEBUG_TICK_INTERVAL = timedelta(seconds=15)
+
+def scheduled_ingestion_job(tick_interval=TICK_INTERVAL):
     """
-    Job que ejecuta la ingesta programada de noticias.
+    Job que ejecuta un tick del planificador adaptativo de ingesta.
+
+    Cada tick reparte la cuota diaria restante de NewsAPI entre las queries que
+    tocan, priorizando las que más artículos nuevos aportan (ver src/pipelines/planner.py).
 
-    Se ejecuta automáticamente según la configuración del scheduler.
+    Con varios procesos (p. ej. workers de gunicorn) solo uno ejecuta el tick; en el
+    resto se descarta. También se descarta si hay otra ingesta en curso (/ingest o el DAG).
     """
     logging.info("Scheduled ingestion started")
     try:
-        res = process_ingestion(days_back=7, page_size=100, max_pages=1)
-        logging.info("Scheduled ingestion OK: %s", res)
+        engine = init_engine(DATABASE_URL)
+        res, coalesced = run_exclusive(
+            engine, "planner_tick",
+            lambda: run_planner_tick(engine=engine, tick_interval=tick_interval),
+            wait=False, lock_scope=INGESTION_LOCK,
+        )
+        if coalesced:
+            logging.info("Scheduled ingestion skipped: another ingestion is running")
+        else:
+            logging.info("Scheduled ingestion OK: %s", res)
     except Exception:
         logging.exception("Scheduled ingestion FAILED")
 
+def scheduled_enrichment_job():
+    """
+    Job que descarga el cuerpo completo de los artículos pendientes (ver src/pipelines/enrichment.py).
+
+    Va aparte de la ingesta para no alargar el lock de ingestas ni las peticiones a
+    POST /ingest. Con varios procesos solo uno lo ejecuta; en el resto se descarta.
+    """
+    try:
+        engine = init_engine(DATABASE_URL)
+        res, coalesced = run_exclusive(engine, "enrichment", lambda: enrich_news(engine), wait=False)
+        if coalesced:
+            logging.info("Scheduled enrichment skipped: another enrichment is running")
+        else:
+            logging.info("Scheduled enrichment OK: %s", res)
+    except Exception:
+        logging.exception("Scheduled enrichment FAILED")
+
 def start_scheduler(debug=is_debug()):
     """
     Inicializa y arranca el scheduler en segundo plano.
@@ -30,11 +66,19 @@ def start_scheduler(debug=is_debug()):
     tz = ZoneInfo("Europe/Madrid")
     scheduler = BackgroundScheduler(timezone=tz)
 
-    if debug:
-        scheduler.add_job(scheduled_ingestion_job, "interval", seconds=15)
-        logging.info("Scheduler started (DEV mode)")
-    else:
-        scheduler.add_job(scheduled_ingestion_job, CronTrigger(hour=7, minute=0))
-        logging.info("Scheduler started (PROD mode)")
+    interval = DEBUG_TICK_INTERVAL if debug else TICK_INTERVAL
+    scheduler.add_job(
+        scheduled_ingestion_job, "interval",
+        seconds=int(interval.total_seconds()),
+        kwargs={"tick_interval": interval},
+        max_instances=1, coalesce=True,
+    )
+    if is_enable_enrichment():
+        scheduler.add_job(
+            scheduled_enrichment_job, "interval",
+            seconds=int(interval.total_seconds()),
+            max_instances=1, coalesce=True,
+        )
+    logging.info("Scheduler started (%s mode, tick=%ss)", "DEV" if debug else "PROD", int(interval.total_seconds()))
 
     scheduler.start()
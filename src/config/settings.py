@@ -11,8 +11,35 @@ load_dotenv(os.path.join(ROOT, ".env"))
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")          # Clave para la API de NewsAPI
 API_URL = os.getenv("API_URL")                  # URL base de la API a consultar
 DATABASE_URL = os.getenv("DATABASE_URL")        # Conexión a la base de datos PostgreSQL
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")  # Réplica opcional para endpoints de solo lectura
 DEBUG = os.getenv("DEBUG")                      # "1" para habilitar modo debug
 ENABLE_SCHEDULER = os.getenv("ENABLE_SCHEDULER")# "1" para habilitar ejecución programada
+ENABLE_ENRICHMENT = os.getenv("ENABLE_ENRICHMENT")  # "1" para descargar el cuerpo completo en el scheduler y el DAG
+
+# Filtro de Bloom de artículos ya guardados (ver src/repositories/known_filter.py)
+KNOWN_FILTER_CAPACITY = int(os.getenv("KNOWN_FILTER_CAPACITY") or "200000")  # Artículos esperados
+KNOWN_FILTER_FP_RATE = float(os.getenv("KNOWN_FILTER_FP_RATE") or "0.001")   # Falsos positivos objetivo
+
+# Cuota diaria de NewsAPI para el planificador adaptativo (plan developer: 100 peticiones/día)
+NEWSAPI_DAILY_QUOTA = int(os.getenv("NEWSAPI_DAILY_QUOTA") or "100")   # Peticiones por día
+NEWSAPI_QUOTA_RESERVE = int(os.getenv("NEWSAPI_QUOTA_RESERVE") or "10")  # Reservadas para /ingest, /preview y DAG
+
+# Segundos que POST /ingest espera a que termine otra ingesta en curso antes de responder 409
+INGEST_WAIT_SECS = float(os.getenv("INGEST_WAIT_SECS") or "60")
+
+# Segundos tras un commit de ingesta en los que las lecturas van a la primaria (ver src/repositories/db.py)
+READ_STALENESS_SECS = float(os.getenv("READ_STALENESS_SECS") or "5")
+
+# Segundos que se reutiliza un resultado de /preview con los mismos parámetros y keywords
+PREVIEW_CACHE_TTL_SECS = float(os.getenv("PREVIEW_CACHE_TTL_SECS") or "60")
+
+# Segundos que /preview espera a un cálculo idéntico en curso antes de responder 504
+PREVIEW_WAIT_SECS = float(os.getenv("PREVIEW_WAIT_SECS") or "30")
+
+# Descarga del cuerpo completo de los artículos (ver src/pipelines/enrichment.py)
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY") or "8")               # Descargas simultáneas
+ENRICH_PER_HOST = int(os.getenv("ENRICH_PER_HOST") or "2")                     # Descargas simultáneas por host
+ENRICH_HOST_DELAY_SECS = float(os.getenv("ENRICH_HOST_DELAY_SECS") or "1.0")   # Pausa entre peticiones a un host
 
 # === Validaciones mínimas de entorno ===
 if not NEWSAPI_KEY:
@@ -33,3 +60,10 @@ def is_enable_scheduler() -> bool:
         bool: True si ENABLE_SCHEDULER está configurado como "1".
     """
     return ENABLE_SCHEDULER == "1"
+
+def is_enable_enrichment() -> bool:
+    """
+    Returns:
+        bool: True si ENABLE_ENRICHMENT está configurado como "1".
+    """
+    return ENABLE_ENRICHMENT == "1"
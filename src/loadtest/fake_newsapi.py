@@ -0,0 +1,146 @@
+"""
+Servidor local que imita `/v2/everything` de NewsAPI para pruebas de carga.
+
+Devuelve páginas con el mismo formato que NewsAPI (contenido truncado con
+`[+N chars]`, fuentes, fechas recientes y keywords de IA y marketing en el título).
+Cada respuesta genera URLs nuevas, de modo que cada ingesta escribe artículos nuevos.
+
+Uso:
+    python -m src.loadtest.fake_newsapi --port 8099 --latency-ms 80
+    API_URL=http://127.0.0.1:8099/v2/everything python app.py
+"""
+
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+
+SOURCES = ["TechCrunch", "The Verge", "Wired", "Reuters", "Marketing Week", "Adweek", "VentureBeat", "Forbes"]
+
+TITLES = [
+    "How generative AI is reshaping email marketing",
+    "Brands test machine learning for campaign targeting",
+    "ChatGPT plugins arrive in marketing automation suites",
+    "Artificial intelligence budgets grow in digital marketing",
+    "Retailers bet on AI for personalised advertising",
+]
+
+BODY = (
+    "Marketing teams are adopting artificial intelligence to segment audiences, write copy "
+    "and measure campaigns in real time, according to industry analysts who"
+)
+
+
+def fake_page(page: int, page_size: int, total_results: int, batch: int, now: datetime = None) -> dict:
+    """
+    Construye una página de respuesta con el formato de NewsAPI.
+
+    Parámetros:
+        page (int): Número de página (desde 1).
+        page_size (int): Artículos por página.
+        total_results (int): Resultados totales que anuncia la búsqueda.
+        batch (int): Identificador de la respuesta; forma parte de las URLs para que sean únicas.
+        now (datetime, opcional): Momento de referencia para las fechas de publicación.
+
+    Returns:
+        dict: {"status": "ok", "totalResults": ..., "articles": [...]}
+    """
+    now = now or datetime.now(timezone.utc)
+    first = (page - 1) * page_size
+    count = max(0, min(page_size, total_results - first))
+    rnd = random.Random(batch * 100003 + page)
+
+    articles = []
+    for i in range(first, first + count):
+        source = SOURCES[i % len(SOURCES)]
+        published = now - timedelta(minutes=rnd.randint(1, 24 * 60))
+        articles.append({
+            "source": {"id": source.lower().replace(" ", "-"), "name": source},
+            "author": f"Author {i % 40}",
+            "title": f"{TITLES[i % len(TITLES)]} ({batch}-{i})",
+            "description": "A look at how AI tools are changing day-to-day marketing work.",
+            "url": f"https://{source.lower().replace(' ', '')}.example/articles/{batch}-{i}",
+            "urlToImage": f"https://img.example/{batch}-{i}.jpg",
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": f"{BODY}… [+{rnd.randint(1200, 6000)} chars]",
+        })
+    return {"status": "ok", "totalResults": total_results, "articles": articles}
+
+
+def start_fake_newsapi(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 50,
+                       total_results: int = 300) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Arranca el servidor en un hilo en segundo plano.
+
+    Parámetros:
+        host (str, opcional): Interfaz de escucha.
+        port (int, opcional): Puerto (0 = uno libre).
+        latency_ms (float, opcional): Latencia añadida a cada respuesta.
+        total_results (int, opcional): Resultados totales de cada búsqueda.
+
+    Returns:
+        tuple: (servidor, URL del endpoint `/v2/everything`). Se detiene con `server.shutdown()`.
+    """
+    batches = itertools.count(1)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+
+            if url.path != "/v2/everything":
+                return self._send(404, {"status": "error", "code": "notFound", "message": "Not found"})
+            if not query.get("apiKey"):
+                return self._send(401, {"status": "error", "code": "apiKeyMissing", "message": "No API key"})
+
+            page = int(query.get("page", 1))
+            page_size = int(query.get("pageSize", 100))
+            self._send(200, fake_page(page, page_size, total_results, next(batches)))
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-newsapi", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v2/everything"
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Punto de entrada de línea de comandos: sirve la API falsa hasta Ctrl+C.
+    """
+    parser = argparse.ArgumentParser(description="NewsAPI falsa para pruebas locales y de carga.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latencia añadida a cada respuesta.")
+    parser.add_argument("--total-results", type=int, default=300, help="Resultados totales de cada búsqueda.")
+    args = parser.parse_args(argv)
+
+    server, url = start_fake_newsapi(args.host, args.port, args.latency_ms, args.total_results)
+    print(f"Fake NewsAPI escuchando en {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
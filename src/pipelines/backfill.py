@@ -0,0 +1,399 @@
+"""
+Carga histórica (backfill) de noticias por ventanas de tiempo.
+
+NewsAPI solo permite paginar un número limitado de resultados por consulta, por lo que
+pedir un rango muy amplio trunca en silencio la mayor parte de los artículos. Este módulo
+divide el rango en ventanas, las subdivide cuando `totalResults` supera lo que se puede
+paginar y las procesa en paralelo, guardando un checkpoint para poder reanudar.
+
+Uso:
+    python -m src.pipelines.backfill --from 2025-07-01 --to 2025-08-01 --workers 4
+"""
+
+from src.config.settings import NEWSAPI_KEY, API_URL, DATABASE_URL
+from src.utils.query_builder import build_q_from_db
+from src.services.fetch_service import NewsAPIError, fetch_articles
+from src.pipelines.ingestion import curate_articles
+from src.repositories.news import upsert_news_bulk
+from src.repositories.ingestion_state import record_api_requests
+from src.repositories.db import init_engine
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+# Configuración del logger para el módulo de backfill
+logger = logging.getLogger("pipeline.backfill")
+
+# Máximo de resultados que NewsAPI deja paginar por consulta (plan developer)
+MAX_RESULTS_PER_QUERY = 100
+
+# Por debajo de este tamaño una ventana ya no se subdivide
+MIN_WINDOW = timedelta(hours=1)
+
+
+def window_key(q: str, frm: datetime, to: datetime) -> str:
+    """
+    Genera la clave estable de una ventana para el checkpoint.
+
+    Parámetros:
+        q (str): Query de NewsAPI.
+        frm (datetime): Inicio de la ventana.
+        to (datetime): Fin de la ventana.
+
+    Returns:
+        str: Clave con el formato '<hash query>|<inicio>|<fin>'.
+    """
+    qid = hashlib.md5(q.encode("utf-8")).hexdigest()[:12]
+    return f"{qid}|{frm.isoformat(timespec='seconds')}|{to.isoformat(timespec='seconds')}"
+
+
+def split_range(frm: datetime, to: datetime, step: timedelta) -> list:
+    """
+    Divide el rango [frm, to) en ventanas consecutivas de tamaño `step`.
+
+    Parámetros:
+        frm (datetime): Inicio del rango.
+        to (datetime): Fin del rango.
+        step (timedelta): Tamaño de cada ventana.
+
+    Returns:
+        list: Lista de tuplas (inicio, fin).
+    """
+    windows = []
+    cur = frm
+    while cur < to:
+        nxt = min(cur + step, to)
+        windows.append((cur, nxt))
+        cur = nxt
+    return windows
+
+
+def halve_window(frm: datetime, to: datetime) -> list:
+    """
+    Parte una ventana en dos mitades (alineadas al segundo).
+
+    Returns:
+        list: Dos tuplas (inicio, fin).
+    """
+    mid = frm + (to - frm) / 2
+    mid = mid.replace(microsecond=0)
+    return [(frm, mid), (mid, to)]
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Carga el checkpoint de un backfill anterior.
+
+    Parámetros:
+        path (str): Ruta del fichero JSON.
+
+    Returns:
+        dict: {"done": set de claves completadas, "split": set de claves subdivididas,
+               "from"/"to": rango del backfill (ISO 8601) o None}.
+    """
+    if not path or not os.path.exists(path):
+        return {"done": set(), "split": set(), "from": None, "to": None}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "done": set(data.get("done", [])),
+        "split": set(data.get("split", [])),
+        "from": data.get("from"),
+        "to": data.get("to"),
+    }
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """
+    Persiste el checkpoint de forma atómica (escritura en temporal + rename).
+
+    Parámetros:
+        path (str): Ruta del fichero JSON.
+        state (dict): Estado devuelto por `load_checkpoint`.
+    """
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "from": state.get("from"),
+            "to": state.get("to"),
+            "done": sorted(state["done"]),
+            "split": sorted(state["split"]),
+        }, f)
+    os.replace(tmp, path)
+
+
+def _store_page(engine, articles: list) -> int:
+    """
+    Limpia, filtra y guarda en BD una página de resultados (misma elección de ruta
+    de limpieza que la ingesta, ver `curate_articles`).
+
+    Returns:
+        int: Número de artículos insertados/actualizados.
+    """
+    return upsert_news_bulk(engine, curate_articles(articles))
+
+
+def process_window(engine, q: str, frm: datetime, to: datetime, page_size: int = 100,
+                   max_results: int = MAX_RESULTS_PER_QUERY, min_window: timedelta = MIN_WINDOW,
+                   sleep_secs: float = 0.2) -> dict:
+    """
+    Procesa una ventana: consulta la primera página y, si `totalResults` supera lo que
+    se puede paginar, indica que hay que subdividirla (sin guardar nada). En caso
+    contrario pagina la ventana completa guardando cada página en BD según llega.
+
+    Parámetros:
+        engine: Conexión a la base de datos.
+        q (str): Query de NewsAPI.
+        frm (datetime): Inicio de la ventana.
+        to (datetime): Fin de la ventana.
+        page_size (int, opcional): Artículos por página.
+        max_results (int, opcional): Resultados máximos paginables por consulta.
+        min_window (timedelta, opcional): Tamaño mínimo de ventana a subdividir.
+        sleep_secs (float, opcional): Pausa entre páginas.
+
+    Returns:
+        dict: {"split": bool, "requests": int, "raw_count": int, "written": int, "total_results": int}
+    """
+    res = {"split": False, "requests": 0, "raw_count": 0, "written": 0, "total_results": 0}
+    cap = max(page_size, max_results)
+    page = 1
+
+    while True:
+        params = {
+            "apiKey": NEWSAPI_KEY,
+            "q": q,
+            "page": page,
+            "pageSize": page_size,
+            "from": frm.isoformat(timespec="seconds"),
+            "to": to.isoformat(timespec="seconds"),
+            "sortBy": "publishedAt",
+        }
+        articles, meta = fetch_articles(api_url=API_URL, params=params)
+        res["requests"] += 1
+        record_api_requests(engine, 1)
+        if not meta or meta.get("status") != "ok":
+            raise NewsAPIError(meta)
+
+        if page == 1:
+            res["total_results"] = int(meta.get("totalResults", 0) or 0)
+
+        if not articles:
+            break
+
+        # Si la ventana se va a subdividir, su primera página no se guarda: las
+        # ventanas hijas vuelven a pedir esos mismos artículos
+        if page == 1 and res["total_results"] > cap and (to - frm) >= 2 * min_window:
+            res["split"] = True
+            break
+
+        res["raw_count"] += len(articles)
+        res["written"] += _store_page(engine, articles)
+
+        if len(articles) < page_size or page * page_size >= min(res["total_results"], cap):
+            break
+
+        page += 1
+        time.sleep(sleep_secs)
+
+    if not res["split"] and res["total_results"] > cap:
+        logger.warning("Ventana %s - %s truncada: totalResults=%s > %s",
+                       frm.isoformat(), to.isoformat(), res["total_results"], cap)
+    return res
+
+
+def run_backfill(frm: datetime, to: datetime, window: timedelta = timedelta(days=1), workers: int = 4,
+                 page_size: int = 100, max_results: int = MAX_RESULTS_PER_QUERY,
+                 checkpoint_path: str = None, sleep_secs: float = 0.2, engine=None) -> dict:
+    """
+    Ejecuta el backfill histórico del rango [frm, to) para todas las queries activas.
+
+    Las ventanas se procesan en paralelo; las que devuelven más resultados de los que se
+    pueden paginar se dividen por la mitad y se encolan de nuevo. Cada ventana terminada
+    se registra en el checkpoint, de modo que una ejecución interrumpida puede reanudarse.
+    Si NewsAPI limita el uso (`rateLimited`), no se lanzan más ventanas: se esperan las
+    que están en curso, se guarda el checkpoint y se devuelven las métricas con
+    `rate_limited: True` para reanudar más tarde.
+
+    Parámetros:
+        frm (datetime): Inicio del rango (UTC).
+        to (datetime): Fin del rango (UTC).
+        window (timedelta, opcional): Tamaño inicial de las ventanas.
+        workers (int, opcional): Número de ventanas procesadas en paralelo.
+        page_size (int, opcional): Artículos por página.
+        max_results (int, opcional): Resultados máximos paginables por consulta.
+        checkpoint_path (str, opcional): Fichero JSON de checkpoint.
+        sleep_secs (float, opcional): Pausa entre páginas.
+        engine (opcional): Conexión a la base de datos; si no se indica se crea una.
+
+    Returns:
+        dict: Métricas del backfill.
+    """
+    engine = engine or init_engine(DATABASE_URL)
+    queries = build_q_from_db(engine=engine)
+    state = load_checkpoint(checkpoint_path)
+    state.update({"from": frm.isoformat(timespec="seconds"), "to": to.isoformat(timespec="seconds")})
+    state_lock = threading.Lock()
+
+    pending = deque()
+    for q in queries:
+        for w_frm, w_to in split_range(frm, to, window):
+            pending.append((q, w_frm, w_to))
+
+    metrics = {"windows_done": 0, "windows_split": 0, "windows_skipped": 0, "windows_failed": 0,
+               "requests": 0, "raw_count": 0, "written": 0, "rate_limited": False}
+    started = time.monotonic()
+
+    def expand(item):
+        """Salta ventanas ya completadas y expande las ya subdivididas en el checkpoint."""
+        q, w_frm, w_to = item
+        key = window_key(q, w_frm, w_to)
+        if key in state["done"]:
+            metrics["windows_skipped"] += 1
+            return None
+        if key in state["split"]:
+            pending.extend((q, a, b) for a, b in halve_window(w_frm, w_to))
+            return None
+        return item
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        while pending or futures:
+            while pending and len(futures) < workers and not metrics["rate_limited"]:
+                item = expand(pending.popleft())
+                if item is None:
+                    continue
+                q, w_frm, w_to = item
+                fut = pool.submit(process_window, engine, q, w_frm, w_to, page_size=page_size,
+                                  max_results=max_results, sleep_secs=sleep_secs)
+                futures[fut] = item
+
+            if not futures:
+                if metrics["rate_limited"]:
+                    break
+                continue
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                q, w_frm, w_to = futures.pop(fut)
+                key = window_key(q, w_frm, w_to)
+                try:
+                    res = fut.result()
+                except NewsAPIError as e:
+                    if not e.rate_limited:
+                        metrics["windows_failed"] += 1
+                        logger.exception("Ventana %s - %s FALLIDA", w_frm.isoformat(), w_to.isoformat())
+                        continue
+                    # El resto de ventanas también fallaría: se deja de gastar peticiones
+                    if not metrics["rate_limited"]:
+                        logger.warning("NewsAPI rateLimited: no se lanzan más ventanas; "
+                                       "relanza el comando para reanudar desde el checkpoint.")
+                    metrics["rate_limited"] = True
+                    continue
+                except Exception:
+                    metrics["windows_failed"] += 1
+                    logger.exception("Ventana %s - %s FALLIDA", w_frm.isoformat(), w_to.isoformat())
+                    continue
+
+                metrics["requests"] += res["requests"]
+                metrics["raw_count"] += res["raw_count"]
+                metrics["written"] += res["written"]
+
+                with state_lock:
+                    if res["split"]:
+                        metrics["windows_split"] += 1
+                        state["split"].add(key)
+                        pending.extend((q, a, b) for a, b in halve_window(w_frm, w_to))
+                    else:
+                        metrics["windows_done"] += 1
+                        state["done"].add(key)
+                    save_checkpoint(checkpoint_path, state)
+
+                elapsed = max(time.monotonic() - started, 1e-6)
+                logger.info(
+                    "Progreso: %s ventanas completadas, %s subdivididas, %s pendientes | "
+                    "%s artículos guardados (%.1f art/s, %.2f req/s)",
+                    metrics["windows_done"], metrics["windows_split"], len(pending) + len(futures),
+                    metrics["written"], metrics["written"] / elapsed, metrics["requests"] / elapsed,
+                )
+
+    if metrics["rate_limited"]:
+        # Las ventanas sin terminar no están en el checkpoint: la siguiente ejecución las repite
+        with state_lock:
+            save_checkpoint(checkpoint_path, state)
+
+    metrics["elapsed_secs"] = round(time.monotonic() - started, 2)
+    logger.info("Backfill finalizado: %s", metrics)
+    return metrics
+
+
+def _parse_dt(value: str) -> datetime:
+    """
+    Convierte una fecha ISO 8601 (con o sin hora) a datetime en UTC.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def resume_end(checkpoint_path: str, frm: datetime) -> datetime:
+    """
+    Fin del rango cuando no se indica `--to`: el guardado en el checkpoint si es del
+    mismo `--from` (así, relanzar el mismo comando genera las mismas ventanas y las
+    claves del checkpoint siguen coincidiendo) o, si no, el momento actual.
+    """
+    state = load_checkpoint(checkpoint_path)
+    if state["to"] and state["from"] == frm.isoformat(timespec="seconds"):
+        logger.info("Reanudando backfill hasta %s (checkpoint %s)", state["to"], checkpoint_path)
+        return _parse_dt(state["to"])
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos del backfill.
+    """
+    parser = argparse.ArgumentParser(description="Backfill histórico de noticias desde NewsAPI por ventanas.")
+    parser.add_argument("--from", dest="frm", required=True, help="Inicio del rango (ISO 8601, UTC).")
+    parser.add_argument("--to", dest="to", default=None,
+                        help="Fin del rango (ISO 8601, UTC). Por defecto: el del checkpoint con el mismo "
+                             "--from o, si no hay, ahora.")
+    parser.add_argument("--window-hours", type=float, default=24, help="Tamaño inicial de ventana en horas.")
+    parser.add_argument("--workers", type=int, default=4, help="Ventanas procesadas en paralelo.")
+    parser.add_argument("--page-size", type=int, default=100, help="Artículos por página.")
+    parser.add_argument("--max-results", type=int, default=MAX_RESULTS_PER_QUERY,
+                        help="Resultados máximos paginables por consulta en NewsAPI.")
+    parser.add_argument("--checkpoint", default=".backfill_checkpoint.json", help="Fichero de checkpoint.")
+    parser.add_argument("--sleep-secs", type=float, default=0.2, help="Pausa entre páginas.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    frm = _parse_dt(args.frm)
+    to = _parse_dt(args.to) if args.to else resume_end(args.checkpoint, frm)
+
+    metrics = run_backfill(
+        frm=frm,
+        to=to,
+        window=timedelta(hours=args.window_hours),
+        workers=args.workers,
+        page_size=args.page_size,
+        max_results=args.max_results,
+        checkpoint_path=args.checkpoint,
+        sleep_secs=args.sleep_secs,
+    )
+    if metrics["rate_limited"]:
+        raise SystemExit("Backfill detenido por el límite de NewsAPI; relanza el comando para reanudarlo.")
+
+
+if __name__ == "__main__":
+    main()
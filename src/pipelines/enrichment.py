@@ -0,0 +1,84 @@
+"""
+Enriquecimiento opcional: descarga el cuerpo completo de los artículos guardados.
+
+El `content` de NewsAPI está truncado y `filter_by_min_length` solo puede estimar la
+longitud real a partir de `[+N chars]`. Esta etapa descarga la página original de
+los artículos que han superado el filtro y guarda el texto extraído en
+`news_content.full_content`.
+
+Se ejecuta fuera de la ingesta, sobre los artículos pendientes: en el scheduler y en el
+DAG si `ENABLE_ENRICHMENT=1`, o a mano:
+    python -m src.pipelines.enrichment --limit 500 --concurrency 8 --per-host 2
+"""
+
+from src.config.settings import (
+    DATABASE_URL, ENRICH_CONCURRENCY, ENRICH_PER_HOST, ENRICH_HOST_DELAY_SECS
+)
+from src.services.article_fetcher import fetch_full_texts
+from src.repositories.news import select_urls_to_enrich, store_full_content
+from src.repositories.db import init_engine
+import argparse
+import logging
+
+# Configuración del logger para el enriquecimiento
+logger = logging.getLogger("pipeline.enrichment")
+
+
+def enrich_news(engine, urls=None, limit: int = 500, concurrency: int = None, per_host: int = None,
+                host_delay_secs: float = None) -> dict:
+    """
+    Descarga y guarda el cuerpo completo de los artículos pendientes.
+
+    Parámetros:
+        engine: Conexión a la base de datos.
+        urls (list, opcional): Solo estas URLs (p. ej. las de la ingesta recién hecha);
+            por defecto, los artículos pendientes más recientes.
+        limit (int, opcional): Máximo de artículos a descargar.
+        concurrency (int, opcional): Descargas simultáneas (por defecto `ENRICH_CONCURRENCY`).
+        per_host (int, opcional): Descargas simultáneas por host (por defecto `ENRICH_PER_HOST`).
+        host_delay_secs (float, opcional): Separación entre peticiones a un host
+            (por defecto `ENRICH_HOST_DELAY_SECS`).
+
+    Returns:
+        dict: Métricas de la descarga (pages, ok, failed, elapsed_secs, pages_per_sec) y `stored`.
+    """
+    pending = select_urls_to_enrich(engine, urls=urls, limit=limit)
+
+    texts, stats = fetch_full_texts(
+        pending,
+        concurrency=concurrency or ENRICH_CONCURRENCY,
+        per_host=per_host or ENRICH_PER_HOST,
+        host_delay_secs=ENRICH_HOST_DELAY_SECS if host_delay_secs is None else host_delay_secs,
+    )
+    stats["stored"] = store_full_content(engine, texts)
+
+    logger.info("Enriquecimiento: %s páginas, %s guardadas, %.2f páginas/s",
+                stats["pages"], stats["stored"], stats["pages_per_sec"])
+    return stats
+
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos del enriquecimiento.
+    """
+    parser = argparse.ArgumentParser(description="Descarga el cuerpo completo de los artículos pendientes.")
+    parser.add_argument("--limit", type=int, default=500, help="Máximo de artículos a descargar.")
+    parser.add_argument("--concurrency", type=int, default=ENRICH_CONCURRENCY, help="Descargas simultáneas.")
+    parser.add_argument("--per-host", type=int, default=ENRICH_PER_HOST, help="Descargas simultáneas por host.")
+    parser.add_argument("--host-delay-secs", type=float, default=ENRICH_HOST_DELAY_SECS,
+                        help="Separación mínima entre peticiones a un mismo host.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    enrich_news(
+        init_engine(DATABASE_URL),
+        limit=args.limit,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        host_delay_secs=args.host_delay_secs,
+    )
+
+
+if __name__ == "__main__":
+    main()
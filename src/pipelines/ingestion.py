@@ -1,8 +1,14 @@
 from src.config.settings import NEWSAPI_KEY, API_URL, DATABASE_URL
 from src.utils.query_builder import build_q_from_db
-from src.services.fetch_service import fetch_ai_marketing_news
-from src.services.clean_service import clean_raw_data, filter_by_min_length
-from src.repositories.news import upsert_news_bulk
+from src.services.fetch_service import NewsAPIError, fetch_articles, articles_to_frame
+from src.services.clean_service import clean_raw_data, filter_by_min_length, fingerprints
+from src.services.records import (
+    clean_raw_records, filter_records_by_min_length, raw_fingerprints, record_fingerprints, records_to_frame
+)
+from src.repositories.news import upsert_news_counts
+from src.repositories.ingestion_state import record_api_requests
+from src.repositories.known_filter import load_known_filter, remember_known
+from src.repositories.run_coordinator import INGESTION_LOCK, run_exclusive
 from src.repositories.db import init_engine
 from datetime import datetime, timedelta, timezone
 import pandas as pd
@@ -12,27 +18,112 @@ import logging
 # Configuración del logger para el módulo de ingesta
 logger = logging.getLogger("pipeline.ingestion")
 
-def run_ingestion(engine, frm: str, to: str, page_size: int = 100, max_pages: int = 1, sleep_secs: float = 0.2):
+# NewsAPI devuelve como mucho 100 artículos por página (`pageSize`)
+NEWSAPI_MAX_PAGE_SIZE = 100
+
+# Lotes de hasta este tamaño se limpian con registros ligeros en lugar de pandas.
+# La ingesta y el backfill procesan página a página, así que con NewsAPI los lotes nunca
+# superan una página y siempre van por la ruta ligera; pandas queda para lotes mayores
+# (listas de artículos que no vienen de una sola página de NewsAPI).
+RECORDS_PATH_MAX_ROWS = NEWSAPI_MAX_PAGE_SIZE
+
+
+def curate_page(raw, seen: set = None):
+    """
+    Limpia y filtra una página de resultados. Si se indica `seen`, descarta los
+    artículos ya vistos en páginas anteriores y registra los nuevos.
+
+    Acepta tanto un DataFrame (ruta pandas) como la lista de artículos del JSON de
+    NewsAPI (ruta ligera con `ArticleRecord`); ambas producen las mismas filas.
+
+    Parámetros:
+        raw (pd.DataFrame | list): Página cruda devuelta por NewsAPI.
+        seen (set, opcional): Conjunto de hashes de URL ya procesados.
+
+    Returns:
+        pd.DataFrame | List[ArticleRecord]: Página limpia, filtrada y sin duplicados.
+    """
+    if isinstance(raw, list):
+        records = clean_raw_records(raw)
+        records = filter_records_by_min_length(records, min_total_chars=1000)
+        if seen is not None:
+            fresh = [r for r in records if r.url_hash not in seen]
+            seen.update(r.url_hash for r in fresh)
+            records = fresh
+        return records
+
+    df_curated = clean_raw_data(df_raw=raw)
+    df_curated = filter_by_min_length(df=df_curated, min_total_chars=1000)
+
+    if seen is not None and not df_curated.empty:
+        hashes = df_curated["url_hash"]
+        fresh = ~hashes.isin(seen)
+        seen.update(hashes[fresh])
+        df_curated = df_curated[fresh.to_numpy()].reset_index(drop=True)
+
+    return df_curated
+
+
+def curate_articles(articles: list, seen: set = None):
+    """
+    Limpia y filtra una lista de artículos del JSON de NewsAPI eligiendo la ruta según
+    el tamaño del lote: registros ligeros hasta `RECORDS_PATH_MAX_ROWS`, pandas por encima.
+
+    Parámetros:
+        articles (list): Artículos tal y como llegan en `articles` de la respuesta JSON.
+        seen (set, opcional): Conjunto de hashes de URL ya procesados (ver `curate_page`).
+
+    Returns:
+        pd.DataFrame | List[ArticleRecord]: Artículos limpios, filtrados y sin duplicados.
+    """
+    raw = articles if len(articles) <= RECORDS_PATH_MAX_ROWS else articles_to_frame(articles)
+    return curate_page(raw, seen=seen)
+
+
+def page_fingerprints(page) -> list:
+    """
+    Huellas de los artículos de una página limpia (DataFrame o lista de registros).
+    """
+    if isinstance(page, list):
+        return record_fingerprints(page)
+    return fingerprints(page).tolist()
+
+
+def iter_curated_pages(engine, frm: str, to: str, page_size: int = 100, max_pages: int = 1,
+                       sleep_secs: float = 0.2, metrics: dict = None, known=None,
+                       queries=None, sort_by: str = "relevancy"):
     """
-    Ejecuta el proceso de extracción y limpieza de noticias desde la API de NewsAPI.
+    Generador que pagina NewsAPI y entrega cada página ya limpia y filtrada según llega,
+    de modo que solo hay una página en memoria a la vez. Los duplicados entre páginas se
+    descartan con un conjunto de hashes de 64 bits de la URL canónica (`url_hash`).
+
+    Si se indica `known` (filtro de Bloom de artículos ya guardados), los artículos cuya
+    huella ya está en el filtro se descartan antes de limpiarlos: no han cambiado desde
+    que se guardaron, salvo falsos positivos del filtro.
 
     Parámetros:
         engine: Conexión a la base de datos.
-        frm (str): Fecha/hora de inicio en formato ISO 8601 (ej. '2025-08-01T00:00:00').
+        frm (str): Fecha/hora de inicio en formato ISO 8601.
         to (str): Fecha/hora de fin en formato ISO 8601.
-        page_size (int, opcional): Número de artículos por página (máx. 100 en plan gratuito).
+        page_size (int, opcional): Número de artículos por página.
         max_pages (int, opcional): Número máximo de páginas a consultar.
-        sleep_secs (float, opcional): Tiempo de espera entre páginas para evitar bloqueos.
+        sleep_secs (float, opcional): Tiempo de espera entre páginas.
+        metrics (dict, opcional): Diccionario que se actualiza con las métricas del proceso.
+        known (BloomFilter, opcional): Filtro de artículos ya guardados.
+        queries (list | str, opcional): Query o queries a usar; por defecto se construyen desde BD.
+        sort_by (str, opcional): Orden de resultados en NewsAPI.
 
-    Returns:
-        tuple:
-            curated_df (pd.DataFrame): DataFrame con noticias limpias y filtradas.
-            metrics (dict): Métricas del proceso (páginas intentadas, artículos crudos, artículos limpios).
+    Yields:
+        pd.DataFrame | List[ArticleRecord]: Noticias limpias de cada página (puede estar vacía).
     """
+    if metrics is None:
+        metrics = {}
+    metrics.update({"requests": 0, "pages_attempted": 0, "raw_count": 0, "known_skipped": 0, "clean_count": 0})
+
     # Construye query de búsqueda a partir de keywords almacenadas en BD
-    queries = build_q_from_db(engine=engine)
-    all_curated = []
-    total_results_seen = 0
+    if queries is None:
+        queries = build_q_from_db(engine=engine)
+    seen = set()
 
     for page in range(1, max_pages + 1):
         safe_params_log = {
@@ -41,7 +132,7 @@ def run_ingestion(engine, frm: str, to: str, page_size: int = 100, max_pages: in
             "pageSize": page_size,
             "from": frm,
             "to": to,
-            "sortBy": "relevancy"
+            "sortBy": sort_by
         }
         logger.info("Fetching page=%s params=%s", page, safe_params_log)
 
@@ -52,84 +143,166 @@ def run_ingestion(engine, frm: str, to: str, page_size: int = 100, max_pages: in
         }
 
         # Obtiene datos crudos desde la API
-        df_raw, meta = fetch_ai_marketing_news(api_url=API_URL, params=params)
+        articles, meta = fetch_articles(api_url=API_URL, params=params)
+        metrics["requests"] += 1
+        record_api_requests(engine, 1)
         if not meta or meta.get("status") != "ok":
-            raise RuntimeError(f"NewsAPI error: {meta}")
+            raise NewsAPIError(meta)
 
         # Si no hay artículos en la respuesta, termina el bucle
-        if df_raw is None or df_raw.empty:
+        if not articles:
             logger.info("Página sin artículos, fin de paginado.")
             break
 
-        total_results_seen += len(df_raw)
+        raw_len = len(articles)
+        metrics["pages_attempted"] += 1
+        metrics["raw_count"] += raw_len
+
+        # Descarta artículos ya guardados sin cambios antes de limpiarlos
+        if known is not None:
+            is_known = [fp in known for fp in raw_fingerprints(articles)]
+            metrics["known_skipped"] += sum(is_known)
+            articles = [a for a, k in zip(articles, is_known) if not k]
 
-        # Limpieza y filtrado de datos
-        df_curated = clean_raw_data(df_raw=df_raw)
-        df_curated = filter_by_min_length(df=df_curated, min_total_chars=1000)
-        all_curated.append(df_curated)
+        # Limpieza, filtrado y deduplicado entre páginas
+        curated = curate_articles(articles, seen=seen)
+        del articles
+        metrics["clean_count"] += len(curated)
+
+        yield curated
 
         # Si una página tiene menos resultados de los solicitados, asumimos que no hay más datos
-        if len(df_raw) < page_size:
-            logger.info("Última página (len(df_raw) < page_size).")
+        if raw_len < page_size:
+            logger.info("Última página (len(articles) < page_size).")
             break
 
         # Pausa para evitar alcanzar límites de rate limit
         time.sleep(sleep_secs)
 
-    # Consolida todos los DataFrames y elimina duplicados por hash de URL
-    curated_df = (
-        pd.concat(all_curated, ignore_index=True)
-        .drop_duplicates(subset="url")
-        .reset_index(drop=True)
-        if all_curated else pd.DataFrame()
-    )
-
-    # Métricas de ejecución
-    metrics = {
-        "pages_attempted": len(all_curated),
-        "raw_count": total_results_seen,
-        "clean_count": int(len(curated_df)),
-    }
     logger.info("Metrics: %s", metrics)
 
+
+def run_ingestion(engine, frm: str, to: str, page_size: int = 100, max_pages: int = 1, sleep_secs: float = 0.2):
+    """
+    Ejecuta el proceso de extracción y limpieza de noticias desde la API de NewsAPI
+    y devuelve todas las páginas consolidadas (sin persistencia).
+
+    Parámetros:
+        engine: Conexión a la base de datos.
+        frm (str): Fecha/hora de inicio en formato ISO 8601 (ej. '2025-08-01T00:00:00').
+        to (str): Fecha/hora de fin en formato ISO 8601.
+        page_size (int, opcional): Número de artículos por página (máx. 100 en plan gratuito).
+        max_pages (int, opcional): Número máximo de páginas a consultar.
+        sleep_secs (float, opcional): Tiempo de espera entre páginas para evitar bloqueos.
+
+    Returns:
+        tuple:
+            curated_df (pd.DataFrame): DataFrame con noticias limpias y filtradas.
+            metrics (dict): Métricas del proceso (páginas intentadas, artículos crudos, artículos limpios).
+    """
+    metrics = {}
+    pages = [
+        records_to_frame(page) if isinstance(page, list) else page
+        for page in iter_curated_pages(engine, frm, to, page_size=page_size, max_pages=max_pages,
+                                       sleep_secs=sleep_secs, metrics=metrics)
+        if len(page)
+    ]
+
+    # Las páginas ya llegan deduplicadas por hash de URL
+    curated_df = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+
     return curated_df, metrics
 
 
-def process_ingestion(days_back=7, page_size=100, max_pages=1):
+def ingest_window(engine, frm: str, to: str, page_size: int = 100, max_pages: int = 1,
+                  queries=None, sort_by: str = "relevancy") -> dict:
+    """
+    Extrae, limpia y guarda en BD las noticias de una ventana de tiempo.
+    Cada página se guarda en BD según llega: un fallo en una página posterior
+    no descarta lo ya persistido.
+
+    El cuerpo completo de los artículos no se descarga aquí: la ingesta tiene tomado el
+    lock de ingestas y puede estar atendiendo a POST /ingest. Lo hace el job de
+    enriquecimiento del scheduler o del DAG (ver src/pipelines/enrichment.py).
+
+    Parámetros:
+        engine: Conexión a la base de datos.
+        frm (str): Fecha/hora de inicio en formato ISO 8601.
+        to (str): Fecha/hora de fin en formato ISO 8601.
+        page_size (int, opcional): Número de artículos por página.
+        max_pages (int, opcional): Número máximo de páginas a consultar.
+        queries (list | str, opcional): Query o queries a usar; por defecto se construyen desde BD.
+        sort_by (str, opcional): Orden de resultados en NewsAPI.
+
+    Returns:
+        dict:
+            inserted (int): Número de artículos insertados/actualizados en BD.
+            metrics (dict): Métricas de la ingesta (incluye `requests` y `new_count`).
+    """
+    # Filtro de artículos ya guardados (None si no está disponible)
+    known = load_known_filter(engine)
+
+    metrics = {}
+    inserted = new_count = 0
+    stored_fingerprints = []
+    try:
+        for page in iter_curated_pages(engine, frm, to, page_size=page_size, max_pages=max_pages,
+                                       metrics=metrics, known=known, queries=queries, sort_by=sort_by):
+            if len(page):
+                counts = upsert_news_counts(engine, page)
+                inserted += counts["written"]
+                new_count += counts["new"]
+                if known is not None:
+                    stored_fingerprints.extend(page_fingerprints(page))
+    finally:
+        # El filtro se persiste una vez por ejecución (no por página), también con las
+        # páginas ya confirmadas si una posterior falla
+        if known is not None and stored_fingerprints:
+            remember_known(engine, known, stored_fingerprints)
+    metrics["new_count"] = new_count
+
+    return {
+        "inserted": inserted,
+        "metrics": metrics
+    }
+
+
+def process_ingestion(days_back=7, page_size=100, max_pages=1, wait=True, wait_timeout_secs=900):
     """
     Orquesta el proceso ETL completo: extrae, limpia y guarda noticias en la BD.
 
+    Solo puede haber una ingesta en curso entre todos los procesos (API, scheduler y
+    Airflow): las llamadas que llegan mientras tanto esperan a que termine y, si tenía
+    los mismos parámetros, reciben su resultado (ver `run_exclusive`).
+
     Parámetros:
         days_back (int, opcional): Días atrás desde hoy para filtrar artículos.
         page_size (int, opcional): Número de artículos por página.
         max_pages (int, opcional): Número máximo de páginas a consultar.
+        wait (bool, opcional): Si hay una ingesta en curso, esperar a que termine
+            (True) o descartar la llamada (False).
+        wait_timeout_secs (float, opcional): Espera máxima por la ingesta en curso;
+            pasado ese tiempo se lanza `RunInProgressError`.
 
     Returns:
         dict:
             inserted (int): Número de artículos insertados/actualizados en BD.
             metrics (dict): Métricas de la ingesta.
+            coalesced (bool): True si se devuelve el resultado de otra ejecución
+                (o la llamada se descartó).
     """
     engine = init_engine(DATABASE_URL)
 
-    # Define rango de fechas en base a days_back
-    now = datetime.now(timezone.utc)
-    frm = (now - timedelta(days=days_back)).isoformat(timespec="seconds")
-    to = now.isoformat(timespec="seconds")
+    def _run():
+        # Define rango de fechas en base a days_back
+        now = datetime.now(timezone.utc)
+        frm = (now - timedelta(days=days_back)).isoformat(timespec="seconds")
+        to = now.isoformat(timespec="seconds")
+        return ingest_window(engine, frm, to, page_size=page_size, max_pages=max_pages)
 
-    # Ejecuta la ingesta de datos
-    df, metrics = run_ingestion(
-        engine=engine,
-        frm=frm,
-        to=to,
-        page_size=page_size,
-        max_pages=max_pages
-    )
-
-    inserted = 0
-    if not df.empty:
-        inserted = upsert_news_bulk(engine, df)
-
-    return {
-        "inserted": inserted,
-        "metrics": metrics
-    }
\ No newline at end of file
+    scope = f"process_ingestion:{days_back}:{page_size}:{max_pages}"
+    result, coalesced = run_exclusive(engine, scope, _run, wait=wait, timeout_secs=wait_timeout_secs,
+                                      lock_scope=INGESTION_LOCK)
+    if result is None:
+        return {"inserted": 0, "metrics": {}, "coalesced": True}
+    return {**result, "coalesced": coalesced}
@@ -0,0 +1,238 @@
+"""
+Planificador adaptativo de llamadas a NewsAPI.
+
+En lugar de lanzar siempre la misma ingesta a una hora fija, cada ejecución (tick):
+
+1) calcula cuántas peticiones quedan de la cuota diaria y las reparte entre los
+   ticks que quedan hasta el fin del día (UTC);
+2) elige las queries que "tocan" (`next_run_at` vencido), empezando por las que más
+   artículos nuevos aportan por petición;
+3) consulta cada una solo desde su última ejecución y actualiza su rendimiento:
+   las queries productivas se consultan más a menudo y las agotadas se espacian.
+"""
+
+from src.config.settings import DATABASE_URL, NEWSAPI_DAILY_QUOTA, NEWSAPI_QUOTA_RESERVE
+from src.utils.query_builder import build_q_from_db
+from src.services.fetch_service import NewsAPIError
+from src.pipelines.ingestion import ingest_window
+from src.repositories.db import init_engine
+from src.repositories.ingestion_state import (
+    get_api_requests, set_api_requests, load_query_states, save_query_state
+)
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+import hashlib
+import logging
+import math
+
+# Configuración del logger para el planificador
+logger = logging.getLogger("pipeline.planner")
+
+# Rendimiento inicial (artículos nuevos por petición) de una query sin historial:
+# optimista, para que las queries nuevas se prueben pronto
+PRIOR_YIELD = 20.0
+
+# Peso de la última observación en la media móvil del rendimiento
+EMA_ALPHA = 0.3
+
+# Límites del intervalo entre consultas de una misma query
+MIN_INTERVAL = timedelta(minutes=30)
+DEFAULT_INTERVAL = timedelta(hours=2)
+MAX_INTERVAL = timedelta(days=1)
+
+# Una query se considera productiva si aporta al menos esta fracción de página en novedades
+HIGH_YIELD_RATIO = 0.25
+
+# Páginas máximas por query y tick
+MAX_PAGES_PER_QUERY = 3
+
+# Ventana de consulta: desde la última ejecución (con solape) y como mucho 7 días
+LOOKBACK_OVERLAP = timedelta(hours=1)
+MAX_LOOKBACK = timedelta(days=7)
+
+
+def query_hash(q: str) -> str:
+    """
+    Identificador estable de una query (md5 de su texto).
+    """
+    return hashlib.md5(q.encode("utf-8")).hexdigest()
+
+
+def new_state(q: str, now: datetime) -> dict:
+    """
+    Estado inicial de una query sin historial: se consulta en el siguiente tick.
+    """
+    return {
+        "query_hash": query_hash(q),
+        "query": q,
+        "calls": 0,
+        "new_articles": 0,
+        "yield_ema": PRIOR_YIELD,
+        "interval_secs": int(DEFAULT_INTERVAL.total_seconds()),
+        "last_run_at": None,
+        "next_run_at": now,
+    }
+
+
+def tick_budget(remaining: int, now: datetime, tick_interval: timedelta) -> int:
+    """
+    Peticiones que puede gastar este tick, repartiendo las restantes del día
+    entre los ticks que quedan hasta medianoche (UTC).
+
+    Parámetros:
+        remaining (int): Peticiones disponibles hoy.
+        now (datetime): Momento actual (UTC).
+        tick_interval (timedelta): Intervalo entre ticks.
+
+    Returns:
+        int: Presupuesto de peticiones del tick.
+    """
+    if remaining <= 0:
+        return 0
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ticks_left = max(1, math.ceil((midnight - now) / tick_interval))
+    return max(1, math.ceil(remaining / ticks_left))
+
+
+def pages_for(yield_ema: float, page_size: int) -> int:
+    """
+    Páginas a pedir para una query según su rendimiento: si la primera página suele
+    venir llena de novedades, merece la pena pedir las siguientes.
+    """
+    ratio = yield_ema / max(1, page_size)
+    if ratio >= 0.9:
+        return MAX_PAGES_PER_QUERY
+    if ratio >= 0.5:
+        return min(2, MAX_PAGES_PER_QUERY)
+    return 1
+
+
+def plan_tick(states: List[dict], now: datetime, budget: int, page_size: int) -> List[Tuple[dict, int]]:
+    """
+    Elige qué queries consultar en este tick y con cuántas páginas.
+
+    Parámetros:
+        states (List[dict]): Estado de las queries activas.
+        now (datetime): Momento actual (UTC).
+        budget (int): Peticiones disponibles en el tick.
+        page_size (int): Artículos por página.
+
+    Returns:
+        List[Tuple[dict, int]]: (estado, páginas) en orden de ejecución.
+    """
+    due = [s for s in states if s["next_run_at"] <= now]
+    due.sort(key=lambda s: s["yield_ema"], reverse=True)
+
+    plan = []
+    for state in due:
+        if budget <= 0:
+            break
+        pages = min(budget, pages_for(state["yield_ema"], page_size))
+        plan.append((state, pages))
+        budget -= pages
+    return plan
+
+
+def update_state(state: dict, requests: int, new_articles: int, now: datetime, page_size: int) -> dict:
+    """
+    Actualiza el rendimiento y el próximo momento de consulta de una query.
+
+    - Sin novedades: el intervalo se duplica (backoff).
+    - Rendimiento alto: el intervalo se reduce a la mitad.
+
+    Returns:
+        dict: Estado actualizado.
+    """
+    per_call = new_articles / max(1, requests)
+    interval = timedelta(seconds=state["interval_secs"])
+
+    if new_articles == 0:
+        interval = min(MAX_INTERVAL, interval * 2)
+    elif per_call >= HIGH_YIELD_RATIO * page_size:
+        interval = max(MIN_INTERVAL, interval / 2)
+
+    return {
+        **state,
+        "calls": state["calls"] + requests,
+        "new_articles": state["new_articles"] + new_articles,
+        "yield_ema": EMA_ALPHA * per_call + (1 - EMA_ALPHA) * state["yield_ema"],
+        "interval_secs": int(interval.total_seconds()),
+        "last_run_at": now,
+        "next_run_at": now + interval,
+    }
+
+
+def run_planner_tick(engine=None, now: datetime = None, tick_interval: timedelta = timedelta(minutes=15),
+                     page_size: int = 100) -> Dict[str, object]:
+    """
+    Ejecuta un tick del planificador: reparte la cuota disponible entre las queries
+    que tocan y guarda en BD su nuevo estado.
+
+    Parámetros:
+        engine (opcional): Conexión a la base de datos; si no se indica se crea una.
+        now (datetime, opcional): Momento actual (UTC).
+        tick_interval (timedelta, opcional): Intervalo entre ticks del scheduler.
+        page_size (int, opcional): Artículos por página.
+
+    Returns:
+        dict: Resumen del tick (presupuesto, peticiones gastadas, artículos nuevos, queries consultadas).
+    """
+    engine = engine or init_engine(DATABASE_URL)
+    now = now or datetime.now(timezone.utc)
+    today = now.date()
+
+    used = get_api_requests(engine, today)
+    remaining = NEWSAPI_DAILY_QUOTA - NEWSAPI_QUOTA_RESERVE - used
+    budget = tick_budget(remaining, now, tick_interval)
+
+    summary = {"budget": budget, "quota_used": used, "requests": 0, "new_count": 0, "queries": []}
+    if budget <= 0:
+        logger.info("Cuota diaria agotada (%s/%s), tick omitido.", used, NEWSAPI_DAILY_QUOTA)
+        return summary
+
+    # Estado de las queries activas (las nuevas empiezan con el rendimiento optimista)
+    stored = load_query_states(engine)
+    states = [stored.get(query_hash(q)) or new_state(q, now) for q in build_q_from_db(engine=engine)]
+
+    for state, pages in plan_tick(states, now, budget, page_size):
+        since = now - MAX_LOOKBACK
+        if state["last_run_at"] is not None:
+            since = max(since, state["last_run_at"] - LOOKBACK_OVERLAP)
+
+        try:
+            res = ingest_window(
+                engine,
+                frm=since.isoformat(timespec="seconds"),
+                to=now.isoformat(timespec="seconds"),
+                page_size=page_size,
+                max_pages=pages,
+                queries=[state["query"]],
+                sort_by="publishedAt",
+            )
+        except RuntimeError as e:
+            if isinstance(e, NewsAPIError) and e.rate_limited:
+                logger.warning("NewsAPI rateLimited: se marca la cuota del día como agotada.")
+                set_api_requests(engine, today, NEWSAPI_DAILY_QUOTA)
+                break
+            logger.exception("Query %s FALLIDA", state["query_hash"][:8])
+            save_query_state(engine, update_state(state, 1, 0, now, page_size))
+            continue
+
+        requests = res["metrics"].get("requests", pages)
+        new_articles = res["metrics"].get("new_count", 0)
+        updated = update_state(state, requests, new_articles, now, page_size)
+        save_query_state(engine, updated)
+
+        summary["requests"] += requests
+        summary["new_count"] += new_articles
+        summary["queries"].append({
+            "query_hash": state["query_hash"][:8],
+            "pages": pages,
+            "requests": requests,
+            "new": new_articles,
+            "yield_ema": round(updated["yield_ema"], 2),
+            "next_run_at": updated["next_run_at"].isoformat(timespec="seconds"),
+        })
+
+    logger.info("Planner tick: %s", summary)
+    return summary
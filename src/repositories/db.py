@@ -1,8 +1,27 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Motores ya creados por URL: cada base de datos (primaria o réplica) mantiene su propio pool
+_engines = {}
+_engines_lock = threading.Lock()
+
+# Fracción de `staleness_secs` durante la que se reutiliza la última lectura de la marca
+# de escritura: las lecturas no consultan la primaria en cada petición
+MARKER_CHECK_FRACTION = 0.2
+
+# Estado de la marca en este proceso (instantes de time.monotonic)
+_marker = {"local_write": None, "primary_until": 0.0, "next_check": 0.0, "warned": False}
+_marker_lock = threading.Lock()
 
 def init_engine(db_url: str):
     """
     Inicializa el motor de conexión SQLAlchemy a la base de datos.
+    El motor se reutiliza entre llamadas con la misma URL para no crear un pool por petición.
 
     Parámetros:
         db_url (str): Cadena de conexión a la base de datos en formato SQLAlchemy.
@@ -12,4 +31,101 @@ def init_engine(db_url: str):
     """
     if not db_url:
         raise ValueError("DATABASE_URL no proporcionada")
-    return create_engine(db_url)
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = _engines[db_url] = create_engine(db_url, pool_pre_ping=True)
+    return engine
+
+def note_primary_write(engine) -> None:
+    """
+    Registra en la primaria el instante de un commit de ingesta. La marca vive en la
+    base de datos y no en el proceso, así que la ven todos los workers, el scheduler y
+    el DAG (ver `init_read_engine`).
+
+    Se llama después del commit, en una transacción propia con un UPDATE ciego de una
+    sola fila: las ingestas concurrentes no se esperan unas a otras mientras hacen su
+    upsert. Si falla, la ingesta ya está guardada y solo se registra un aviso.
+
+    Parámetros:
+        engine: Motor de la base de datos primaria.
+    """
+    with _marker_lock:
+        _marker["local_write"] = time.monotonic()
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE primary_writes SET written_at = clock_timestamp() WHERE id = 1"))
+    except SQLAlchemyError as e:
+        logger.warning("No se pudo registrar la escritura en primary_writes: %s", e)
+
+def recent_primary_write(engine, staleness_secs: float) -> bool:
+    """
+    Indica si hubo un commit de ingesta en la primaria hace menos de `staleness_secs`.
+
+    La edad de la marca se mide con el reloj de la propia base de datos y se consulta
+    como mucho una vez cada `staleness_secs * MARKER_CHECK_FRACTION` por proceso; entre
+    consultas se reutiliza el último resultado. Las escrituras de este mismo proceso se
+    conocen sin consultar.
+
+    Parámetros:
+        engine: Motor de la base de datos primaria.
+        staleness_secs (float): Desfase máximo tolerado tras una escritura.
+
+    Returns:
+        bool: True si hubo una escritura reciente. Si la marca no se puede leer (p. ej.
+            falta `primary_writes.sql`), False: se lee de la réplica y se avisa una vez.
+    """
+    now = time.monotonic()
+    with _marker_lock:
+        local = _marker["local_write"]
+        if local is not None and now - local < staleness_secs:
+            return True
+        if now < _marker["primary_until"]:
+            return True
+        if now < _marker["next_check"]:
+            return False
+        _marker["next_check"] = now + staleness_secs * MARKER_CHECK_FRACTION
+
+    try:
+        with engine.connect() as conn:
+            age = conn.execute(text(
+                "SELECT EXTRACT(EPOCH FROM clock_timestamp() - written_at) FROM primary_writes WHERE id = 1"
+            )).scalar()
+    except SQLAlchemyError as e:
+        with _marker_lock:
+            warned, _marker["warned"] = _marker["warned"], True
+        if not warned:
+            logger.warning("No se pudo consultar la última escritura en la primaria; "
+                           "las lecturas irán a la réplica: %s", e)
+        return False
+
+    if age is None or float(age) >= staleness_secs:
+        return False
+    with _marker_lock:
+        _marker["primary_until"] = max(_marker["primary_until"], now + staleness_secs - float(age))
+    return True
+
+def init_read_engine(db_url: str, read_url: str = None, staleness_secs: float = 5.0):
+    """
+    Motor para endpoints de solo lectura.
+
+    Si hay una réplica de lectura configurada se usa su pool, salvo justo después de
+    un commit de ingesta de cualquier proceso: durante `staleness_secs` se lee de la
+    primaria para no devolver datos anteriores a la escritura mientras la réplica se
+    pone al día. Las escrituras de otros procesos se detectan con un retraso de hasta
+    `staleness_secs * MARKER_CHECK_FRACTION` (ver `recent_primary_write`).
+
+    Parámetros:
+        db_url (str): Conexión a la base de datos primaria.
+        read_url (str, opcional): Conexión a la réplica de lectura; sin ella se usa la primaria.
+        staleness_secs (float, opcional): Desfase máximo tolerado tras una escritura.
+
+    Returns:
+        sqlalchemy.engine.Engine: Motor de la réplica o de la primaria.
+    """
+    if not read_url:
+        return init_engine(db_url)
+    primary = init_engine(db_url)
+    if staleness_secs > 0 and recent_primary_write(primary, staleness_secs):
+        return primary
+    return init_engine(read_url)
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timezone
+from typing import Dict
+import logging
+
+from sqlalchemy import text
+
+# Configuración del logger para el estado de la ingesta
+logger = logging.getLogger("repositories.ingestion_state")
+
+
+def record_api_requests(engine, n: int = 1) -> None:
+    """
+    Suma `n` peticiones a NewsAPI al consumo del día (UTC).
+    Si la tabla no está disponible solo se registra un aviso: la ingesta no se detiene.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        n (int, opcional): Número de peticiones realizadas.
+    """
+    if n <= 0:
+        return
+    sql = text("""
+        INSERT INTO newsapi_quota_usage (day, requests)
+        VALUES (:day, :n)
+        ON CONFLICT (day) DO UPDATE SET requests = newsapi_quota_usage.requests + EXCLUDED.requests
+    """)
+    try:
+        with engine.begin() as conn:
+            conn.execute(sql, {"day": datetime.now(timezone.utc).date(), "n": n})
+    except Exception as e:
+        logger.warning("No se pudo registrar el consumo de NewsAPI: %s", e)
+
+
+def set_api_requests(engine, day: date, requests: int) -> None:
+    """
+    Fija el consumo de un día (p. ej. al recibir `rateLimited` de NewsAPI, para
+    marcar la cuota como agotada).
+    """
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO newsapi_quota_usage (day, requests)
+            VALUES (:day, :n)
+            ON CONFLICT (day) DO UPDATE SET requests = GREATEST(newsapi_quota_usage.requests, EXCLUDED.requests)
+        """), {"day": day, "n": requests})
+
+
+def get_api_requests(engine, day: date) -> int:
+    """
+    Peticiones a NewsAPI consumidas en un día (UTC).
+    """
+    with engine.connect() as conn:
+        value = conn.execute(
+            text("SELECT requests FROM newsapi_quota_usage WHERE day = :day"), {"day": day}
+        ).scalar()
+    return int(value or 0)
+
+
+def load_query_states(engine) -> Dict[str, dict]:
+    """
+    Carga el estado de todas las queries conocidas.
+
+    Returns:
+        dict: {query_hash: fila de `ingestion_query_state` como diccionario}
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT query_hash, query, calls, new_articles, yield_ema, interval_secs, last_run_at, next_run_at
+            FROM ingestion_query_state
+        """)).mappings().all()
+    return {r["query_hash"]: dict(r) for r in rows}
+
+
+def save_query_state(engine, state: dict) -> None:
+    """
+    Inserta o actualiza el estado de una query.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        state (dict): Fila con las columnas de `ingestion_query_state`.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO ingestion_query_state
+                (query_hash, query, calls, new_articles, yield_ema, interval_secs, last_run_at, next_run_at)
+            VALUES
+                (:query_hash, :query, :calls, :new_articles, :yield_ema, :interval_secs, :last_run_at, :next_run_at)
+            ON CONFLICT (query_hash) DO UPDATE SET
+                query = EXCLUDED.query,
+                calls = EXCLUDED.calls,
+                new_articles = EXCLUDED.new_articles,
+                yield_ema = EXCLUDED.yield_ema,
+                interval_secs = EXCLUDED.interval_secs,
+                last_run_at = EXCLUDED.last_run_at,
+                next_run_at = EXCLUDED.next_run_at
+        """), state)
@@ -0,0 +1,184 @@
+"""
+Persistencia del filtro de Bloom de artículos ya guardados.
+
+Uso:
+    python -m src.repositories.known_filter --check     # tamaño y tasa de falsos positivos estimada
+    python -m src.repositories.known_filter --rebuild   # reconstruye el filtro desde `news`
+"""
+
+from typing import Iterable, Optional
+import argparse
+import logging
+
+from sqlalchemy import text
+
+from src.config.settings import KNOWN_FILTER_CAPACITY, KNOWN_FILTER_FP_RATE
+from src.services.clean_service import article_fingerprint
+from src.utils.bloom import BloomFilter
+
+# Configuración del logger para el módulo del filtro
+logger = logging.getLogger("repositories.known_filter")
+
+FILTER_NAME = "news"
+
+
+def _from_row(row) -> BloomFilter:
+    """
+    Construye un BloomFilter a partir de una fila de `news_known_filter`.
+    """
+    return BloomFilter(capacity=row["capacity"], fp_rate=row["fp_rate"],
+                       bits=bytes(row["bits"]), items=row["items"])
+
+
+def load_known_filter(engine) -> Optional[BloomFilter]:
+    """
+    Carga el filtro persistido. Si la tabla no existe o no se puede leer, devuelve
+    None y la ingesta continúa sin filtro (todos los artículos se procesan).
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+
+    Returns:
+        BloomFilter | None: Filtro cargado o vacío con los parámetros de configuración.
+    """
+    sql = text("SELECT capacity, fp_rate, items, bits FROM news_known_filter WHERE name = :name")
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(sql, {"name": FILTER_NAME}).mappings().first()
+    except Exception as e:
+        logger.warning("No se pudo cargar el filtro de artículos conocidos: %s", e)
+        return None
+
+    if row is None:
+        return BloomFilter(capacity=KNOWN_FILTER_CAPACITY, fp_rate=KNOWN_FILTER_FP_RATE)
+
+    bloom = _from_row(row)
+    if bloom.items > bloom.capacity:
+        logger.warning(
+            "Filtro de artículos conocidos por encima de su capacidad (%s > %s, fp≈%.4f); "
+            "conviene reconstruirlo con más capacidad.", bloom.items, bloom.capacity, bloom.estimated_fp_rate()
+        )
+    return bloom
+
+
+def _save(conn, bloom: BloomFilter) -> None:
+    """
+    Escribe el filtro completo en `news_known_filter`.
+    """
+    conn.execute(text("""
+        INSERT INTO news_known_filter (name, capacity, fp_rate, items, bits, updated_at)
+        VALUES (:name, :capacity, :fp_rate, :items, :bits, NOW())
+        ON CONFLICT (name) DO UPDATE
+        SET capacity = EXCLUDED.capacity, fp_rate = EXCLUDED.fp_rate, items = EXCLUDED.items,
+            bits = EXCLUDED.bits, updated_at = EXCLUDED.updated_at
+    """), {"name": FILTER_NAME, "capacity": bloom.capacity, "fp_rate": bloom.fp_rate,
+           "items": bloom.items, "bits": bytes(bloom.bits)})
+
+
+def remember_known(engine, bloom: BloomFilter, keys: Iterable[bytes]) -> None:
+    """
+    Añade huellas al filtro en memoria y lo persiste, uniéndolo con la versión guardada
+    por si otro proceso la ha actualizado entretanto. Debe llamarse después del commit
+    del upsert, para no marcar como conocidos artículos que no llegaron a guardarse, y
+    una sola vez por ingesta: cada llamada reescribe el filtro completo.
+
+    Si el filtro supera su capacidad, su tasa de falsos positivos crece y se saltarían
+    artículos que sí han cambiado: se reconstruye desde `news` con más capacidad.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        bloom (BloomFilter): Filtro en uso por la ingesta.
+        keys: Huellas de los artículos recién guardados.
+    """
+    bloom.update(keys)
+    try:
+        with engine.begin() as conn:
+            row = conn.execute(
+                text("SELECT capacity, fp_rate, items, bits FROM news_known_filter WHERE name = :name FOR UPDATE"),
+                {"name": FILTER_NAME},
+            ).mappings().first()
+            if row is not None:
+                stored = _from_row(row)
+                if (stored.num_bits, stored.num_hashes) == (bloom.num_bits, bloom.num_hashes):
+                    bloom.merge(stored)
+            _save(conn, bloom)
+    except Exception as e:
+        logger.warning("No se pudo persistir el filtro de artículos conocidos: %s", e)
+        return
+
+    if bloom.items > bloom.capacity:
+        logger.warning(
+            "Filtro de artículos conocidos por encima de su capacidad (%s > %s, fp≈%.4f); "
+            "se reconstruye con más capacidad.", bloom.items, bloom.capacity, bloom.estimated_fp_rate()
+        )
+        try:
+            rebuild_known_filter(engine, fp_rate=bloom.fp_rate)
+        except Exception as e:
+            logger.warning("No se pudo reconstruir el filtro de artículos conocidos: %s", e)
+
+
+def rebuild_known_filter(engine, capacity: int = None, fp_rate: float = None, batch_size: int = 5000) -> BloomFilter:
+    """
+    Reconstruye el filtro desde cero con las huellas de todas las filas de `news`.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        capacity (int, opcional): Capacidad del nuevo filtro (por defecto, la mayor entre
+            la configurada y el doble de filas actuales).
+        fp_rate (float, opcional): Tasa de falsos positivos objetivo.
+        batch_size (int, opcional): Filas leídas por lote.
+
+    Returns:
+        BloomFilter: Filtro reconstruido y persistido.
+    """
+    with engine.begin() as conn:
+        total = conn.execute(text("SELECT COUNT(*) FROM news")).scalar() or 0
+        bloom = BloomFilter(
+            capacity=capacity or max(KNOWN_FILTER_CAPACITY, 2 * total),
+            fp_rate=fp_rate or KNOWN_FILTER_FP_RATE,
+        )
+        result = conn.execute(text("""
+            SELECT n.url, n.title, n.description, c.content
+            FROM news n
+            LEFT JOIN news_content c ON c.news_id = n.id
+        """), execution_options={"stream_results": True, "yield_per": batch_size})
+        for url, title, description, content in result:
+            bloom.add(article_fingerprint(url, title, description, content))
+        _save(conn, bloom)
+
+    logger.info("Filtro reconstruido: %s artículos, %s bits, %s hashes, fp≈%.5f",
+                bloom.items, bloom.num_bits, bloom.num_hashes, bloom.estimated_fp_rate())
+    return bloom
+
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos para el mantenimiento del filtro.
+    """
+    parser = argparse.ArgumentParser(description="Mantenimiento del filtro de artículos conocidos.")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruye el filtro desde la tabla news.")
+    parser.add_argument("--check", action="store_true", help="Muestra tamaño y tasa de falsos positivos estimada.")
+    parser.add_argument("--capacity", type=int, default=None, help="Capacidad al reconstruir.")
+    parser.add_argument("--fp-rate", type=float, default=None, help="Tasa de falsos positivos objetivo al reconstruir.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from src.config.settings import DATABASE_URL
+    from src.repositories.db import init_engine
+    engine = init_engine(DATABASE_URL)
+
+    if args.rebuild:
+        rebuild_known_filter(engine, capacity=args.capacity, fp_rate=args.fp_rate)
+    elif args.check:
+        bloom = load_known_filter(engine)
+        if bloom is not None:
+            logger.info("capacity=%s items≈%s bits=%s hashes=%s fill=%.4f fp≈%.6f (objetivo %.6f)",
+                        bloom.capacity, bloom.estimated_items(), bloom.num_bits, bloom.num_hashes,
+                        bloom.fill_ratio(), bloom.estimated_fp_rate(), bloom.fp_rate)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,17 @@
-from sqlalchemy import Table, Column, BigInteger, Text, DateTime, MetaData, UniqueConstraint
+from collections import defaultdict
+import argparse
+import logging
+
+from sqlalchemy import (
+    Table, Column, BigInteger, Text, DateTime, MetaData, UniqueConstraint, ForeignKey, select, text, literal_column
+)
+from src.repositories.stats import apply_stats_delta, rebuild_stats
+from src.repositories.db import note_primary_write
+from src.repositories.tags import load_keyword_automaton, replace_tags
+from src.services.clean_service import canonicalize_url, url_hash
+
+# Configuración del logger para el repositorio de noticias
+logger = logging.getLogger("repositories.news")
 
 metadata = MetaData()
 
@@ -6,15 +19,24 @@ news = Table(
     "news", metadata,
     Column("id", BigInteger, primary_key=True, autoincrement=True),
     Column("url", Text, nullable=False),
+    Column("url_hash", BigInteger, nullable=False),
     Column("source_id", Text),
     Column("description", Text),
-    Column("content", Text),
     Column("author", Text),
     Column("url_to_image", Text),
     Column("published_at", DateTime(timezone=True)),
     Column("source_name", Text, nullable=False),
     Column("title", Text),
-    UniqueConstraint("url", name="uq_news_url"),
+    UniqueConstraint("url_hash", name="uq_news_url_hash"),
+)
+
+# Cuerpo de los artículos, fuera de la fila caliente de `news`
+news_content = Table(
+    "news_content", metadata,
+    Column("news_id", BigInteger, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True),
+    Column("content", Text),
+    Column("full_content", Text),
+    Column("full_content_fetched_at", DateTime(timezone=True)),
 )
 
 def upsert_news_bulk(engine, df) -> int:
@@ -23,42 +45,318 @@ def upsert_news_bulk(engine, df) -> int:
 
     Parámetros:
         engine: Motor de conexión de SQLAlchemy
-        df: DataFrame con la información que debe de ser insertada
-    
+        df: DataFrame (o lista de `ArticleRecord`) con la información que debe de ser insertada
+
     Returns:
         Lóngitud de filas insertadas en la Base de Datos
     """
-    if df is None or df.empty:
-        return 0
+    return upsert_news_counts(engine, df)["written"]
+
+def upsert_news_counts(engine, df) -> dict:
+    """
+    Inserta los registros limpios y filtrados de la API en la base de datos.
+    La fila de `news`, su cuerpo en `news_content`, los agregados de `news_stats_*`
+    y las keywords de `news_keyword_tags` se actualizan en la misma transacción.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy
+        df: DataFrame (o lista de `ArticleRecord`) con la información que debe de ser insertada
+
+    Returns:
+        dict:
+            written (int): Filas insertadas o actualizadas.
+            new (int): Filas que no existían antes en la Base de Datos.
+    """
+    if df is None or len(df) == 0:
+        return {"written": 0, "new": 0}
+
+    # Acepta el DataFrame de la ruta pandas o la lista de `ArticleRecord` de la ruta ligera
+    records = df.to_dict(orient="records") if hasattr(df, "to_dict") else (r.as_dict() for r in df)
 
     rows = []
-    for r in df.to_dict(orient="records"):
+    contents = {}
+    for r in records:
+        key = r.get("url_hash")
+        if key is None or key != key:
+            key = url_hash(canonicalize_url(r.get("url")))
         rows.append({
             "url":          r.get("url"),
+            "url_hash":     int(key),
             "source_id":    r.get("source_id"),
             "description":  r.get("description"),
-            "content":      r.get("content"),
             "author":       r.get("author"),
             "url_to_image": r.get("url_to_image"),
             "published_at": r.get("published_at"),
             "source_name":  r.get("source_name") or "",
             "title":        r.get("title")
         })
+        contents[int(key)] = r.get("content")
+
+    # Orden fijo de claves: dos lotes que se solapan (p. ej. workers del backfill)
+    # bloquean las filas comunes en el mismo orden y no pueden entrar en deadlock
+    rows.sort(key=lambda r: r["url_hash"])
 
     from sqlalchemy.dialects.postgresql import insert as pg_insert
     stmt = pg_insert(news).values(rows)
     update_cols = {
         "source_id":    stmt.excluded.source_id,
         "description":  stmt.excluded.description,
-        "content":      stmt.excluded.content,
         "author":       stmt.excluded.author,
         "url_to_image": stmt.excluded.url_to_image,
         "published_at": stmt.excluded.published_at,
         "source_name":  stmt.excluded.source_name,
         "title":        stmt.excluded.title
     }
-    upsert = stmt.on_conflict_do_update(index_elements=["url"], set_=update_cols)
+    # `xmax = 0` solo en las filas recién insertadas (las actualizadas quedan bloqueadas
+    # por esta transacción): el upsert dice qué filas son nuevas
+    upsert = (
+        stmt.on_conflict_do_update(index_elements=["url_hash"], set_=update_cols)
+        .returning(news.c.id, news.c.url_hash, literal_column("(xmax = 0)").label("inserted"))
+    )
+
+    # Estado previo de las filas afectadas, para actualizar los agregados por diferencia
+    previous = (
+        select(news.c.url_hash, news.c.url, news.c.published_at, news.c.source_name, news.c.title,
+               news.c.description, news_content.c.content)
+        .select_from(news.outerjoin(news_content, news_content.c.news_id == news.c.id))
+        .where(news.c.url_hash.in_(list(contents)))
+    )
+
+    with engine.begin() as conn:
+        # Lock por URL hasta el commit, en orden de hash. Sin él, dos transacciones que
+        # insertan la misma URL nueva no ven fila previa y ambas suman +1 a los agregados;
+        # con él, la segunda espera y su lectura del estado previo ve la fila de la primera
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(h) FROM unnest(CAST(:hashes AS BIGINT[])) AS h"),
+            {"hashes": [r["url_hash"] for r in rows]},
+        )
+        old_rows = conn.execute(previous).mappings().all()
+        ids = conn.execute(upsert).all()
+        inserted = {key for _, key, is_new in ids if is_new}
+
+        content_rows = [{"news_id": news_id, "content": contents.get(key)} for news_id, key, _ in ids]
+        content_stmt = pg_insert(news_content).values(content_rows)
+        conn.execute(content_stmt.on_conflict_do_update(
+            index_elements=["news_id"],
+            set_={"content": content_stmt.excluded.content},
+        ))
+
+        # Etiquetas y agregados por categoría salen del mismo autómata de keywords
+        automaton = load_keyword_automaton(conn)
+        apply_stats_delta(conn, old_rows=[r for r in old_rows if r["url_hash"] not in inserted],
+                          new_rows=[{**r, "content": contents.get(r["url_hash"])} for r in rows],
+                          automaton=automaton)
+
+        by_hash = {r["url_hash"]: r for r in rows}
+        replace_tags(conn, [{**by_hash[key], "id": news_id, "content": contents.get(key)} for news_id, key, _ in ids],
+                     automaton=automaton)
+
+    # Las lecturas inmediatas deben ver esta escritura aunque la réplica vaya con retraso
+    note_primary_write(engine)
+    return {"written": len(rows), "new": len(inserted)}
+
+def select_urls_to_enrich(engine, urls=None, limit: int = 500) -> list:
+    """
+    URLs de artículos cuyo cuerpo completo aún no se ha intentado descargar.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy
+        urls (list, opcional): Restringe la búsqueda a estas URLs (p. ej. las de la última ingesta).
+        limit (int, opcional): Máximo de URLs a devolver (las más recientes primero).
+
+    Returns:
+        list: URLs pendientes.
+    """
+    stmt = (
+        select(news.c.url)
+        .select_from(news.outerjoin(news_content, news_content.c.news_id == news.c.id))
+        .where(news_content.c.full_content_fetched_at.is_(None))
+        .order_by(news.c.published_at.desc().nulls_last())
+        .limit(limit)
+    )
+    if urls is not None:
+        hashes = list({url_hash(canonicalize_url(u)) for u in urls if u})
+        if not hashes:
+            return []
+        stmt = stmt.where(news.c.url_hash.in_(hashes))
+    with engine.connect() as conn:
+        return list(conn.execute(stmt).scalars())
+
+def store_full_content(engine, texts: dict) -> int:
+    """
+    Guarda el cuerpo completo descargado de cada artículo. Las URLs sin texto se
+    marcan como intentadas para no volver a descargarlas en cada ejecución.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy
+        texts (dict): {url: texto extraído o None}
+
+    Returns:
+        int: Artículos con cuerpo completo guardado.
+    """
+    if not texts:
+        return 0
+    rows = [{"url_hash": url_hash(canonicalize_url(u)), "full_content": t} for u, t in texts.items()]
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO news_content (news_id, full_content, full_content_fetched_at)
+            SELECT id, :full_content, NOW() FROM news WHERE url_hash = :url_hash
+            ON CONFLICT (news_id) DO UPDATE SET
+                full_content = COALESCE(EXCLUDED.full_content, news_content.full_content),
+                full_content_fetched_at = EXCLUDED.full_content_fetched_at
+        """), rows)
+    note_primary_write(engine)
+    return sum(1 for r in rows if r["full_content"])
+
+# Columnas que GET /news puede devolver (proyección `fields=`)
+NEWS_LIST_FIELDS = ("url", "title", "description", "author", "url_to_image", "published_at", "source_name")
+
+def build_news_query(limit: int = 50, offset: int = 0, fields=None, source_name: str = None, author: str = None,
+                     published_from=None, published_to=None, category: str = None, keyword: str = None):
+    """
+    Construye la consulta de GET /news con los filtros y la proyección en SQL.
+    Cada filtro tiene un índice que además sirve el orden por `published_at`:
+
+    - source_name: idx_news_source_published (source_name, published_at DESC NULLS LAST)
+    - author: idx_news_author_published (lower(author), published_at DESC NULLS LAST)
+    - published_from / published_to: idx_news_published_covering (published_at DESC NULLS LAST,
+      con `url_hash` y `source_name` en INCLUDE: Index Only Scan si solo se piden esas columnas)
+    - category / keyword: news_keyword_tags (ver src/schemas/news_tags.sql)
+
+    Parámetros:
+        limit (int, opcional): Número máximo de noticias.
+        offset (int, opcional): Registros a saltar.
+        fields (list, opcional): Columnas a devolver (subconjunto de `NEWS_LIST_FIELDS`).
+        source_name (str, opcional): Fuente exacta.
+        author (str, opcional): Autor (sin distinguir mayúsculas).
+        published_from (datetime, opcional): Publicadas en o después de este instante.
+        published_to (datetime, opcional): Publicadas antes de este instante.
+        category (str, opcional): Con alguna keyword de esta categoría.
+        keyword (str, opcional): Con este término de `news_keywords`.
+
+    Returns:
+        tuple: (sentencia SQL, parámetros)
+    """
+    fields = list(fields or NEWS_LIST_FIELDS)
+    unknown = [f for f in fields if f not in NEWS_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos no válidos en fields: {', '.join(unknown)}")
+
+    where, params = [], {"limit": limit, "offset": offset}
+    if source_name is not None:
+        where.append("source_name = :source_name")
+        params["source_name"] = source_name
+    if author is not None:
+        where.append("lower(author) = lower(:author)")
+        params["author"] = author
+    if published_from is not None:
+        where.append("published_at >= :published_from")
+        params["published_from"] = published_from
+    if published_to is not None:
+        where.append("published_at < :published_to")
+        params["published_to"] = published_to
+    if category is not None:
+        where.append("""EXISTS (
+            SELECT 1 FROM news_keyword_tags t
+            WHERE t.news_id = news.id AND t.category = :category)""")
+        params["category"] = category.upper()
+    if keyword is not None:
+        where.append("""EXISTS (
+            SELECT 1 FROM news_keyword_tags t
+            JOIN news_keywords k ON k.id = t.keyword_id
+            WHERE t.news_id = news.id AND lower(k.term) = lower(:keyword))""")
+        params["keyword"] = keyword
+
+    sql = text(f"""
+        SELECT {", ".join(dict.fromkeys(fields))}
+        FROM news
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY published_at DESC NULLS LAST
+        LIMIT :limit OFFSET :offset
+    """)
+    return sql, params
+
+def list_news_rows(engine, **filters) -> list:
+    """
+    Lista noticias aplicando los filtros de `build_news_query`.
+
+    Returns:
+        list: Filas como diccionarios (fechas en ISO 8601).
+    """
+    sql, params = build_news_query(**filters)
+    with engine.connect() as conn:
+        data = [dict(r) for r in conn.execute(sql, params).mappings().all()]
 
+    # Serialización de fechas a formato ISO 8601
+    for r in data:
+        if r.get("published_at") is not None:
+            r["published_at"] = r["published_at"].isoformat()
+    return data
+
+
+def rehash_urls(engine, batch_size: int = 5000) -> dict:
+    """
+    Recalcula `url_hash` sobre la URL canónica de cada noticia (migración de las filas
+    anteriores, que recibieron el hash de la URL tal y como se guardó). Las filas que
+    resultan ser la misma noticia se fusionan: se conserva la que ya tenía el hash
+    canónico (escrita por la ingesta actual) o, si no, la más reciente. La URL guardada
+    no se modifica. Si se elimina alguna fila, se recalculan los agregados.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy
+        batch_size (int, opcional): Filas leídas por lote al recorrer `news`.
+
+    Returns:
+        dict: Filas recorridas, actualizadas y eliminadas por duplicadas.
+    """
+    groups = defaultdict(list)
     with engine.begin() as conn:
-        conn.execute(upsert)
-    return len(rows)
\ No newline at end of file
+        # Bloquea las escrituras de la ingesta mientras dura la migración
+        conn.execute(text("LOCK TABLE news IN SHARE ROW EXCLUSIVE MODE"))
+
+        result = conn.execute(text("SELECT id, url, url_hash FROM news"),
+                              execution_options={"stream_results": True, "yield_per": batch_size})
+        scanned = 0
+        for news_id, url, old_hash in result:
+            groups[url_hash(canonicalize_url(url))].append((old_hash, news_id))
+            scanned += 1
+
+        duplicates, updates = [], []
+        for key, members in groups.items():
+            keep = max(members, key=lambda m: (m[0] == key, m[1]))
+            duplicates.extend(news_id for _, news_id in members if news_id != keep[1])
+            if keep[0] != key:
+                updates.append({"id": keep[1], "url_hash": key})
+
+        if duplicates:
+            conn.execute(text("DELETE FROM news WHERE id = ANY(:ids)"), {"ids": duplicates})
+        if updates:
+            conn.execute(text("UPDATE news SET url_hash = :url_hash WHERE id = :id"), updates)
+
+    if duplicates:
+        rebuild_stats(engine)
+
+    out = {"scanned": scanned, "rehashed": len(updates), "merged": len(duplicates)}
+    logger.info("URL hashes recalculated: %s", out)
+    return out
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos para mantenimiento de `news`.
+    """
+    parser = argparse.ArgumentParser(description="Mantenimiento de la tabla de noticias.")
+    parser.add_argument("--rehash-urls", action="store_true",
+                        help="Recalcula url_hash sobre la URL canónica y fusiona duplicados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.rehash_urls:
+        from src.config.settings import DATABASE_URL
+        from src.repositories.db import init_engine
+        rehash_urls(init_engine(DATABASE_URL))
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
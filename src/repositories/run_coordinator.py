@@ -0,0 +1,192 @@
+"""
+Coordinación entre procesos de las ejecuciones de ingesta.
+
+Con varios workers de gunicorn (cada uno con su scheduler) o junto al DAG de Airflow,
+la misma ingesta podía lanzarse N veces a la vez y competir por las mismas filas.
+Cada ejecución toma un advisory lock de PostgreSQL. Todas las ingestas que escriben en
+`news` (POST /ingest, el tick del planificador y el DAG) comparten el mismo lock
+(`INGESTION_LOCK`), así que nunca se solapan aunque sus parámetros sean distintos:
+
+- Si el lock está libre, se ejecuta y el resultado se guarda en `ingestion_runs`.
+- Si está ocupado y `wait=False`, la llamada se descarta (coalesced).
+- Si está ocupado y `wait=True`, se espera a que quede libre. Si mientras tanto ha
+  terminado una ejecución del mismo ámbito (`scope`, p. ej. los mismos parámetros),
+  se devuelve su resultado sin repetir la ingesta; si no, se ejecuta.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+import hashlib
+import json
+import logging
+import time
+
+from sqlalchemy import text
+
+# Configuración del logger para el coordinador de ejecuciones
+logger = logging.getLogger("repositories.run_coordinator")
+
+# Lock común de las ingestas que escriben en `news`
+INGESTION_LOCK = "ingestion"
+
+
+class RunInProgressError(RuntimeError):
+    """
+    La ejecución en curso no ha terminado dentro del tiempo máximo de espera.
+    """
+
+
+def lock_key(scope: str) -> int:
+    """
+    Clave BIGINT del advisory lock de un ámbito (8 primeros bytes del MD5).
+    """
+    return int.from_bytes(hashlib.md5(scope.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+def _try_lock(conn, key: int) -> Tuple[bool, datetime]:
+    """
+    Intenta tomar el advisory lock de sesión sin bloquear.
+
+    Returns:
+        tuple: (lock tomado, hora actual de la base de datos)
+    """
+    acquired, db_now = conn.execute(text("SELECT pg_try_advisory_lock(:key), NOW()"), {"key": key}).one()
+    conn.commit()
+    return bool(acquired), db_now
+
+
+def _acquire(engine, key: int):
+    """
+    Intenta tomar el lock con una conexión del pool. Si no se consigue, la conexión se
+    devuelve al pool enseguida: mientras se espera no se retiene ninguna.
+
+    Returns:
+        tuple: (conexión con el lock tomado o None, hora actual de la base de datos)
+    """
+    conn = engine.connect()
+    try:
+        acquired, db_now = _try_lock(conn, key)
+    except Exception:
+        conn.close()
+        raise
+    if not acquired:
+        conn.close()
+        return None, db_now
+    return conn, db_now
+
+
+def _unlock(conn, key: int) -> None:
+    """
+    Libera el advisory lock de sesión. Si falla, la conexión se invalida para que
+    PostgreSQL libere el lock al cerrarla.
+    """
+    try:
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+        conn.commit()
+    except Exception:
+        logger.exception("No se pudo liberar el lock %s; se descarta la conexión", key)
+        conn.invalidate()
+
+
+def _start_run(engine, scope: str) -> int:
+    """
+    Registra el inicio de una ejecución y devuelve su id.
+    """
+    with engine.begin() as conn:
+        return conn.execute(
+            text("INSERT INTO ingestion_runs (scope) VALUES (:scope) RETURNING id"), {"scope": scope}
+        ).scalar()
+
+
+def _finish_run(engine, run_id: int, status: str, result: Any) -> None:
+    """
+    Registra el fin de una ejecución con su estado y resultado.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE ingestion_runs
+            SET finished_at = NOW(), status = :status, result = CAST(:result AS JSONB)
+            WHERE id = :id
+        """), {"id": run_id, "status": status, "result": json.dumps(result, default=str)})
+
+
+def _finished_since(engine, scope: str, since: datetime) -> Optional[dict]:
+    """
+    Última ejecución correcta del ámbito terminada después de `since`.
+    """
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT id, result
+            FROM ingestion_runs
+            WHERE scope = :scope AND status = 'success' AND finished_at >= :since
+            ORDER BY finished_at DESC
+            LIMIT 1
+        """), {"scope": scope, "since": since}).mappings().first()
+    return dict(row) if row else None
+
+
+def run_exclusive(engine, scope: str, fn: Callable[[], Any], wait: bool = True,
+                  timeout_secs: float = 900, poll_secs: float = 1.0,
+                  lock_scope: Optional[str] = None) -> Tuple[Optional[Any], bool]:
+    """
+    Ejecuta `fn` garantizando que solo hay una ejecución en curso por lock entre
+    todos los procesos que comparten la base de datos.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy (PostgreSQL).
+        scope (str): Ámbito de la ejecución (p. ej. 'process_ingestion:7:100:1'); solo se
+            reutiliza el resultado de otra ejecución del mismo ámbito.
+        fn (Callable): Función a ejecutar; su resultado debe ser serializable a JSON.
+        wait (bool, opcional): Si el lock está ocupado, esperar a que quede libre (True)
+            o descartar la llamada (False).
+        timeout_secs (float, opcional): Espera máxima por el lock.
+        poll_secs (float, opcional): Intervalo de reintento del lock mientras se espera.
+        lock_scope (str, opcional): Lock a tomar (p. ej. `INGESTION_LOCK`, compartido por
+            ámbitos distintos); por defecto, el propio `scope`.
+
+    Returns:
+        tuple:
+            result: Resultado de `fn` (o de la ejecución del mismo ámbito); None si se descartó.
+            coalesced (bool): True si no se ejecutó `fn` en esta llamada.
+
+    Raises:
+        RunInProgressError: Si el lock sigue ocupado pasados `timeout_secs`.
+    """
+    key = lock_key(lock_scope or scope)
+    started = time.monotonic()
+
+    # La hora de llegada se toma del reloj de la base de datos, el mismo que escribe
+    # `finished_at`: comparar con el reloj local fallaría si los relojes difieren
+    lock_conn, arrived_at = _acquire(engine, key)
+
+    if lock_conn is None and not wait:
+        logger.info("Ejecución '%s' descartada: hay otra ingesta en curso.", scope)
+        return None, True
+
+    waited = lock_conn is None
+    while lock_conn is None:
+        if time.monotonic() - started > timeout_secs:
+            raise RunInProgressError(f"Timeout esperando a la ingesta en curso ('{scope}')")
+        time.sleep(poll_secs)
+        lock_conn, _ = _acquire(engine, key)
+
+    try:
+        # Si hemos esperado y mientras tanto ha terminado una ejecución del mismo
+        # ámbito, se devuelve su resultado en lugar de repetirla
+        if waited:
+            previous = _finished_since(engine, scope, arrived_at)
+            if previous is not None:
+                logger.info("Ejecución '%s' coalescida con la ejecución %s.", scope, previous["id"])
+                return previous["result"], True
+
+        run_id = _start_run(engine, scope)
+        try:
+            result = fn()
+        except Exception as e:
+            _finish_run(engine, run_id, "error", {"message": str(e)})
+            raise
+        _finish_run(engine, run_id, "success", result)
+        return result, False
+    finally:
+        _unlock(lock_conn, key)
+        lock_conn.close()
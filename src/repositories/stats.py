@@ -0,0 +1,236 @@
+"""
+Agregados analíticos de noticias (día × fuente y día × categoría).
+
+Las tablas se mantienen de forma incremental dentro de la transacción de
+`upsert_news_bulk`, calculando la diferencia entre el estado anterior y el nuevo de
+cada fila. Las categorías de cada artículo salen del mismo autómata de keywords que
+sus etiquetas (ver `src/repositories/tags.py`). Si alguna vez se desincronizan,
+pueden recalcularse desde cero:
+
+    python -m src.repositories.stats --rebuild
+"""
+
+from collections import Counter
+from datetime import timezone
+from typing import Dict, Iterable, List, Optional
+import argparse
+import logging
+
+from sqlalchemy import text
+
+from src.repositories.tags import load_keyword_automaton, tag_row
+from src.utils.aho_corasick import AhoCorasick
+
+# Configuración del logger para el módulo de estadísticas
+logger = logging.getLogger("repositories.stats")
+
+SOURCE_TABLE = "news_stats_daily_source"
+CATEGORY_TABLE = "news_stats_daily_category"
+
+def match_categories(row: dict, automaton: AhoCorasick) -> List[str]:
+    """
+    Devuelve las categorías cuyas keywords aparecen en título, descripción o contenido.
+
+    Parámetros:
+        row (dict): Fila con 'title', 'description' y 'content'.
+        automaton (AhoCorasick): Autómata de `load_keyword_automaton`.
+
+    Returns:
+        List[str]: Categorías encontradas.
+    """
+    return sorted({category for _, category in tag_row(row, automaton)})
+
+
+def _day(value):
+    """
+    Día UTC de una fecha de publicación (datetime o pd.Timestamp).
+    """
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).date()
+
+
+def count_rows(rows: Iterable[dict], automaton: AhoCorasick):
+    """
+    Cuenta filas por (día, fuente) y por (día, categoría).
+
+    Returns:
+        tuple: (Counter por fuente, Counter por categoría)
+    """
+    by_source, by_category = Counter(), Counter()
+    for r in rows:
+        day = _day(r.get("published_at"))
+        if day is None:
+            continue
+        by_source[(day, r.get("source_name") or "")] += 1
+        for cat in match_categories(r, automaton):
+            by_category[(day, cat)] += 1
+    return by_source, by_category
+
+
+def _diff(new: Counter, old: Counter) -> Dict[tuple, int]:
+    """
+    Diferencia con signo entre dos contadores, sin las claves que no cambian.
+    """
+    keys = set(new) | set(old)
+    return {k: new[k] - old[k] for k in keys if new[k] != old[k]}
+
+
+def _apply(conn, table: str, dim: str, delta: Dict[tuple, int]) -> None:
+    """
+    Suma los incrementos (positivos o negativos) a la tabla de agregados.
+    """
+    if not delta:
+        return
+    sql = text(f"""
+        INSERT INTO {table} (day, {dim}, articles)
+        VALUES (:day, :key, :delta)
+        ON CONFLICT (day, {dim}) DO UPDATE
+        SET articles = {table}.articles + EXCLUDED.articles
+    """)
+    conn.execute(sql, [{"day": day, "key": key, "delta": d} for (day, key), d in sorted(delta.items())])
+
+
+def apply_stats_delta(conn, old_rows: Iterable[dict], new_rows: Iterable[dict],
+                      automaton: AhoCorasick = None) -> None:
+    """
+    Actualiza los agregados con la diferencia entre el estado previo de las filas
+    (vacío si eran nuevas) y el estado que se acaba de escribir.
+    Debe llamarse dentro de la misma transacción que el upsert.
+
+    Parámetros:
+        conn: Conexión SQLAlchemy con transacción abierta.
+        old_rows: Filas tal y como estaban en BD antes del upsert.
+        new_rows: Filas escritas en el upsert.
+        automaton (AhoCorasick, opcional): Autómata ya compilado; si no, se carga de BD.
+    """
+    automaton = automaton or load_keyword_automaton(conn)
+    old_src, old_cat = count_rows(old_rows, automaton)
+    new_src, new_cat = count_rows(new_rows, automaton)
+
+    _apply(conn, SOURCE_TABLE, "source_name", _diff(new_src, old_src))
+    _apply(conn, CATEGORY_TABLE, "category", _diff(new_cat, old_cat))
+
+
+def rebuild_stats(engine, batch_size: int = 5000) -> dict:
+    """
+    Recalcula desde cero las tablas de agregados a partir de `news`.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        batch_size (int, opcional): Filas leídas por lote al recorrer `news`.
+
+    Returns:
+        dict: Número de filas escritas en cada tabla.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {SOURCE_TABLE}, {CATEGORY_TABLE}"))
+
+        res = conn.execute(text(f"""
+            INSERT INTO {SOURCE_TABLE} (day, source_name, articles)
+            SELECT (published_at AT TIME ZONE 'UTC')::date, COALESCE(source_name, ''), COUNT(*)
+            FROM news
+            WHERE published_at IS NOT NULL
+            GROUP BY 1, 2
+        """))
+        source_rows = res.rowcount
+
+        automaton = load_keyword_automaton(conn)
+        by_category = Counter()
+        result = conn.execute(text("""
+            SELECT n.published_at, n.title, n.description, c.content
+            FROM news n
+            LEFT JOIN news_content c ON c.news_id = n.id
+            WHERE n.published_at IS NOT NULL
+        """), execution_options={"stream_results": True, "yield_per": batch_size})
+        for r in result.mappings():
+            day = _day(r["published_at"])
+            for cat in match_categories(r, automaton):
+                by_category[(day, cat)] += 1
+        _apply(conn, CATEGORY_TABLE, "category", dict(by_category))
+
+    out = {"source_rows": source_rows, "category_rows": len(by_category)}
+    logger.info("Stats rebuilt: %s", out)
+    return out
+
+
+def _query_stats(engine, table: str, dim: str, frm=None, to=None, key: Optional[str] = None) -> List[dict]:
+    """
+    Lee filas de una tabla de agregados filtrando por rango de días y dimensión.
+    """
+    where, params = ["articles > 0"], {}
+    if frm is not None:
+        where.append("day >= :frm")
+        params["frm"] = frm
+    if to is not None:
+        where.append("day <= :to")
+        params["to"] = to
+    if key is not None:
+        where.append(f"{dim} = :key")
+        params["key"] = key
+
+    sql = text(f"""
+        SELECT day, {dim}, articles
+        FROM {table}
+        WHERE {" AND ".join(where)}
+        ORDER BY day DESC, articles DESC
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(sql, params).mappings().all()
+    return [{"day": r["day"].isoformat(), dim: r[dim], "articles": int(r["articles"])} for r in rows]
+
+
+def get_source_stats(engine, frm=None, to=None, source_name: Optional[str] = None) -> List[dict]:
+    """
+    Artículos por día y fuente.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        frm (date, opcional): Primer día incluido.
+        to (date, opcional): Último día incluido.
+        source_name (str, opcional): Filtra por una fuente concreta.
+
+    Returns:
+        List[dict]: [{"day", "source_name", "articles"}, ...]
+    """
+    return _query_stats(engine, SOURCE_TABLE, "source_name", frm=frm, to=to, key=source_name)
+
+
+def get_category_stats(engine, frm=None, to=None, category: Optional[str] = None) -> List[dict]:
+    """
+    Artículos por día y categoría de keyword.
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        frm (date, opcional): Primer día incluido.
+        to (date, opcional): Último día incluido.
+        category (str, opcional): Filtra por una categoría concreta (sin distinguir
+            mayúsculas: las categorías se guardan en mayúsculas, como en `news_keywords`).
+
+    Returns:
+        List[dict]: [{"day", "category", "articles"}, ...]
+    """
+    return _query_stats(engine, CATEGORY_TABLE, "category", frm=frm, to=to,
+                        key=category.upper() if category else None)
+
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos para mantenimiento de agregados.
+    """
+    parser = argparse.ArgumentParser(description="Mantenimiento de las tablas de agregados de noticias.")
+    parser.add_argument("--rebuild", action="store_true", help="Recalcula los agregados desde cero.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.rebuild:
+        from src.config.settings import DATABASE_URL
+        from src.repositories.db import init_engine
+        rebuild_stats(init_engine(DATABASE_URL))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Etiquetado de noticias con las keywords que contienen.
+
+Todas las keywords activas (todos los idiomas, sin las negadas) se compilan en un
+único autómata de Aho-Corasick, de modo que cada artículo se recorre una sola vez.
+Las coincidencias se guardan en `news_keyword_tags` dentro de la transacción del
+upsert. El mismo autómata decide las categorías que cuentan los agregados de
+`src/repositories/stats.py`, así que etiquetas y estadísticas siempre coinciden.
+Si alguna vez se desincronizan, pueden recalcularse desde cero:
+
+    python -m src.repositories.tags --rebuild
+"""
+
+from typing import Iterable, List
+import argparse
+import logging
+import threading
+
+from sqlalchemy import text
+
+from src.utils.aho_corasick import AhoCorasick
+
+# Configuración del logger para el etiquetado
+logger = logging.getLogger("repositories.tags")
+
+# Autómata compilado para el último conjunto de keywords: se reutiliza entre upserts
+# mientras las keywords no cambien
+_automaton_cache = {}
+_automaton_lock = threading.Lock()
+
+
+def load_keyword_automaton(conn) -> AhoCorasick:
+    """
+    Compila las keywords activas en un autómata cuyo valor es (keyword_id, categoría).
+    Solo se recompila si las keywords han cambiado.
+
+    Parámetros:
+        conn: Conexión SQLAlchemy abierta.
+
+    Returns:
+        AhoCorasick: Autómata con todas las keywords activas.
+    """
+    rows = conn.execute(text("""
+        SELECT id, term, category
+        FROM news_keywords
+        WHERE active = TRUE AND negate = FALSE
+    """))
+    key = frozenset(tuple(r) for r in rows)
+    with _automaton_lock:
+        automaton = _automaton_cache.get(key)
+        if automaton is None:
+            _automaton_cache.clear()
+            automaton = _automaton_cache[key] = AhoCorasick(
+                (term, (kid, category)) for kid, term, category in key
+            )
+    return automaton
+
+
+def tag_row(row: dict, automaton: AhoCorasick) -> set:
+    """
+    Keywords que aparecen en título, descripción o contenido de un artículo.
+
+    Returns:
+        set: {(keyword_id, categoria), ...}
+    """
+    body = "\n".join(str(row.get(c) or "") for c in ("title", "description", "content"))
+    return automaton.values_in(body)
+
+
+def replace_tags(conn, rows: List[dict], automaton: AhoCorasick = None) -> int:
+    """
+    Sustituye las etiquetas de los artículos indicados por las que contiene su texto actual.
+    Debe llamarse dentro de la misma transacción que el upsert.
+
+    Parámetros:
+        conn: Conexión SQLAlchemy con transacción abierta.
+        rows (List[dict]): Filas con 'id' (de `news`), 'title', 'description' y 'content'.
+        automaton (AhoCorasick, opcional): Autómata ya compilado; si no, se carga de BD.
+
+    Returns:
+        int: Etiquetas escritas.
+    """
+    if not rows:
+        return 0
+    automaton = automaton or load_keyword_automaton(conn)
+
+    conn.execute(text("DELETE FROM news_keyword_tags WHERE news_id = ANY(:ids)"), {"ids": [r["id"] for r in rows]})
+    return _insert_tags(conn, rows, automaton)
+
+
+def rebuild_tags(engine, batch_size: int = 5000) -> dict:
+    """
+    Recalcula desde cero `news_keyword_tags` (p. ej. tras cambiar las keywords).
+
+    Parámetros:
+        engine: Motor de conexión de SQLAlchemy.
+        batch_size (int, opcional): Artículos leídos y etiquetados por lote.
+
+    Returns:
+        dict: Artículos recorridos y etiquetas escritas.
+    """
+    articles = written = 0
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE news_keyword_tags"))
+        automaton = load_keyword_automaton(conn)
+
+        result = conn.execute(text("""
+            SELECT n.id, n.title, n.description, c.content
+            FROM news n
+            LEFT JOIN news_content c ON c.news_id = n.id
+        """), execution_options={"stream_results": True, "yield_per": batch_size})
+        for batch in result.mappings().partitions():
+            written += _insert_tags(conn, batch, automaton)
+            articles += len(batch)
+
+    out = {"articles": articles, "tags": written}
+    logger.info("Tags rebuilt: %s", out)
+    return out
+
+
+def _insert_tags(conn, batch: Iterable[dict], automaton: AhoCorasick) -> int:
+    """
+    Etiqueta un lote de artículos sin borrar etiquetas previas (tabla recién vaciada).
+    """
+    tags: List[dict] = [
+        {"news_id": r["id"], "keyword_id": kid, "category": category}
+        for r in batch
+        for kid, category in tag_row(r, automaton)
+    ]
+    if tags:
+        conn.execute(text("""
+            INSERT INTO news_keyword_tags (news_id, keyword_id, category)
+            VALUES (:news_id, :keyword_id, :category)
+        """), tags)
+    return len(tags)
+
+
+def main(argv=None) -> None:
+    """
+    Punto de entrada de línea de comandos para mantenimiento de etiquetas.
+    """
+    parser = argparse.ArgumentParser(description="Mantenimiento de las etiquetas de keywords de las noticias.")
+    parser.add_argument("--rebuild", action="store_true", help="Recalcula las etiquetas desde cero.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.rebuild:
+        from src.config.settings import DATABASE_URL
+        from src.repositories.db import init_engine
+        rebuild_tags(init_engine(DATABASE_URL))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
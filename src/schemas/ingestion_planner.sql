@@ -0,0 +1,22 @@
+-- Estado del planificador adaptativo de ingesta (ver src/pipelines/planner.py)
+
+-- Peticiones a NewsAPI consumidas por día (UTC), de cualquier origen
+-- (scheduler, POST /ingest, DAG, backfill, /preview)
+CREATE TABLE IF NOT EXISTS newsapi_quota_usage (
+  day       DATE     PRIMARY KEY,
+  requests  INTEGER  NOT NULL DEFAULT 0
+);
+
+-- Rendimiento de cada query: artículos nuevos por llamada y cuándo volver a consultarla
+CREATE TABLE IF NOT EXISTS ingestion_query_state (
+  query_hash     TEXT              PRIMARY KEY,          -- md5 del texto de la query
+  query          TEXT              NOT NULL,
+  calls          BIGINT            NOT NULL DEFAULT 0,    -- peticiones realizadas
+  new_articles   BIGINT            NOT NULL DEFAULT 0,    -- artículos nuevos acumulados
+  yield_ema      DOUBLE PRECISION  NOT NULL,              -- media móvil de artículos nuevos por petición
+  interval_secs  INTEGER           NOT NULL,              -- intervalo actual entre consultas
+  last_run_at    TIMESTAMPTZ,
+  next_run_at    TIMESTAMPTZ       NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_query_state_next_run ON ingestion_query_state (next_run_at);
@@ -0,0 +1,13 @@
+-- Registro de ejecuciones de ingesta coordinadas con advisory locks de PostgreSQL
+-- (ver src/repositories/run_coordinator.py). Permite que una petición que llega
+-- mientras otra ejecución del mismo ámbito está en curso reciba su resultado.
+CREATE TABLE IF NOT EXISTS ingestion_runs (
+  id           BIGSERIAL    PRIMARY KEY,
+  scope        TEXT         NOT NULL,
+  started_at   TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+  finished_at  TIMESTAMPTZ,
+  status       TEXT         NOT NULL DEFAULT 'running' CHECK (status IN ('running','success','error')),
+  result       JSONB
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_runs_scope_finished ON ingestion_runs (scope, finished_at DESC);
@@ -1,16 +1,84 @@
 -- Creación de la tabla donde se almacenará la información extraída de NewsAPI
+-- Solo contiene las columnas ligeras que se listan en GET /news; el cuerpo del
+-- artículo se guarda aparte en `news_content` para no inflar los escaneos.
 CREATE TABLE IF NOT EXISTS news (
   id            BIGSERIAL PRIMARY KEY,
-  url           TEXT UNIQUE NOT NULL,         
+  url           TEXT NOT NULL,                -- URL original del artículo
+  url_hash      BIGINT NOT NULL,              -- 8 primeros bytes del MD5 de la URL canónica
   source_id     TEXT,
   source_name   TEXT,
   author        TEXT,
   title         TEXT,
   description   TEXT,
-  content       TEXT,
   url_to_image  TEXT,
-  published_at  TIMESTAMPTZ,                     
+  published_at  TIMESTAMPTZ
 );
 
-CREATE INDEX IF NOT EXISTS idx_news_raw_published_at ON news (published_at DESC);
-CREATE INDEX IF NOT EXISTS idx_news_raw_source_name   ON news (source_name);
\ No newline at end of file
+-- Migración desde el esquema anterior (unicidad sobre `url TEXT`): la clave de
+-- conflicto pasa a ser el hash de 64 bits, mucho más compacto que la URL completa.
+-- Aquí las filas existentes reciben el hash de la URL tal y como se guardó, solo para
+-- poder crear la restricción. Después hay que recalcularlo sobre la URL canónica
+-- (y fusionar las filas que resulten ser la misma noticia):
+--   python -m src.repositories.news --rehash-urls
+ALTER TABLE news ADD COLUMN IF NOT EXISTS url_hash BIGINT;
+UPDATE news SET url_hash = ('x' || substr(md5(url), 1, 16))::bit(64)::bigint WHERE url_hash IS NULL;
+ALTER TABLE news ALTER COLUMN url_hash SET NOT NULL;
+ALTER TABLE news DROP CONSTRAINT IF EXISTS news_url_key;
+ALTER TABLE news DROP CONSTRAINT IF EXISTS uq_news_url;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_news_url_hash ON news (url_hash);
+
+-- Orden de GET /news (`published_at DESC NULLS LAST`) y filtros por rango de fechas.
+-- INCLUDE solo con columnas pequeñas y acotadas (`url_hash`, 8 bytes, y `source_name`,
+-- el nombre corto del medio): `GET /news?fields=source_name,published_at` y el
+-- recálculo de agregados por fuente se resuelven con un Index Only Scan. Los TEXT sin
+-- límite (`title`, `description`...) se quedan fuera: pueden superar el tamaño
+-- máximo de una entrada btree y duplicarían la tabla en cada escritura.
+CREATE INDEX IF NOT EXISTS idx_news_published_covering
+  ON news (published_at DESC NULLS LAST) INCLUDE (url_hash, source_name);
+
+-- Sustituidos por idx_news_published_covering
+DROP INDEX IF EXISTS idx_news_published_at;
+DROP INDEX IF EXISTS idx_news_list_covering;
+DROP INDEX IF EXISTS idx_news_raw_published_at;
+
+-- Filtros de GET /news: cada índice sirve también el orden `published_at DESC NULLS LAST`,
+-- así que la consulta lee solo las primeras filas que cumplen el filtro, sin ordenar
+CREATE INDEX IF NOT EXISTS idx_news_source_published ON news (source_name, published_at DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_news_author_published ON news (lower(author), published_at DESC NULLS LAST);
+
+-- Sustituido por idx_news_source_published (mismo prefijo)
+DROP INDEX IF EXISTS idx_news_raw_source_name;
+
+-- Cuerpo de los artículos (hasta 20.000 caracteres), separado de la fila de `news`
+CREATE TABLE IF NOT EXISTS news_content (
+  news_id  BIGINT PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,
+  content  TEXT
+);
+
+-- Compresión LZ4 del cuerpo (PostgreSQL 14+)
+ALTER TABLE news_content ALTER COLUMN content SET COMPRESSION lz4;
+
+-- Cuerpo completo descargado de la página original (src/pipelines/enrichment.py).
+-- `full_content_fetched_at` marca el intento aunque no se obtenga texto.
+ALTER TABLE news_content ADD COLUMN IF NOT EXISTS full_content TEXT COMPRESSION lz4;
+ALTER TABLE news_content ADD COLUMN IF NOT EXISTS full_content_fetched_at TIMESTAMPTZ;
+CREATE INDEX IF NOT EXISTS idx_news_content_pending_fetch ON news_content (news_id) WHERE full_content_fetched_at IS NULL;
+
+-- Migración desde el esquema anterior (columna `content` en `news`)
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'news' AND column_name = 'content'
+  ) THEN
+    INSERT INTO news_content (news_id, content)
+    SELECT id, content FROM news WHERE content IS NOT NULL
+    ON CONFLICT (news_id) DO NOTHING;
+
+    ALTER TABLE news DROP COLUMN content;
+  END IF;
+END $$;
+
+-- Estadísticas del planificador al día tras crear índices y migrar datos
+ANALYZE news;
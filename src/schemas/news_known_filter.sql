@@ -0,0 +1,14 @@
+-- Filtro de Bloom con las huellas de los artículos ya guardados en `news`.
+-- Se consulta justo después de descargar cada página para saltarse la limpieza y el
+-- upsert de artículos que no han cambiado. Se actualiza una vez al final de cada ingesta
+-- y se reconstruye con más capacidad si la supera.
+-- Para reconstruirlo desde `news` (p. ej. tras cambiar capacidad o fp_rate):
+--   python -m src.repositories.known_filter --rebuild
+CREATE TABLE IF NOT EXISTS news_known_filter (
+  name        TEXT              PRIMARY KEY,
+  capacity    BIGINT            NOT NULL,
+  fp_rate     DOUBLE PRECISION  NOT NULL,
+  items       BIGINT            NOT NULL DEFAULT 0,
+  bits        BYTEA             NOT NULL,
+  updated_at  TIMESTAMPTZ       NOT NULL DEFAULT NOW()
+);
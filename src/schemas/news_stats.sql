@@ -0,0 +1,22 @@
+-- Tablas de agregados mantenidas de forma incremental en cada upsert de noticias.
+-- Permiten responder a GET /stats/* sin escanear la tabla `news`.
+-- Para recalcularlas desde cero: python -m src.repositories.stats --rebuild
+
+-- Artículos por día (UTC) y fuente
+CREATE TABLE IF NOT EXISTS news_stats_daily_source (
+  day          DATE    NOT NULL,
+  source_name  TEXT    NOT NULL,
+  articles     BIGINT  NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, source_name)
+);
+
+-- Artículos por día (UTC) y categoría de keyword
+CREATE TABLE IF NOT EXISTS news_stats_daily_category (
+  day       DATE    NOT NULL,
+  category  TEXT    NOT NULL,
+  articles  BIGINT  NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_stats_source_day   ON news_stats_daily_source (source_name, day DESC);
+CREATE INDEX IF NOT EXISTS idx_news_stats_category_day ON news_stats_daily_category (category, day DESC);
@@ -0,0 +1,16 @@
+-- Keywords de `news_keywords` encontradas en cada artículo (título, descripción y contenido).
+-- Se escriben en la misma transacción que el upsert de `news` y sirven los filtros
+-- `category=` y `keyword=` de GET /news sin volver a escanear el texto.
+-- Para recalcularlas desde cero: python -m src.repositories.tags --rebuild
+CREATE TABLE IF NOT EXISTS news_keyword_tags (
+  news_id     BIGINT  NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+  keyword_id  BIGINT  NOT NULL REFERENCES news_keywords(id) ON DELETE CASCADE,
+  category    TEXT    NOT NULL,
+  PRIMARY KEY (news_id, keyword_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_keyword_tags_keyword  ON news_keyword_tags (keyword_id, news_id);
+CREATE INDEX IF NOT EXISTS idx_news_keyword_tags_category ON news_keyword_tags (category, news_id);
+
+-- Búsqueda de keywords por término sin distinguir mayúsculas (filtro `keyword=`)
+CREATE INDEX IF NOT EXISTS idx_news_keywords_lower_term ON news_keywords (lower(term));
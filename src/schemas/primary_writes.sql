@@ -0,0 +1,10 @@
+-- Instante del último commit de ingesta en la primaria (ver src/repositories/db.py).
+-- Lo escriben todos los procesos (workers de gunicorn, scheduler, DAG, backfill); las
+-- lecturas lo consultan para saber si la réplica puede no haber recibido aún esos datos.
+CREATE TABLE IF NOT EXISTS primary_writes (
+  id          SMALLINT     PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  written_at  TIMESTAMPTZ  NOT NULL
+);
+
+-- Única fila: las ingestas la actualizan con un UPDATE ciego tras su commit
+INSERT INTO primary_writes (id, written_at) VALUES (1, 'epoch') ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,225 @@
+"""
+Descarga del cuerpo completo de los artículos.
+
+NewsAPI solo devuelve los primeros ~200 caracteres de `content` (seguidos de
+`[+N chars]`). Este módulo descarga la página original de cada URL y extrae su texto:
+
+- Concurrencia acotada con asyncio (`concurrency` descargas a la vez como máximo).
+- Límite de conexiones simultáneas por host (`per_host`).
+- Cortesía: separación mínima entre peticiones al mismo host (`host_delay_secs`).
+
+Las descargas usan `requests` en un pool de hilos propio controlado desde asyncio.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+# Configuración del logger para la descarga de artículos
+logger = logging.getLogger("services.article_fetcher")
+
+USER_AGENT = "interview-de-news-enricher/1.0"
+
+# Páginas más grandes que esto no se procesan (2 MB)
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Por debajo de esta longitud el texto extraído no se considera el cuerpo del artículo
+MIN_TEXT_CHARS = 200
+
+# <meta charset="..."> o <meta http-equiv="Content-Type" content="...; charset=..."> al inicio del HTML
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+# Etiquetas cuyo texto nunca forma parte del cuerpo
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "template"}
+
+
+class _ParagraphExtractor(HTMLParser):
+    """
+    Recoge el texto de los párrafos (<p>), separando los que están dentro de <article>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.in_p = False
+        self.current = []
+        self.article_paragraphs = []
+        self.paragraphs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag == "p":
+            self._flush()
+            self.in_p = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "article":
+            self._flush()
+            self.article_depth = max(0, self.article_depth - 1)
+        elif tag == "p":
+            self._flush()
+
+    def handle_data(self, data):
+        if self.in_p and not self.skip_depth:
+            self.current.append(data)
+
+    def _flush(self):
+        if self.in_p:
+            text = re.sub(r"\s+", " ", "".join(self.current)).strip()
+            if text:
+                (self.article_paragraphs if self.article_depth else self.paragraphs).append(text)
+        self.in_p = False
+        self.current = []
+
+
+def extract_text(html: str) -> str:
+    """
+    Extrae el texto principal de una página HTML: los párrafos dentro de <article>
+    si los hay y, si no, todos los párrafos fuera de navegación, cabeceras y pies.
+
+    Parámetros:
+        html (str): Contenido HTML de la página.
+
+    Returns:
+        str: Párrafos separados por líneas en blanco ('' si no hay texto).
+    """
+    parser = _ParagraphExtractor()
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+    return "\n\n".join(parser.article_paragraphs or parser.paragraphs)
+
+
+def _decode(body: bytes, resp: requests.Response) -> str:
+    """
+    Decodifica el HTML descargado. Solo se confía en `resp.encoding` si la cabecera
+    declara el charset: sin él, requests asume ISO-8859-1 para `text/html` y estropea
+    las páginas UTF-8. En ese caso se usa el <meta charset> de la página, después UTF-8
+    y, si no es válido, la codificación detectada (como `resp.apparent_encoding`).
+    """
+    candidates = []
+    if "charset" in resp.headers.get("Content-Type", "").lower():
+        candidates.append(resp.encoding)
+    meta = META_CHARSET.search(body[:4096])
+    if meta:
+        candidates.append(meta.group(1).decode("ascii", errors="ignore"))
+    candidates.append("utf-8")
+    for encoding in candidates:
+        try:
+            return body.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    detected = chardet.detect(body)["encoding"] if chardet is not None else None
+    try:
+        return body.decode(detected or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _download(session: requests.Session, url: str, timeout: float) -> Optional[str]:
+    """
+    Descarga una página y devuelve su texto extraído (None si no es HTML válido o es demasiado corto).
+    """
+    with session.get(url, timeout=timeout, stream=True) as resp:
+        resp.raise_for_status()
+        if "html" not in resp.headers.get("Content-Type", "text/html"):
+            return None
+        body = b""
+        for chunk in resp.iter_content(64 * 1024):
+            body += chunk
+            if len(body) > MAX_PAGE_BYTES:
+                return None
+        text = extract_text(_decode(body, resp))
+    return text if len(text) >= MIN_TEXT_CHARS else None
+
+
+async def _fetch_all(urls, session, executor, concurrency, per_host, host_delay_secs, timeout):
+    """
+    Descarga todas las URLs respetando el límite global, el límite por host y la
+    separación mínima entre peticiones a un mismo host.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    host_slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+    host_next_start = {}
+    results = {}
+
+    async def fetch_one(url):
+        host = urlsplit(url).netloc.lower()
+        async with host_slots[host], slots:
+            # El turno del host se reserva ya con plaza global, para que la separación
+            # entre peticiones sea real y no solo la planificada
+            now = loop.time()
+            start = max(now, host_next_start.get(host, now))
+            host_next_start[host] = start + host_delay_secs
+            if start > now:
+                await asyncio.sleep(start - now)
+
+            try:
+                results[url] = await loop.run_in_executor(executor, _download, session, url, timeout)
+            except Exception as e:
+                logger.warning("No se pudo descargar %s: %s", url, e)
+                results[url] = None
+
+    await asyncio.gather(*(fetch_one(u) for u in urls))
+    return results
+
+
+def fetch_full_texts(urls: Iterable[str], concurrency: int = 8, per_host: int = 2,
+                     host_delay_secs: float = 1.0, timeout: float = 15.0) -> Tuple[Dict[str, Optional[str]], dict]:
+    """
+    Descarga el cuerpo completo de un conjunto de artículos.
+
+    Parámetros:
+        urls (Iterable[str]): URLs de los artículos.
+        concurrency (int, opcional): Descargas simultáneas como máximo.
+        per_host (int, opcional): Descargas simultáneas como máximo por host.
+        host_delay_secs (float, opcional): Separación mínima entre peticiones a un mismo host.
+        timeout (float, opcional): Timeout de cada petición en segundos.
+
+    Returns:
+        tuple:
+            texts (dict): {url: texto extraído o None si falló}
+            stats (dict): pages, ok, failed, elapsed_secs y pages_per_sec.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}, {"pages": 0, "ok": 0, "failed": 0, "elapsed_secs": 0.0, "pages_per_sec": 0.0}
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=max(per_host, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    started = time.perf_counter()
+    with session, ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch") as executor:
+        texts = asyncio.run(_fetch_all(urls, session, executor, concurrency, per_host, host_delay_secs, timeout))
+    elapsed = time.perf_counter() - started
+
+    ok = sum(1 for t in texts.values() if t)
+    stats = {
+        "pages": len(urls),
+        "ok": ok,
+        "failed": len(urls) - ok,
+        "elapsed_secs": round(elapsed, 3),
+        "pages_per_sec": round(len(urls) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    logger.info("Artículos descargados: %s", stats)
+    return texts, stats
@@ -1,9 +1,75 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import pandas as pd
+import hashlib
 import re
 
 # Columnas que son obligatorias para que un registro se considere válido
 REQUIRED = ("title", "description", "publishedAt", "url")
 
+# Parámetros de tracking conocidos que no identifican el artículo y se ignoran al
+# calcular la URL canónica. Solo claves inequívocas: otras más genéricas (`ref`, `cid`,
+# `share`, ...) pueden formar parte de la URL del contenido en algunos medios
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "igshid", "yclid", "twclid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normaliza una URL para que la misma noticia publicada con distintos parámetros
+    de tracking tenga una única representación. Solo se usa para calcular `url_hash`:
+    en BD se guarda la URL original.
+
+    - Esquema y host en minúsculas, `http` -> `https` y sin puerto por defecto.
+    - Sin fragmento (#...) ni parámetros de tracking (utm_*, fbclid, gclid, ...).
+    - Parámetros restantes ordenados y sin barra final en la ruta.
+
+    Parámetros:
+        url (str): URL original.
+
+    Returns:
+        str: URL canónica (o la original sin espacios si no es una URL absoluta).
+    """
+    url = url.strip() if isinstance(url, str) else ""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/")
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def url_hash(url: str) -> int:
+    """
+    Clave compacta de 64 bits (con signo, para BIGINT) de una URL canónica:
+    los 8 primeros bytes de su MD5. Equivale en SQL a
+    `('x' || substr(md5(url), 1, 16))::bit(64)::bigint`.
+
+    Parámetros:
+        url (str): URL ya canonicalizada.
+
+    Returns:
+        int: Hash de 64 bits con signo.
+    """
+    return int.from_bytes(hashlib.md5(url.encode("utf-8")).digest()[:8], "big", signed=True)
+
 def clean_raw_data(df_raw: pd.DataFrame) -> pd.DataFrame:
     """
     Limpia y normaliza los datos crudos recibidos de la API.
@@ -17,7 +83,7 @@ def clean_raw_data(df_raw: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame limpio y normalizado, con columnas ordenadas.
     """
     cols_out = [
-        "url", "title", "description", "content", "author",
+        "url", "url_hash", "title", "description", "content", "author",
         "published_at", "url_to_image", "source_id", "source_name"
     ]
 
@@ -41,12 +107,15 @@ def clean_raw_data(df_raw: pd.DataFrame) -> pd.DataFrame:
         df["author"] = "Anonimo"
     df.loc[df["author"] == "", "author"] = "Anonimo"
 
-    # Eliminar filas sin URL y eliminar url duplicadas
+    # Eliminar filas sin URL y duplicados por hash de la URL canónica (se conserva la original)
     df = df[df["url"] != ""].copy()
-    df = df.drop_duplicates(subset=["url"])
+    df["url_hash"] = df["url"].map(lambda u: url_hash(canonicalize_url(u)))
+    df = df.drop_duplicates(subset=["url_hash"])
 
-    # Convertir fechas a UTC
-    df["publishedAt"] = pd.to_datetime(df["publishedAt"], errors="coerce", utc=True)
+    # Convertir fechas a UTC. `format="ISO8601"` interpreta cada valor por separado; sin él
+    # pandas deduce un único formato del primer valor y descarta (NaT) los que no encajan,
+    # p. ej. con milisegundos o con espacio en lugar de `T` (igual que `records._parse_utc`)
+    df["publishedAt"] = pd.to_datetime(df["publishedAt"], errors="coerce", utc=True, format="ISO8601")
 
     # Filtrar registros sin campos obligatorios
     mask_ok = (
@@ -106,3 +175,36 @@ def filter_by_min_length(df: pd.DataFrame, min_total_chars: int = 1000) -> pd.Da
     df["content_len"] = df["content"].fillna("").str.len() + df["extra_chars"]
     
     return df[df["content_len"] >= min_total_chars].reset_index(drop=True)
+
+def article_fingerprint(url, title, description, content) -> bytes:
+    """
+    Huella (16 bytes) de la versión de un artículo. Aplica las mismas normalizaciones
+    que `clean_raw_data` (strip, URL canónica y recorte del contenido), por lo que la huella de un
+    artículo crudo de la API coincide con la de su fila ya guardada.
+
+    Parámetros:
+        url, title, description, content: Campos del artículo (crudos o limpios).
+
+    Returns:
+        bytes: Huella del artículo.
+    """
+    parts = [v.strip() if isinstance(v, str) else "" for v in (url, title, description, content)]
+    parts[0] = canonicalize_url(parts[0])
+    parts[3] = parts[3][:20000]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+def fingerprints(df: pd.DataFrame) -> pd.Series:
+    """
+    Calcula la huella de cada fila de un DataFrame (crudo o limpio).
+
+    Parámetros:
+        df (pd.DataFrame): DataFrame con columnas 'url', 'title', 'description' y 'content'.
+
+    Returns:
+        pd.Series: Huellas alineadas con el índice de `df`.
+    """
+    cols = [df[c] if c in df.columns else pd.Series(None, index=df.index) for c in ("url", "title", "description", "content")]
+    return pd.Series(
+        [article_fingerprint(*vals) for vals in zip(*cols)],
+        index=df.index, dtype=object,
+    )
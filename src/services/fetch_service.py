@@ -1,30 +1,64 @@
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 import requests
 import pandas as pd
 
 
-def fetch_ai_marketing_news(api_url: str, params: dict) -> Tuple[Optional[pd.DataFrame], dict]:
+class NewsAPIError(RuntimeError):
     """
-    Llama a la API de NewsAPI para obtener noticias de AI y Marketing.
-    
+    Error devuelto por NewsAPI. `meta` es el diccionario de metadatos de `fetch_articles`
+    (status, code, http_status y error_message).
+    """
+
+    def __init__(self, meta: dict):
+        super().__init__(f"NewsAPI error: {meta}")
+        self.meta = meta or {}
+
+    @property
+    def rate_limited(self) -> bool:
+        """
+        True si NewsAPI ha rechazado la petición por límite de uso (HTTP 429 / `rateLimited`).
+        """
+        return self.meta.get("code") == "rateLimited" or self.meta.get("http_status") == 429
+
+
+def fetch_articles(api_url: str, params: dict) -> Tuple[Optional[List[dict]], dict]:
+    """
+    Llama a la API de NewsAPI y devuelve los artículos tal y como llegan en el JSON,
+    sin normalizarlos a DataFrame.
+
     Parámetros:
         api_url (str): URL base del endpoint (ej: https://newsapi.org/v2/everything).
         params (dict): Diccionario de parámetros que incluye apiKey y q.
-    
+
     Returns:
-        Tuple[Optional[pd.DataFrame], dict]:
-            - DataFrame con artículos o None si hay error.
-            - Diccionario con metadatos de la respuesta (status, totalResults, error_message si aplica).
+        Tuple[Optional[List[dict]], dict]:
+            - Lista de artículos o None si hay error.
+            - Diccionario con metadatos de la respuesta (status, totalResults y, si hay
+              error, code, http_status y error_message).
     """
     try:
         response = requests.get(api_url, params=params, timeout=30)
-        response.raise_for_status()
     except requests.exceptions.RequestException as e:
         return None, {
             "status": "error",
             "error_message": f"Error de conexión: {str(e)}"
         }
 
+    # NewsAPI explica los errores HTTP (p. ej. 429 `rateLimited`, 401 `apiKeyInvalid`)
+    # en el cuerpo JSON: se conserva su `code` para que el llamador pueda distinguirlos
+    if response.status_code >= 400:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        body = body if isinstance(body, dict) else {}
+        return None, {
+            "status": "error",
+            "code": body.get("code"),
+            "http_status": response.status_code,
+            "error_message": body.get("message") or f"Error de conexión: HTTP {response.status_code}"
+        }
+
     try:
         data = response.json()
     except ValueError:
@@ -37,26 +71,52 @@ def fetch_ai_marketing_news(api_url: str, params: dict) -> Tuple[Optional[pd.Dat
     if status != "ok":
         return None, {
             "status": status,
+            "code": data.get("code"),
             "error_message": data.get("message", "Error desconocido en la API.")
         }
 
-    total_results = data.get("totalResults", 0)
-    articles = data.get("articles", [])
+    return data.get("articles", []) or [], {
+        "status": status,
+        "totalResults": data.get("totalResults", 0)
+    }
+
 
+def articles_to_frame(articles: List[dict]) -> pd.DataFrame:
+    """
+    Normaliza la lista de artículos de NewsAPI a DataFrame.
+
+    Parámetros:
+        articles (List[dict]): Artículos devueltos por `fetch_articles`.
+
+    Returns:
+        pd.DataFrame: Artículos con `source` aplanado a `source_id`/`source_name`.
+    """
     if not articles:
-        return pd.DataFrame(), {
-            "status": status,
-            "totalResults": total_results
-        }
+        return pd.DataFrame()
 
-    # Normalización a DataFrame
     news_df = pd.json_normalize(articles)
-    news_df = news_df.rename(columns={
+    return news_df.rename(columns={
         "source.id": "source_id",
         "source.name": "source_name"
     })
 
-    return news_df, {
-        "status": status,
-        "totalResults": total_results
-    }
+
+def fetch_ai_marketing_news(api_url: str, params: dict) -> Tuple[Optional[pd.DataFrame], dict]:
+    """
+    Llama a la API de NewsAPI para obtener noticias de AI y Marketing.
+    
+    Parámetros:
+        api_url (str): URL base del endpoint (ej: https://newsapi.org/v2/everything).
+        params (dict): Diccionario de parámetros que incluye apiKey y q.
+    
+    Returns:
+        Tuple[Optional[pd.DataFrame], dict]:
+            - DataFrame con artículos o None si hay error.
+            - Diccionario con metadatos de la respuesta (status, totalResults, error_message si aplica).
+    """
+    articles, meta = fetch_articles(api_url=api_url, params=params)
+    if articles is None:
+        return None, meta
+
+    # Normalización a DataFrame
+    return articles_to_frame(articles), meta
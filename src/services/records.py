@@ -0,0 +1,184 @@
+"""
+Ruta ligera (sin pandas) para limpiar lotes pequeños de artículos.
+
+Para el caso habitual (1 página × 100 artículos) la mayor parte del tiempo de CPU se
+iba en `json_normalize`, copias de DataFrames y conversiones a diccionarios. Aquí los
+artículos se limpian directamente desde el JSON de NewsAPI a registros con `__slots__`,
+con la misma semántica que `clean_raw_data` y `filter_by_min_length`.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from src.services.clean_service import (
+    canonicalize_url, url_hash, extract_extra_chars, article_fingerprint
+)
+
+# Campos de salida, en el mismo orden que las columnas de `clean_raw_data`
+# seguidas de las que añade `filter_by_min_length`
+FIELDS = (
+    "url", "url_hash", "title", "description", "content", "author",
+    "published_at", "url_to_image", "source_id", "source_name",
+    "extra_chars", "content_len",
+)
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """
+    Artículo limpio, equivalente a una fila del DataFrame de `clean_raw_data`.
+    """
+    url: str
+    url_hash: int
+    title: str
+    description: str
+    content: Optional[str]
+    author: str
+    published_at: datetime
+    url_to_image: Optional[str]
+    source_id: Optional[str]
+    source_name: Optional[str]
+    extra_chars: int = 0
+    content_len: int = 0
+
+    def as_dict(self) -> dict:
+        """
+        Devuelve el registro como diccionario (mismas claves que las filas del DataFrame).
+        """
+        return {f: getattr(self, f) for f in FIELDS}
+
+
+def _flatten(article: dict) -> dict:
+    """
+    Aplana `source` a `source_id`/`source_name`, como hace `json_normalize` + rename.
+    """
+    flat = dict(article)
+    source = flat.pop("source", None)
+    if isinstance(source, dict):
+        flat["source_id"] = source.get("id")
+        flat["source_name"] = source.get("name")
+    return flat
+
+
+def _text(value) -> str:
+    """
+    Equivalente a `fillna("").astype(str).str.strip()` para un valor suelto.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return (value if isinstance(value, str) else str(value)).strip()
+
+
+def _parse_utc(value) -> Optional[datetime]:
+    """
+    Convierte una fecha ISO 8601 a datetime en UTC (None si no es válida),
+    como `pd.to_datetime(errors="coerce", utc=True, format="ISO8601")` en `clean_raw_data`.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def clean_raw_records(articles: Iterable[dict]) -> List[ArticleRecord]:
+    """
+    Limpia y normaliza artículos crudos de NewsAPI sin pasar por pandas.
+    Misma semántica que `clean_raw_data`.
+
+    Parámetros:
+        articles: Lista de artículos tal y como llegan en `articles` de la respuesta JSON.
+
+    Returns:
+        List[ArticleRecord]: Registros limpios, en el orden de entrada.
+    """
+    flat = [_flatten(a) for a in articles or []]
+    if not flat:
+        return []
+
+    # Las columnas que no aparecen en ningún artículo quedan a None (pd.NA en pandas)
+    present = set().union(*flat)
+
+    def optional(a: dict, key: str) -> Optional[str]:
+        return _text(a.get(key)) if key in present else None
+
+    records, seen = [], set()
+    for a in flat:
+        url = _text(a.get("url"))
+        if not url:
+            continue
+        key = url_hash(canonicalize_url(url))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        title = _text(a.get("title"))
+        description = _text(a.get("description"))
+        published_at = _parse_utc(a.get("publishedAt"))
+        if not title or not description or published_at is None:
+            continue
+
+        content = optional(a, "content")
+        records.append(ArticleRecord(
+            url=url,
+            url_hash=key,
+            title=title,
+            description=description,
+            content=content[:20000] if content is not None else None,
+            author=_text(a.get("author")) or "Anonimo",
+            published_at=published_at,
+            url_to_image=optional(a, "urlToImage"),
+            source_id=optional(a, "source_id"),
+            source_name=optional(a, "source_name"),
+        ))
+    return records
+
+
+def filter_records_by_min_length(records: List[ArticleRecord], min_total_chars: int = 1000) -> List[ArticleRecord]:
+    """
+    Filtra registros cuyo contenido total (texto + caracteres extra) sea inferior al
+    mínimo requerido. Misma semántica que `filter_by_min_length`.
+
+    Parámetros:
+        records (List[ArticleRecord]): Registros limpios.
+        min_total_chars (int): Mínimo de caracteres totales requeridos.
+
+    Returns:
+        List[ArticleRecord]: Registros filtrados.
+    """
+    out = []
+    for r in records:
+        r.extra_chars = extract_extra_chars(r.content)
+        r.content_len = len(r.content or "") + r.extra_chars
+        if r.content_len >= min_total_chars:
+            out.append(r)
+    return out
+
+
+def raw_fingerprints(articles: Iterable[dict]) -> List[bytes]:
+    """
+    Huella de cada artículo crudo (ver `article_fingerprint`).
+    """
+    return [article_fingerprint(a.get("url"), a.get("title"), a.get("description"), a.get("content"))
+            for a in articles]
+
+
+def record_fingerprints(records: Iterable[ArticleRecord]) -> List[bytes]:
+    """
+    Huella de cada registro limpio (coincide con la de su artículo crudo).
+    """
+    return [article_fingerprint(r.url, r.title, r.description, r.content) for r in records]
+
+
+def records_to_frame(records: List[ArticleRecord]) -> pd.DataFrame:
+    """
+    Convierte registros a DataFrame con las mismas columnas que la ruta pandas.
+    """
+    return pd.DataFrame([r.as_dict() for r in records], columns=list(FIELDS))
@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Hashable, Iterable, Iterator, Tuple
+
+
+class AhoCorasick:
+    """
+    Autómata de Aho-Corasick para buscar muchos términos a la vez.
+
+    El texto se recorre una sola vez, sea cual sea el número de términos. La búsqueda
+    no distingue mayúsculas y solo acepta coincidencias de palabra completa (como un
+    patrón `(?<!\\w)término(?!\\w)`).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        """
+        Parámetros:
+            patterns (Iterable[Tuple[str, Hashable]]): Pares (término, valor). El valor
+                (p. ej. el id de la keyword) es lo que devuelve cada coincidencia.
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for term, value in patterns:
+            term = (term or "").strip().lower()
+            if not term:
+                continue
+            node = 0
+            for ch in term:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(term), value))
+
+        # Enlaces de fallo en anchura: cada nodo hereda las salidas de su sufijo más largo
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        """
+        Número de estados del autómata.
+        """
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Hashable]]:
+        """
+        Recorre el texto y devuelve las coincidencias de palabra completa.
+
+        Parámetros:
+            text (str): Texto en el que buscar.
+
+        Returns:
+            Iterator[Tuple[int, int, Hashable]]: (inicio, fin, valor) de cada coincidencia,
+                con posiciones sobre `text.lower()`.
+        """
+        text = (text or "").lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            after_ok = end == len(text) or not _is_word(text[end])
+            if not after_ok:
+                continue
+            for length, value in out[node]:
+                start = end - length
+                if start == 0 or not _is_word(text[start - 1]):
+                    yield start, end, value
+
+    def values_in(self, text: str) -> set:
+        """
+        Valores de todos los términos que aparecen en el texto.
+        """
+        return {value for _, _, value in self.iter_matches(text)}
+
+
+def _is_word(ch: str) -> bool:
+    """
+    Equivalente a `\\w` en expresiones regulares.
+    """
+    return ch.isalnum() or ch == "_"
@@ -0,0 +1,100 @@
+from typing import Iterable
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre claves binarias (p. ej. huellas de 16 bytes).
+
+    Responde "seguro que no está" o "probablemente está", con una tasa de falsos
+    positivos que depende de la capacidad y del número de elementos añadidos.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float, bits: bytes = None, items: int = 0):
+        """
+        Parámetros:
+            capacity (int): Número de elementos esperados.
+            fp_rate (float): Tasa de falsos positivos objetivo a plena capacidad (0 < fp_rate < 1).
+            bits (bytes, opcional): Bits serializados de un filtro existente.
+            items (int, opcional): Elementos ya añadidos en `bits`.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity debe ser mayor que 0")
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate debe estar entre 0 y 1")
+
+        self.capacity = int(capacity)
+        self.fp_rate = float(fp_rate)
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(self.fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.items = int(items)
+
+        size = (self.num_bits + 7) // 8
+        if bits is not None and len(bits) != size:
+            raise ValueError("Los bits no corresponden a la capacidad/fp_rate indicados")
+        self.bits = bytearray(bits) if bits is not None else bytearray(size)
+
+    def _positions(self, key: bytes):
+        """
+        Posiciones de bit de una clave mediante doble hashing (h1 + i·h2).
+        """
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: bytes) -> None:
+        """
+        Añade una clave al filtro.
+        """
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.items += 1
+
+    def update(self, keys: Iterable[bytes]) -> None:
+        """
+        Añade varias claves al filtro.
+        """
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def merge(self, other: "BloomFilter") -> None:
+        """
+        Une (OR) otro filtro con los mismos parámetros en este.
+        """
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Solo se pueden unir filtros con los mismos parámetros")
+        merged = int.from_bytes(self.bits, "big") | int.from_bytes(other.bits, "big")
+        self.bits = bytearray(merged.to_bytes(len(self.bits), "big"))
+        self.items = self.estimated_items()
+
+    def fill_ratio(self) -> float:
+        """
+        Proporción de bits a 1.
+        """
+        return int.from_bytes(self.bits, "big").bit_count() / self.num_bits
+
+    def estimated_items(self) -> int:
+        """
+        Número de elementos estimado a partir de los bits a 1 (válido tras uniones).
+
+        Returns:
+            int: -(m/k)·ln(1 - X/m)
+        """
+        fill = self.fill_ratio()
+        if fill >= 1:
+            return self.capacity * 10
+        return round(-self.num_bits / self.num_hashes * math.log(1 - fill))
+
+    def estimated_fp_rate(self) -> float:
+        """
+        Tasa de falsos positivos estimada con el estado actual del filtro.
+
+        Returns:
+            float: (X/m)^k, con X el número de bits a 1.
+        """
+        return self.fill_ratio() ** self.num_hashes
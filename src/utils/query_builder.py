@@ -159,3 +159,23 @@ def build_q_from_db(engine: engine, max_chars: int = 500, categories: List[str]
         raise ValueError("No se pudo construir ninguna query dentro del límite de caracteres.")
 
     return queries
+
+def keyword_fingerprint(engine: engine) -> str:
+    """
+    Huella de las keywords activas que usa `build_q_from_db`: cambia en cuanto se
+    añade, desactiva o modifica un término, sin necesidad de construir las queries.
+
+    Parámetros:
+        engine (engine): conexión SQLAlchemy a la base de datos.
+
+    Returns:
+        str: md5 hexadecimal de los términos activos (en inglés) ordenados.
+    """
+    sql = """
+    SELECT md5(COALESCE(string_agg(category || ':' || negate::text || ':' || term, '|'
+                                   ORDER BY category, negate, term), ''))
+    FROM news_keywords
+    WHERE active = TRUE AND lang = 'en'
+    """
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).scalar()
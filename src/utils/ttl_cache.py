@@ -0,0 +1,110 @@
+from typing import Any, Callable, Hashable, Tuple
+import threading
+import time
+
+
+class _Call:
+    """
+    Cálculo en curso de una clave: los hilos que piden la misma clave esperan a su resultado.
+    """
+    __slots__ = ("done", "value", "error", "stored_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.stored_at = None
+
+
+class SingleFlightCache:
+    """
+    Caché en memoria con TTL y "single-flight": si varias peticiones piden a la vez
+    una clave que no está en caché, solo la primera ejecuta el cálculo y el resto
+    reciben su resultado. Los errores no se cachean. Quien espera a otro cálculo lo
+    hace como mucho `wait_timeout_secs`; después recibe `TimeoutError`.
+
+    La caché es local al proceso (cada worker de gunicorn tiene la suya).
+    """
+
+    def __init__(self, ttl_secs: float, max_entries: int = 64, wait_timeout_secs: float = 30.0):
+        """
+        Parámetros:
+            ttl_secs (float): Segundos que un resultado se considera válido.
+            max_entries (int, opcional): Máximo de claves guardadas; se descartan las más antiguas.
+            wait_timeout_secs (float, opcional): Espera máxima al cálculo de otra petición.
+        """
+        self.ttl_secs = float(ttl_secs)
+        self.max_entries = int(max_entries)
+        self.wait_timeout_secs = float(wait_timeout_secs)
+        self._lock = threading.Lock()
+        self._entries = {}   # clave -> (stored_at, valor)
+        self._inflight = {}  # clave -> _Call
+
+    def get_or_compute(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool, float]:
+        """
+        Devuelve el valor de `key`, calculándolo con `fn` solo si no está en caché
+        ni en cálculo por otra petición.
+
+        Parámetros:
+            key (Hashable): Clave del resultado.
+            fn (Callable): Función que calcula el valor.
+
+        Returns:
+            tuple:
+                value: Valor cacheado o recién calculado.
+                cached (bool): True si no se ejecutó `fn` en esta llamada.
+                age_secs (float): Antigüedad del valor en segundos.
+
+        Raises:
+            TimeoutError: Si el cálculo de otra petición no termina en `wait_timeout_secs`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl_secs:
+                return entry[1], True, now - entry[0]
+
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout_secs):
+                raise TimeoutError(f"El cálculo en curso no terminó en {self.wait_timeout_secs:g} s")
+            if call.error is not None:
+                raise call.error
+            return call.value, True, time.monotonic() - call.stored_at
+
+        try:
+            call.value = fn()
+            call.stored_at = time.monotonic()
+            with self._lock:
+                self._entries[key] = (call.stored_at, call.value)
+                self._evict(call.stored_at)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+        return call.value, False, 0.0
+
+    def _evict(self, now: float) -> None:
+        """
+        Elimina las entradas caducadas y, si aún sobran, las más antiguas.
+        Se llama con el lock tomado.
+        """
+        for key in [k for k, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl_secs]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+
+    def clear(self) -> None:
+        """
+        Vacía la caché (los cálculos en curso no se interrumpen).
+        """
+        with self._lock:
+            self._entries.clear()
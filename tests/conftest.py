@@ -1,4 +1,7 @@
 import os
+import uuid
+from pathlib import Path
+
 import pytest
 import app as appmod
 
@@ -17,7 +20,108 @@ def client(monkeypatch):
     """
     # Bloquea conexiones reales a la base de datos en /preview o en otros endpoints
     monkeypatch.setattr(appmod, "init_engine", lambda *a, **k: object())
+    monkeypatch.setattr(appmod, "init_read_engine", lambda *a, **k: object())
+    monkeypatch.setattr(appmod, "keyword_fingerprint", lambda engine: "kw")
+
+    # Cada prueba empieza con la caché de /preview vacía
+    appmod.preview_cache.clear()
 
     # Crea cliente de pruebas para la app Flask
     with appmod.app.test_client() as c:
         yield c
+
+
+class FakeConnection:
+    """
+    Conexión de SQLAlchemy mínima: registra cada sentencia con sus parámetros y
+    devuelve `rows` como resultado de todas ellas.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((str(sql), params))
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeEngine:
+    """
+    Motor que entrega siempre la misma `FakeConnection`, con o sin transacción.
+    """
+
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def connect(self):
+        return self.conn
+
+    def begin(self):
+        return self.conn
+
+
+@pytest.fixture
+def fake_engine():
+    """
+    Fijura de Pytest con un motor falso para probar consultas sin base de datos:
+    `fake_engine.conn.rows` fija el resultado y `fake_engine.conn.executed` guarda
+    las sentencias ejecutadas.
+    """
+    return FakeEngine()
+
+
+# Esquemas necesarios para las pruebas contra PostgreSQL, en orden de dependencias
+SCHEMAS = Path(__file__).resolve().parents[1] / "src" / "schemas"
+SCHEMA_FILES = (
+    "news_keywords.sql", "news.sql", "news_stats.sql", "news_tags.sql", "ingestion_runs.sql", "primary_writes.sql",
+)
+
+
+@pytest.fixture
+def pg_engine():
+    """
+    Motor de un PostgreSQL de pruebas (TEST_DATABASE_URL) con las tablas creadas en
+    un esquema propio que se elimina al terminar. A diferencia de una transacción que
+    se deshace, permite probar varias transacciones concurrentes.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL no configurada")
+    from sqlalchemy import create_engine
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema},public"})
+    with engine.begin() as conn:
+        for name in SCHEMA_FILES:
+            conn.exec_driver_sql((SCHEMAS / name).read_text(encoding="utf-8"))
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+        admin.dispose()
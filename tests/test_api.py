@@ -20,6 +20,63 @@ def test_health_ok(client):
     assert r.get_json()["status"] == "ok"
 
 
+def test_news_keyword_filters(client, monkeypatch, fake_engine):
+    """
+    Verifica que los filtros `category` y `keyword` de /news se resuelven con la
+    tabla de etiquetas `news_keyword_tags`, y que el resto de filtros y la
+    proyección `fields` llegan a la consulta SQL.
+    """
+    monkeypatch.setattr(appmod, "init_read_engine", lambda *a, **k: fake_engine)
+
+    r = client.get("/news?category=ai&keyword=ChatGPT&limit=5")
+    assert r.status_code == 200
+    sql, params = fake_engine.conn.executed[-1]
+    assert sql.count("news_keyword_tags") == 2
+    assert params == {"limit": 5, "offset": 0, "category": "AI", "keyword": "ChatGPT"}
+
+    r = client.get("/news?source_name=BBC%20News&published_to=2025-08-08&fields=url,title")
+    assert r.status_code == 200
+    sql, params = fake_engine.conn.executed[-1]
+    assert sql.split("FROM")[0].split() == ["SELECT", "url,", "title"]
+    assert params["published_to"].isoformat() == "2025-08-09T00:00:00+00:00"
+
+
+def test_news_accepts_unencoded_offset(client, monkeypatch, fake_engine):
+    """
+    Verifica que un desfase `+hh:mm` enviado sin codificar (llega como espacio) se
+    interpreta igual que codificado como `%2B`.
+    """
+    monkeypatch.setattr(appmod, "init_read_engine", lambda *a, **k: fake_engine)
+
+    for query in ("published_from=2025-08-08T10:00:00+02:00", "published_from=2025-08-08T10:00:00%2B02:00"):
+        r = client.get(f"/news?{query}")
+        assert r.status_code == 200
+        _, params = fake_engine.conn.executed[-1]
+        assert params["published_from"].isoformat() == "2025-08-08T10:00:00+02:00"
+
+
+def test_news_repository_errors_are_not_reported_as_bad_request(client, monkeypatch):
+    """
+    Verifica que un ValueError de la consulta (no de los parámetros) responde 500, no 400.
+    """
+    def broken(*a, **k):
+        raise ValueError("invalid literal for int() with base 10: 'x'")
+
+    monkeypatch.setattr(appmod, "list_news_rows", broken)
+
+    r = client.get("/news?limit=5")
+    assert r.status_code == 500
+
+
+def test_news_rejects_invalid_fields(client):
+    """
+    Verifica que /news responde 400 si `fields` incluye columnas no permitidas.
+    """
+    r = client.get("/news?fields=url,password")
+    assert r.status_code == 400
+    assert r.get_json()["status"] == "error"
+
+
 def test_preview_ok(client, monkeypatch):
     """
     Verifica que el endpoint /preview funciona correctamente.
@@ -60,6 +117,46 @@ def test_preview_ok(client, monkeypatch):
     assert data["count"] == 1
     assert isinstance(data["data"], list)
     assert data["metrics"]["clean_count"] == 1
+    assert data["cache"]["hit"] is False
+
+
+def test_preview_cached(client, monkeypatch):
+    """
+    Verifica que dos /preview idénticos solo ejecutan una ingesta y que la segunda
+    respuesta indica que viene de caché; con otros parámetros se vuelve a calcular.
+    """
+    calls = []
+
+    def fake_run_ingestion(engine, frm, to, page_size, max_pages):
+        calls.append(page_size)
+        return pd.DataFrame([{"url": "https://example.com/a"}]), {"clean_count": 1}
+
+    monkeypatch.setattr(appmod, "run_ingestion", fake_run_ingestion)
+
+    first = client.get("/preview?days_back=2&page_size=5").get_json()
+    second = client.get("/preview?days_back=2&page_size=5").get_json()
+    assert first["cache"]["hit"] is False
+    assert second["cache"]["hit"] is True
+    assert second["cache"]["age_secs"] >= 0
+    assert second["data"] == first["data"]
+    assert calls == [5]
+
+    client.get("/preview?days_back=2&page_size=10")
+    assert calls == [5, 10]
+
+
+def test_preview_wait_timeout_returns_504(client, monkeypatch):
+    """
+    Verifica que /preview responde 504 si el cálculo idéntico en curso no termina a tiempo.
+    """
+    def stuck(key, fn):
+        raise TimeoutError("El cálculo en curso no terminó en 30 s")
+
+    monkeypatch.setattr(appmod.preview_cache, "get_or_compute", stuck)
+
+    r = client.get("/preview?days_back=2&page_size=5")
+    assert r.status_code == 504
+    assert r.get_json()["status"] == "error"
 
 
 def test_ingest_ok(client, monkeypatch):
@@ -89,3 +186,88 @@ def test_ingest_ok(client, monkeypatch):
     assert data["status"] == "success"
     assert data["inserted"] == 3
     assert data["metrics"]["status"] == "ok"
+
+
+def test_ingest_coalesced(client, monkeypatch):
+    """
+    Verifica que, si la ingesta devuelve el resultado de otra ejecución en curso
+    (`coalesced`), el endpoint responde 200 en lugar de 201.
+    """
+    monkeypatch.setattr(
+        appmod, "process_ingestion",
+        lambda **kw: {"inserted": 3, "metrics": {"status": "ok"}, "coalesced": True}
+    )
+
+    r = client.post("/ingest", json={"days_back": 7})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["coalesced"] is True
+    assert data["inserted"] == 3
+
+
+def test_stats_sources_ok(client, monkeypatch):
+    """
+    Verifica que el endpoint /stats/sources lee de las tablas de agregados.
+
+    - Se simula `get_source_stats` para que devuelva una fila de ejemplo.
+    - Se valida que:
+        * La respuesta HTTP sea 200.
+        * Los filtros de la query lleguen a la función de lectura.
+        * Los datos devueltos coincidan con lo esperado.
+    """
+    calls = {}
+
+    def fake_get_source_stats(engine, frm=None, to=None, source_name=None):
+        calls.update(frm=frm, to=to, source_name=source_name)
+        return [{"day": "2025-08-08", "source_name": "sname", "articles": 4}]
+
+    monkeypatch.setattr(appmod, "get_source_stats", fake_get_source_stats)
+
+    r = client.get("/stats/sources?from=2025-08-01&to=2025-08-08&source_name=sname")
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["status"] == "success"
+    assert data["data"][0]["articles"] == 4
+    assert calls["frm"].isoformat() == "2025-08-01"
+    assert calls["source_name"] == "sname"
+
+
+def test_stats_category_is_case_insensitive(client, monkeypatch, fake_engine):
+    """
+    Verifica que /stats/categories normaliza la categoría igual que /news:
+    `?category=ai` filtra por `AI` en los dos endpoints.
+    """
+    monkeypatch.setattr(appmod, "init_read_engine", lambda *a, **k: fake_engine)
+
+    r = client.get("/stats/categories?category=%20ai%20")
+    assert r.status_code == 200
+    _, params = fake_engine.conn.executed[-1]
+    assert params["key"] == "AI"
+
+    client.get("/news?category=ai")
+    _, params = fake_engine.conn.executed[-1]
+    assert params["category"] == "AI"
+
+
+def test_stats_rejects_invalid_dates(client):
+    """
+    Verifica que /stats/* responde 400 (no 500) si `from` o `to` no son fechas válidas.
+    """
+    for path in ("/stats/sources?from=2025-13-01", "/stats/categories?to=ayer"):
+        r = client.get(path)
+        assert r.status_code == 400
+        assert r.get_json()["status"] == "error"
+
+
+def test_ingest_busy_returns_409(client, monkeypatch):
+    """
+    Verifica que /ingest responde 409 si otra ingesta no termina dentro del tiempo
+    máximo de espera.
+    """
+    def busy(**kw):
+        raise appmod.RunInProgressError("Timeout esperando a la ingesta en curso")
+
+    monkeypatch.setattr(appmod, "process_ingestion", busy)
+    r = client.post("/ingest", json={"days_back": 7})
+    assert r.status_code == 409
+    assert r.get_json()["status"] == "error"
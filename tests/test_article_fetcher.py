@@ -0,0 +1,131 @@
+# tests/test_article_fetcher.py
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.article_fetcher import extract_text, fetch_full_texts
+
+# ---------------------------------------------------------
+# Pruebas de la descarga del cuerpo completo contra un
+# servidor HTTP local que hace de web de noticias.
+# ---------------------------------------------------------
+
+PARAGRAPH = "Marketing teams are adopting generative AI to personalise campaigns at scale. " * 4
+
+# Texto con caracteres no ASCII para las pruebas de codificación
+ACCENTED = "La campaña de otoño usó IA generativa para personalizar cada anuncio. " * 4
+
+ARTICLE_HTML = f"""
+<html><head><title>t</title><script>var tracking = "no";</script></head>
+<body>
+  <nav><p>Home | World | Tech</p></nav>
+  <article><h1>Title</h1><p>{PARAGRAPH}</p><p>Second &amp; last paragraph.</p></article>
+  <footer><p>Copyright</p></footer>
+</body></html>
+"""
+
+
+@pytest.fixture
+def news_site():
+    """
+    Servidor local que sirve artículos tras una pequeña latencia y registra,
+    por host, las peticiones en curso y el instante de cada una.
+    """
+    state = {"lock": threading.Lock(), "active": defaultdict(int), "max_active": defaultdict(int),
+             "starts": defaultdict(list), "total_active": 0, "max_total": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            host = self.headers["Host"].split(":")[0]
+            with state["lock"]:
+                state["starts"][host].append(time.monotonic())
+                state["active"][host] += 1
+                state["total_active"] += 1
+                state["max_active"][host] = max(state["max_active"][host], state["active"][host])
+                state["max_total"] = max(state["max_total"], state["total_active"])
+            time.sleep(0.05)
+            with state["lock"]:
+                state["active"][host] -= 1
+                state["total_active"] -= 1
+
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            content_type = "text/html; charset=utf-8"
+            body = ARTICLE_HTML.encode("utf-8")
+            if self.path.startswith("/nocharset"):
+                # UTF-8 sin charset en la cabecera: requests asumiría ISO-8859-1
+                content_type = "text/html"
+                body = f"<html><body><article><p>{ACCENTED}</p></article></body></html>".encode("utf-8")
+            elif self.path.startswith("/latin1"):
+                # ISO-8859-1 declarado solo en la propia página
+                content_type = "text/html"
+                body = (f'<html><head><meta charset="iso-8859-1"></head>'
+                        f"<body><article><p>{ACCENTED}</p></article></body></html>").encode("latin-1")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1], state
+    server.shutdown()
+    server.server_close()
+
+
+def test_extract_text_keeps_article_paragraphs():
+    """
+    Verifica que solo se extraen los párrafos del <article> (sin navegación, pie ni scripts).
+    """
+    text = extract_text(ARTICLE_HTML)
+    assert text.startswith("Marketing teams")
+    assert text.endswith("Second & last paragraph.")
+    assert "Home" not in text and "Copyright" not in text and "tracking" not in text
+
+
+def test_fetch_respects_concurrency_and_host_limits(news_site):
+    """
+    Verifica que se descargan y extraen todas las páginas respetando el límite
+    global, el límite por host y la separación entre peticiones a un mismo host.
+    """
+    port, state = news_site
+    urls = [f"http://{host}:{port}/a{i}" for host in ("127.0.0.1", "localhost") for i in range(6)]
+    urls.append(f"http://127.0.0.1:{port}/missing")
+
+    texts, stats = fetch_full_texts(urls, concurrency=3, per_host=2, host_delay_secs=0.02, timeout=5)
+
+    assert stats["pages"] == 13
+    assert stats["ok"] == 12 and stats["failed"] == 1
+    assert stats["pages_per_sec"] > 0
+    assert texts[f"http://{'localhost'}:{port}/a0"].startswith("Marketing teams")
+    assert texts[f"http://127.0.0.1:{port}/missing"] is None
+
+    assert state["max_total"] <= 3
+    assert all(n <= 2 for n in state["max_active"].values())
+    for starts in state["starts"].values():
+        gaps = [b - a for a, b in zip(sorted(starts), sorted(starts)[1:])]
+        assert min(gaps) >= 0.015
+
+
+def test_pages_without_charset_header_are_decoded(news_site):
+    """
+    Verifica que una página UTF-8 sin charset en la cabecera no se decodifica como
+    ISO-8859-1, y que se respeta el <meta charset> de la página.
+    """
+    port, _ = news_site
+    urls = [f"http://127.0.0.1:{port}/nocharset", f"http://127.0.0.1:{port}/latin1"]
+
+    texts, _ = fetch_full_texts(urls, concurrency=2, per_host=2, host_delay_secs=0, timeout=5)
+
+    assert texts[urls[0]] == ACCENTED.strip()
+    assert texts[urls[1]] == ACCENTED.strip()
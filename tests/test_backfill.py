@@ -0,0 +1,113 @@
+# tests/test_backfill.py
+from datetime import datetime, timedelta, timezone
+from src.pipelines import backfill
+
+# ---------------------------------------------------------
+# Pruebas del backfill histórico: ventanas, subdivisión y
+# checkpoint (sin BD ni NewsAPI).
+# ---------------------------------------------------------
+
+T0 = datetime(2025, 8, 1, tzinfo=timezone.utc)
+
+
+def test_split_range_covers_range_without_gaps():
+    """
+    Verifica que las ventanas son consecutivas, cubren el rango completo y la
+    última se recorta al final del rango.
+    """
+    windows = backfill.split_range(T0, T0 + timedelta(hours=50), timedelta(days=1))
+    assert windows == [
+        (T0, T0 + timedelta(days=1)),
+        (T0 + timedelta(days=1), T0 + timedelta(days=2)),
+        (T0 + timedelta(days=2), T0 + timedelta(hours=50)),
+    ]
+    assert backfill.split_range(T0, T0, timedelta(days=1)) == []
+
+
+def test_halve_window_aligns_to_second():
+    """
+    Verifica que una ventana se parte en dos mitades contiguas alineadas al segundo.
+    """
+    (a, mid), (mid2, b) = backfill.halve_window(T0, T0 + timedelta(seconds=3))
+    assert (a, b) == (T0, T0 + timedelta(seconds=3))
+    assert mid == mid2 == T0 + timedelta(seconds=1)
+    assert mid.microsecond == 0
+
+
+def test_checkpoint_roundtrip_and_resume_end(tmp_path):
+    """
+    Verifica que el checkpoint conserva ventanas y rango, y que relanzar sin `--to`
+    reutiliza el fin del rango guardado (mismas claves de ventana).
+    """
+    path = str(tmp_path / "checkpoint.json")
+    assert backfill.load_checkpoint(path) == {"done": set(), "split": set(), "from": None, "to": None}
+
+    end = T0 + timedelta(days=2)
+    key = backfill.window_key("q", T0, end)
+    backfill.save_checkpoint(path, {"done": {key}, "split": set(), "from": T0.isoformat(), "to": end.isoformat()})
+
+    state = backfill.load_checkpoint(path)
+    assert state["done"] == {key}
+    assert backfill.resume_end(path, T0) == end
+
+    # Con otro --from el checkpoint no aplica y el rango termina ahora
+    assert backfill.resume_end(path, T0 + timedelta(days=1)) > end
+
+
+def test_split_window_does_not_store_first_page(monkeypatch):
+    """
+    Verifica que una ventana con más resultados de los paginables se subdivide
+    sin guardar su primera página (la vuelven a pedir las ventanas hijas).
+    """
+    stored = []
+    monkeypatch.setattr(backfill, "fetch_articles",
+                        lambda api_url, params: ([{"url": "u"}], {"status": "ok", "totalResults": 500}))
+    monkeypatch.setattr(backfill, "record_api_requests", lambda engine, n: None)
+    monkeypatch.setattr(backfill, "_store_page", lambda engine, articles: stored.append(articles) or len(articles))
+
+    res = backfill.process_window(None, "q", T0, T0 + timedelta(days=1), max_results=100)
+    assert res["split"] is True
+    assert res["written"] == 0 and stored == []
+
+
+def test_rate_limit_stops_backfill_and_resumes_from_checkpoint(monkeypatch, tmp_path):
+    """
+    Verifica que, tras un 429 de NewsAPI, no se piden más ventanas, el checkpoint
+    conserva las ya completadas y una nueva ejecución continúa desde ahí.
+    """
+    calls = []
+    limited = {"value": False}
+
+    def fake_fetch(api_url, params):
+        calls.append(params["from"])
+        if limited["value"]:
+            return None, {"status": "error", "code": "rateLimited", "http_status": 429,
+                          "error_message": "You have made too many requests recently."}
+        limited["value"] = True
+        return [{"url": "u"}], {"status": "ok", "totalResults": 1}
+
+    monkeypatch.setattr(backfill, "build_q_from_db", lambda engine: ["q"])
+    monkeypatch.setattr(backfill, "fetch_articles", fake_fetch)
+    monkeypatch.setattr(backfill, "record_api_requests", lambda engine, n: None)
+    monkeypatch.setattr(backfill, "_store_page", lambda engine, articles: len(articles))
+
+    path = str(tmp_path / "checkpoint.json")
+    end = T0 + timedelta(days=4)
+    res = backfill.run_backfill(T0, end, workers=1, checkpoint_path=path, sleep_secs=0, engine=object())
+
+    assert res["rate_limited"] is True
+    assert res["windows_done"] == 1 and res["windows_failed"] == 0
+    assert len(calls) == 2
+    state = backfill.load_checkpoint(path)
+    assert state["done"] == {backfill.window_key("q", T0, T0 + timedelta(days=1))}
+    assert backfill.resume_end(path, T0) == end
+
+    # Sin límite, la siguiente ejecución solo pide las tres ventanas que faltaban
+    calls.clear()
+    limited["value"] = False
+    monkeypatch.setattr(backfill, "fetch_articles",
+                        lambda api_url, params: calls.append(params["from"]) or ([], {"status": "ok", "totalResults": 0}))
+    res = backfill.run_backfill(T0, end, workers=1, checkpoint_path=path, sleep_secs=0, engine=object())
+    assert res["rate_limited"] is False
+    assert res["windows_skipped"] == 1 and res["windows_done"] == 3
+    assert len(calls) == 3
@@ -0,0 +1,120 @@
+# tests/test_clean_service.py
+import pandas as pd
+from src.services.clean_service import clean_raw_data, canonicalize_url, url_hash
+
+# ---------------------------------------------------------
+# Pruebas de la fase de limpieza (sin BD ni NewsAPI).
+# ---------------------------------------------------------
+
+def _article(url, **kw):
+    """
+    Artículo crudo mínimo con el formato de NewsAPI.
+    """
+    base = {
+        "url": url,
+        "title": "Titulo",
+        "description": "Desc",
+        "content": "Contenido",
+        "author": "Autor",
+        "publishedAt": "2025-08-08T00:00:00Z",
+        "urlToImage": None,
+        "source_id": None,
+        "source_name": "sname",
+    }
+    base.update(kw)
+    return base
+
+
+def test_canonicalize_url_strips_tracking():
+    """
+    Verifica que la misma noticia con distintos parámetros de tracking,
+    esquema, mayúsculas en el host o barra final tiene una única URL canónica.
+    """
+    variants = [
+        "https://example.com/news/a?id=3&utm_source=twitter",
+        "http://EXAMPLE.com/news/a/?utm_medium=social&id=3#comments",
+        "https://example.com:443/news/a?fbclid=abc&id=3",
+    ]
+    canon = {canonicalize_url(u) for u in variants}
+    assert canon == {"https://example.com/news/a?id=3"}
+
+
+def test_canonicalize_url_keeps_content_params():
+    """
+    Verifica que solo se eliminan claves de tracking inequívocas: parámetros genéricos
+    como `ref`, `cid` o `share` pueden identificar artículos distintos.
+    """
+    assert canonicalize_url("https://example.com/story?cid=42&ref=home&share=1") == \
+        "https://example.com/story?cid=42&ref=home&share=1"
+    assert canonicalize_url("https://example.com/story?cid=42") != canonicalize_url("https://example.com/story?cid=43")
+
+
+def test_clean_dedupes_by_url_hash():
+    """
+    Verifica que `clean_raw_data` conserva la URL original, añade el `url_hash`
+    de la URL canónica y elimina duplicados que solo difieren en parámetros de tracking.
+    """
+    df_raw = pd.DataFrame([
+        _article("https://example.com/a?utm_source=x"),
+        _article("https://example.com/a/?gclid=y"),
+        _article("https://example.com/b"),
+    ])
+    df = clean_raw_data(df_raw)
+
+    assert df["url"].tolist() == ["https://example.com/a?utm_source=x", "https://example.com/b"]
+    assert df["url_hash"].tolist() == [url_hash("https://example.com/a"), url_hash("https://example.com/b")]
+
+
+def _normalize(rows):
+    """
+    Normaliza nulos (None/NaN/pd.NA) y fechas para comparar filas de ambas rutas.
+    """
+    out = []
+    for r in rows:
+        out.append({
+            k: (None if v is None or (not isinstance(v, (str, bytes)) and pd.isna(v))
+                else pd.Timestamp(v) if k == "published_at" else v)
+            for k, v in r.items()
+        })
+    return out
+
+
+def test_records_path_matches_pandas_path():
+    """
+    Verifica que la ruta ligera (`ArticleRecord`) y la ruta pandas producen
+    exactamente las mismas filas para el mismo lote de artículos crudos.
+    """
+    from src.services.clean_service import filter_by_min_length
+    from src.services.fetch_service import articles_to_frame
+    from src.services.records import clean_raw_records, filter_records_by_min_length
+
+    def raw(url, **kw):
+        a = _article(url, **kw)
+        a["source"] = {"id": a.pop("source_id"), "name": a.pop("source_name")}
+        return a
+
+    articles = [
+        raw(" https://example.com/a?utm_source=x ", content="x" * 1200),
+        raw("https://example.com/a/", content="duplicado " * 200),
+        raw("https://example.com/b", author="  ", content="y" * 300 + " [+900 chars]"),
+        raw("https://example.com/c", title="   ", content="z" * 2000),
+        raw("https://example.com/d", publishedAt="no-es-fecha", content="z" * 2000),
+        raw("", content="z" * 2000),
+        raw("https://example.com/e", description=None, content="z" * 2000),
+        raw("https://example.com/f", publishedAt="2025-08-08T10:30:00+02:00", content=" w " * 9000),
+        raw("https://example.com/g", content=None),
+        raw("https://example.com/h", urlToImage="https://img/h.png", content="c" * 999),
+        # Formatos mezclados en el mismo lote: pandas no debe deducirlos del primer valor
+        raw("https://example.com/i", publishedAt="2025-08-08T10:30:00.123Z", content="i" * 2000),
+        raw("https://example.com/j", publishedAt="2025-08-08 10:30", content="j" * 2000),
+        raw("https://example.com/k", publishedAt="2025-08-08", content="k" * 2000),
+        raw("https://example.com/l", publishedAt="2025-08-08 10:30:00.5+02:00", content="l" * 2000),
+    ]
+
+    df = filter_by_min_length(clean_raw_data(articles_to_frame(articles)), min_total_chars=1000)
+    records = filter_records_by_min_length(clean_raw_records(articles), min_total_chars=1000)
+
+    assert len(records) == len(df) > 0
+    assert {"https://example.com/i", "https://example.com/j", "https://example.com/k",
+            "https://example.com/l"} <= {r.url for r in records}
+    assert _normalize([r.as_dict() for r in records]) == _normalize(df.to_dict(orient="records"))
@@ -0,0 +1,123 @@
+# tests/test_db.py
+from sqlalchemy import text
+from src.repositories import db
+
+# ---------------------------------------------------------
+# Pruebas del enrutado primaria / réplica de lectura con dos
+# bases de datos locales (SQLite); la marca de escritura
+# compartida se prueba contra PostgreSQL.
+# ---------------------------------------------------------
+
+
+def _urls(tmp_path):
+    return f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'replica.db'}"
+
+
+def test_engine_is_reused_per_url(tmp_path):
+    """
+    Verifica que cada URL tiene un único motor (y por tanto su propio pool).
+    """
+    primary, replica = _urls(tmp_path)
+    assert db.init_engine(primary) is db.init_engine(primary)
+    assert db.init_engine(primary) is not db.init_engine(replica)
+
+
+def test_reads_go_to_replica_and_fall_back_after_write(tmp_path, monkeypatch):
+    """
+    Verifica que las lecturas usan la réplica, salvo si la primaria registra un
+    commit de ingesta reciente, y que sin réplica siempre se lee de la primaria.
+    """
+    primary, replica = _urls(tmp_path)
+    for url, name in ((primary, "primary"), (replica, "replica")):
+        with db.init_engine(url).begin() as conn:
+            conn.execute(text("CREATE TABLE IF NOT EXISTS whoami (name TEXT)"))
+            conn.execute(text("INSERT INTO whoami VALUES (:n)"), {"n": name})
+
+    def read_from(engine):
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT name FROM whoami")).scalar()
+
+    recent = {"value": False}
+    monkeypatch.setattr(db, "recent_primary_write", lambda engine, secs: recent["value"])
+    assert read_from(db.init_read_engine(primary, replica, staleness_secs=5)) == "replica"
+
+    recent["value"] = True
+    assert read_from(db.init_read_engine(primary, replica, staleness_secs=5)) == "primary"
+    assert read_from(db.init_read_engine(primary, replica, staleness_secs=0)) == "replica"
+
+    # Sin réplica configurada siempre se usa la primaria
+    assert read_from(db.init_read_engine(primary, None)) == "primary"
+
+
+def _fresh_marker(monkeypatch):
+    """
+    Estado de la marca como en un proceso recién arrancado.
+    """
+    monkeypatch.setattr(db, "_marker", {"local_write": None, "primary_until": 0.0, "next_check": 0.0,
+                                        "warned": False})
+
+
+def test_unreadable_marker_reads_from_replica_and_warns_once(tmp_path, monkeypatch, caplog):
+    """
+    Verifica que, si no se puede consultar la marca de escritura (tabla ausente), las
+    lecturas van a la réplica y el aviso se registra una sola vez.
+    """
+    _fresh_marker(monkeypatch)
+    primary, _ = _urls(tmp_path)
+    engine = db.init_engine(primary)
+    with caplog.at_level("WARNING", logger=db.logger.name):
+        assert db.recent_primary_write(engine, 0) is False
+        assert db.recent_primary_write(engine, 0) is False
+    assert len([r for r in caplog.records if r.levelname == "WARNING"]) == 1
+
+
+def test_primary_write_marker_is_shared(pg_engine, monkeypatch):
+    """
+    Verifica que la marca de escritura se guarda en la primaria: otro proceso (como
+    otro worker o el DAG) la ve hasta que pasa `staleness_secs`.
+    """
+    _fresh_marker(monkeypatch)
+    assert db.recent_primary_write(pg_engine, 60) is False
+
+    # Escritura de otro proceso: no se conoce en local, se lee de la primaria
+    with pg_engine.begin() as conn:
+        conn.execute(text("UPDATE primary_writes SET written_at = clock_timestamp() WHERE id = 1"))
+    _fresh_marker(monkeypatch)
+    assert db.recent_primary_write(pg_engine, 60) is True
+
+    with pg_engine.begin() as conn:
+        conn.execute(text("UPDATE primary_writes SET written_at = NOW() - INTERVAL '1 minute'"))
+    _fresh_marker(monkeypatch)
+    assert db.recent_primary_write(pg_engine, 5) is False
+
+    # Una escritura de este proceso se conoce sin consultar y actualiza la fila única
+    db.note_primary_write(pg_engine)
+    assert db.recent_primary_write(pg_engine, 5) is True
+    with pg_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM primary_writes")).scalar() == 1
+        assert conn.execute(text("SELECT written_at > NOW() - INTERVAL '5 seconds' FROM primary_writes")).scalar()
+
+
+def test_marker_is_read_at_most_once_per_check_interval(pg_engine, monkeypatch):
+    """
+    Verifica que las lecturas reutilizan la última consulta de la marca durante
+    `staleness_secs * MARKER_CHECK_FRACTION` en lugar de consultar la primaria cada vez.
+    """
+    _fresh_marker(monkeypatch)
+    queries = []
+    from sqlalchemy import event
+    event.listen(pg_engine, "before_cursor_execute", lambda *a: queries.append(a[2]))
+
+    for _ in range(20):
+        assert db.recent_primary_write(pg_engine, 60) is False
+    assert sum("primary_writes" in q for q in queries) == 1
+
+    # Otra escritura mientras tanto: se ve en cuanto vence el intervalo
+    with pg_engine.begin() as conn:
+        conn.execute(text("UPDATE primary_writes SET written_at = clock_timestamp() WHERE id = 1"))
+    assert db.recent_primary_write(pg_engine, 60) is False
+    db._marker["next_check"] = 0.0
+    assert db.recent_primary_write(pg_engine, 60) is True
+    for _ in range(20):
+        assert db.recent_primary_write(pg_engine, 60) is True
+    assert sum("SELECT EXTRACT" in q for q in queries) == 2
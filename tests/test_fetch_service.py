@@ -0,0 +1,74 @@
+# tests/test_fetch_service.py
+import requests
+
+from src.services import fetch_service
+from src.services.fetch_service import NewsAPIError
+
+# ---------------------------------------------------------
+# Pruebas de la llamada a NewsAPI y de sus errores
+# (respuestas HTTP simuladas, sin red).
+# ---------------------------------------------------------
+
+
+def _fake_response(monkeypatch, status_code, body: bytes):
+    """
+    Sustituye `requests.get` por una respuesta con el código y cuerpo indicados.
+    """
+    def fake_get(url, params, timeout):
+        resp = requests.models.Response()
+        resp.status_code = status_code
+        resp._content = body
+        return resp
+
+    monkeypatch.setattr(fetch_service.requests, "get", fake_get)
+
+
+def test_fetch_articles_keeps_newsapi_error_code(monkeypatch):
+    """
+    Verifica que un error HTTP de NewsAPI (429) conserva el `code` de su cuerpo JSON.
+    """
+    _fake_response(monkeypatch, 429, b'{"status": "error", "code": "rateLimited", "message": "Too many requests"}')
+
+    articles, meta = fetch_service.fetch_articles("https://newsapi.example/v2/everything", {})
+    assert articles is None
+    assert meta["code"] == "rateLimited" and meta["http_status"] == 429
+    assert meta["error_message"] == "Too many requests"
+    assert NewsAPIError(meta).rate_limited
+
+
+def test_http_error_without_json_body(monkeypatch):
+    """
+    Verifica que un error HTTP sin cuerpo JSON se describe con su código HTTP y
+    que un 429 se reconoce como límite de uso aunque no traiga `code`.
+    """
+    _fake_response(monkeypatch, 429, b"<html>Too Many Requests</html>")
+
+    articles, meta = fetch_service.fetch_articles("https://newsapi.example/v2/everything", {})
+    assert articles is None
+    assert meta["code"] is None and meta["error_message"] == "Error de conexión: HTTP 429"
+    assert NewsAPIError(meta).rate_limited
+
+
+def test_other_errors_are_not_rate_limits(monkeypatch):
+    """
+    Verifica que otros errores de NewsAPI (p. ej. clave no válida) no se tratan como
+    límite de uso y que el error conserva sus metadatos.
+    """
+    _fake_response(monkeypatch, 401, b'{"status": "error", "code": "apiKeyInvalid", "message": "Invalid key"}')
+
+    _, meta = fetch_service.fetch_articles("https://newsapi.example/v2/everything", {})
+    error = NewsAPIError(meta)
+    assert not error.rate_limited
+    assert error.meta["code"] == "apiKeyInvalid" and "apiKeyInvalid" in str(error)
+    assert not NewsAPIError(None).rate_limited
+
+
+def test_fetch_articles_returns_articles_and_total(monkeypatch):
+    """
+    Verifica que una respuesta correcta devuelve los artículos tal cual y `totalResults`.
+    """
+    _fake_response(monkeypatch, 200, b'{"status": "ok", "totalResults": 1, "articles": [{"url": "u"}]}')
+
+    articles, meta = fetch_service.fetch_articles("https://newsapi.example/v2/everything", {})
+    assert articles == [{"url": "u"}]
+    assert meta == {"status": "ok", "totalResults": 1}
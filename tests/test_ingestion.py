@@ -0,0 +1,120 @@
+# tests/test_ingestion.py
+from src.pipelines import ingestion
+from src.utils.bloom import BloomFilter
+
+# ---------------------------------------------------------
+# Pruebas de la ingesta página a página (NewsAPI y BD simuladas).
+# ---------------------------------------------------------
+
+
+def _raw(i):
+    """
+    Artículo crudo de NewsAPI que supera el filtro de longitud mínima.
+    """
+    return {
+        "source": {"id": None, "name": "sname"},
+        "author": "Autor",
+        "title": f"Titulo {i}",
+        "description": "Desc",
+        "url": f"https://example.com/{i}",
+        "urlToImage": None,
+        "publishedAt": "2025-08-08T00:00:00Z",
+        "content": "x" * 300 + " [+900 chars]",
+    }
+
+
+def _fake_api(monkeypatch, events, pages=5, page_size=3):
+    """
+    Simula NewsAPI con `pages` páginas llenas; la página 2 repite un artículo de la 1.
+    """
+    def fake_fetch(api_url, params):
+        page = params["page"]
+        events.append(("fetch", page))
+        if page > pages:
+            return [], {"status": "ok", "totalResults": pages * page_size}
+        ids = [(page - 1) * page_size + k for k in range(page_size)]
+        if page == 2:
+            ids[0] = 0
+        return [_raw(i) for i in ids], {"status": "ok", "totalResults": pages * page_size}
+
+    monkeypatch.setattr(ingestion, "fetch_articles", fake_fetch)
+    monkeypatch.setattr(ingestion, "record_api_requests", lambda engine, n: None)
+    monkeypatch.setattr(ingestion.time, "sleep", lambda s: None)
+
+
+def test_pages_are_curated_and_yielded_one_at_a_time(monkeypatch):
+    """
+    Verifica que cada página se pide solo cuando se ha consumido la anterior, que llega
+    limpia y sin los duplicados de páginas previas, y que se para en `max_pages`.
+    """
+    events = []
+    _fake_api(monkeypatch, events)
+
+    metrics = {}
+    pages = ingestion.iter_curated_pages(None, "2025-08-01", "2025-08-08", page_size=3, max_pages=3,
+                                         metrics=metrics, queries=["q"])
+    first = next(pages)
+    assert events == [("fetch", 1)]
+    assert [r.url for r in first] == ["https://example.com/0", "https://example.com/1", "https://example.com/2"]
+
+    second = next(pages)
+    assert events == [("fetch", 1), ("fetch", 2)]
+    assert [r.url for r in second] == ["https://example.com/4", "https://example.com/5"]
+
+    assert len(list(pages)) == 1
+    assert events == [("fetch", 1), ("fetch", 2), ("fetch", 3)]
+    assert metrics["requests"] == 3 and metrics["raw_count"] == 9 and metrics["clean_count"] == 8
+
+
+def test_ingest_window_upserts_each_page_as_it_arrives(monkeypatch):
+    """
+    Verifica que `ingest_window` guarda cada página antes de pedir la siguiente y
+    que no pide más de `max_pages` aunque la API tenga más resultados.
+    """
+    events = []
+    _fake_api(monkeypatch, events)
+    monkeypatch.setattr(ingestion, "load_known_filter", lambda engine: None)
+
+    def fake_upsert(engine, page):
+        events.append(("upsert", len(page)))
+        return {"written": len(page), "new": len(page)}
+
+    monkeypatch.setattr(ingestion, "upsert_news_counts", fake_upsert)
+
+    res = ingestion.ingest_window(None, "2025-08-01", "2025-08-08", page_size=3, max_pages=2, queries=["q"])
+    assert events == [("fetch", 1), ("upsert", 3), ("fetch", 2), ("upsert", 2)]
+    assert res["inserted"] == 5
+    assert res["metrics"]["new_count"] == 5
+
+
+def test_known_filter_is_persisted_once_per_run(monkeypatch):
+    """
+    Verifica que el filtro de artículos conocidos se escribe una sola vez al final
+    de la ingesta, con las huellas de todas las páginas guardadas.
+    """
+    events = []
+    _fake_api(monkeypatch, events)
+    known = BloomFilter(capacity=1000, fp_rate=0.01)
+    remembered = []
+    monkeypatch.setattr(ingestion, "load_known_filter", lambda engine: known)
+    monkeypatch.setattr(ingestion, "upsert_news_counts", lambda engine, page: {"written": len(page), "new": 0})
+    monkeypatch.setattr(ingestion, "remember_known", lambda engine, bloom, keys: remembered.append(list(keys)))
+
+    ingestion.ingest_window(None, "2025-08-01", "2025-08-08", page_size=3, max_pages=3, queries=["q"])
+    assert len(remembered) == 1
+    assert len(remembered[0]) == 8
+
+
+def test_curate_articles_uses_records_path_for_api_pages():
+    """
+    Verifica que una página de NewsAPI (como mucho 100 artículos) va por la ruta ligera
+    y que un lote mayor va por pandas, con las mismas filas en ambos casos.
+    """
+    page = [_raw(i) for i in range(ingestion.NEWSAPI_MAX_PAGE_SIZE)]
+    big = [_raw(i) for i in range(ingestion.RECORDS_PATH_MAX_ROWS + 1)]
+
+    records = ingestion.curate_articles(page)
+    frame = ingestion.curate_articles(big)
+    assert isinstance(records, list) and len(records) == len(page)
+    assert hasattr(frame, "to_dict") and len(frame) == len(big)
+    assert frame["url"].tolist()[:len(page)] == [r.url for r in records]
@@ -0,0 +1,80 @@
+# tests/test_known_filter.py
+import os
+import pandas as pd
+from src.repositories import known_filter
+from src.utils.bloom import BloomFilter
+from src.services.clean_service import clean_raw_data, fingerprints
+
+# ---------------------------------------------------------
+# Pruebas del filtro de artículos conocidos: tasa de falsos
+# positivos y coincidencia de huellas entre datos crudos y limpios.
+# ---------------------------------------------------------
+
+def test_bloom_fp_rate_within_target():
+    """
+    Verifica que la tasa de falsos positivos medida no supera el objetivo configurado.
+
+    - Se llena el filtro hasta su capacidad.
+    - Todas las claves añadidas deben estar (sin falsos negativos).
+    - La tasa medida sobre claves nuevas debe quedar cerca del objetivo,
+      y la estimada por el propio filtro también.
+    """
+    bloom = BloomFilter(capacity=20000, fp_rate=0.01)
+    added = [os.urandom(16) for _ in range(20000)]
+    bloom.update(added)
+
+    assert all(k in bloom for k in added)
+
+    probes = 50000
+    false_positives = sum(os.urandom(16) in bloom for _ in range(probes))
+    assert false_positives / probes < 0.015
+    assert bloom.estimated_fp_rate() < 0.015
+
+
+def test_bloom_roundtrip_and_merge():
+    """
+    Verifica que el filtro se puede serializar y unir con otro de mismos parámetros.
+    """
+    a = BloomFilter(capacity=1000, fp_rate=0.01)
+    b = BloomFilter(capacity=1000, fp_rate=0.01)
+    a.add(b"uno")
+    b.add(b"dos")
+
+    restored = BloomFilter(capacity=1000, fp_rate=0.01, bits=bytes(a.bits), items=a.items)
+    restored.merge(b)
+    assert b"uno" in restored and b"dos" in restored
+
+
+def test_fingerprint_raw_matches_clean():
+    """
+    Verifica que la huella de un artículo crudo coincide con la de la fila limpia,
+    de modo que un artículo guardado sin cambios se reconoce en la siguiente descarga.
+    """
+    df_raw = pd.DataFrame([{
+        "url": " https://example.com/a ",
+        "title": "Titulo ",
+        "description": " Desc",
+        "content": "x" * 25000,
+        "author": None,
+        "publishedAt": "2025-08-08T00:00:00Z",
+        "source_name": "sname",
+    }])
+    df_clean = clean_raw_data(df_raw)
+
+    assert fingerprints(df_raw).tolist() == fingerprints(df_clean).tolist()
+
+
+def test_filter_over_capacity_is_rebuilt(monkeypatch, fake_engine):
+    """
+    Verifica que, si al persistir el filtro supera su capacidad, se reconstruye
+    (y no se sigue usando con una tasa de falsos positivos creciente).
+    """
+    rebuilt = []
+    monkeypatch.setattr(known_filter, "rebuild_known_filter", lambda engine, **kw: rebuilt.append(kw))
+
+    bloom = BloomFilter(capacity=10, fp_rate=0.01)
+    known_filter.remember_known(fake_engine, bloom, [os.urandom(16) for _ in range(10)])
+    assert rebuilt == []
+
+    known_filter.remember_known(fake_engine, bloom, [os.urandom(16)])
+    assert rebuilt == [{"fp_rate": 0.01}]
@@ -0,0 +1,112 @@
+# tests/test_loadtest.py
+import os
+import time
+
+import pytest
+
+from src.loadtest.fake_newsapi import start_fake_newsapi
+from src.loadtest.harness import (
+    parse_mix, percentile, start_pool_sampler, summarize, summarize_pool, with_application_name,
+)
+from src.services.fetch_service import fetch_articles
+from src.pipelines.ingestion import curate_page
+
+# ---------------------------------------------------------
+# Pruebas del generador de carga: agregación de resultados
+# y NewsAPI falsa (sin BD ni servidor WSGI).
+# ---------------------------------------------------------
+
+
+def test_summarize_reports_percentiles_and_errors():
+    """
+    Verifica el cálculo de throughput, percentiles y tasa de errores, en total y por tipo.
+    """
+    samples = [("news", 200, float(ms)) for ms in range(1, 101)]
+    samples += [("ingest", 500, 250.0), ("ingest", None, 900.0)]
+
+    report = summarize(samples, elapsed_secs=2.0)
+
+    news = report["scenarios"]["news"]
+    assert news["requests"] == 100 and news["errors"] == 0
+    assert news["throughput_rps"] == 50.0
+    assert (news["latency_ms"]["p50"], news["latency_ms"]["p95"], news["latency_ms"]["p99"]) == (50.0, 95.0, 99.0)
+    assert report["scenarios"]["ingest"]["status_codes"] == {"500": 1, "connection_error": 1}
+    assert report["total"]["error_rate"] == round(2 / 102, 4)
+    assert percentile([], 99) is None
+
+
+def test_parse_mix_validates_scenarios():
+    """
+    Verifica que la mezcla se interpreta como pesos y rechaza tipos desconocidos.
+    """
+    assert parse_mix("news=70, ingest=30") == {"news": 70.0, "ingest": 30.0}
+    with pytest.raises(ValueError):
+        parse_mix("news=70,delete_all=30")
+
+
+def test_summarize_pool_reports_usage_and_saturation():
+    """
+    Verifica la agregación de las muestras de pg_stat_activity: solo las conexiones de
+    la aplicación, por estado, y la saturación frente al límite del pool.
+    """
+    snapshots = [
+        {("api", "active"): 2, ("api", "idle"): 4, ("psql", "idle"): 1},
+        {("api", "active"): 6, ("api", "idle in transaction"): 1, ("api", "idle"): 3},
+    ]
+
+    usage = summarize_pool(snapshots, app_name="api", limit=20)
+
+    assert usage["samples"] == 2
+    assert usage["connections"] == {"mean": 8.0, "max": 10}
+    assert usage["by_state"]["active"] == {"mean": 4.0, "max": 6}
+    assert usage["by_state"]["idle in transaction"] == {"mean": 0.5, "max": 1}
+    assert usage["saturation"] == 0.5
+    assert "by_application" not in usage
+    assert summarize_pool(snapshots)["by_application"]["psql"] == {"mean": 0.5, "max": 1}
+    assert summarize_pool([])["connections"] == {"mean": None, "max": None}
+
+
+def test_pool_sampler_counts_application_connections(pg_engine):
+    """
+    Verifica contra PostgreSQL que el muestreo ve las conexiones abiertas con el
+    application_name de la aplicación y no cuenta la suya propia.
+    """
+    from sqlalchemy import create_engine
+
+    url = os.environ["TEST_DATABASE_URL"]
+    app = create_engine(with_application_name(url, "loadtest_probe"))
+    finish = start_pool_sampler(url, interval_secs=0.05)
+    try:
+        with app.connect() as first, app.connect() as second:
+            first.exec_driver_sql("SELECT 1")
+            second.exec_driver_sql("SELECT 1")
+            time.sleep(0.3)
+    finally:
+        snapshots = finish()
+        app.dispose()
+
+    usage = summarize_pool(snapshots, app_name="loadtest_probe")
+    assert usage["samples"] > 0
+    assert usage["connections"]["max"] == 2
+    assert "news_loadtest_sampler" not in summarize_pool(snapshots)["by_application"]
+
+
+def test_fake_newsapi_pages_survive_cleaning():
+    """
+    Verifica que la NewsAPI falsa devuelve páginas con el formato real, que
+    pasan la limpieza y el filtro de longitud mínima, y que pagina hasta totalResults.
+    """
+    server, url = start_fake_newsapi(latency_ms=0, total_results=30)
+    try:
+        articles, meta = fetch_articles(url, {"apiKey": "k", "q": "AI", "page": 1, "pageSize": 20})
+        assert meta == {"status": "ok", "totalResults": 30}
+        assert len(curate_page(articles)) == 20
+
+        last, _ = fetch_articles(url, {"apiKey": "k", "q": "AI", "page": 2, "pageSize": 20})
+        assert len(last) == 10
+
+        _, error = fetch_articles(url, {"q": "AI"})
+        assert error["status"] == "error"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,48 @@
+# tests/test_news_migration.py
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.repositories.news import rehash_urls
+from src.services.clean_service import canonicalize_url, url_hash
+
+# ---------------------------------------------------------
+# Migración de `url_hash` a la URL canónica. Necesita un
+# PostgreSQL de pruebas (TEST_DATABASE_URL, fijura `pg_engine`).
+# ---------------------------------------------------------
+
+
+def _insert(conn, url, key, published_at):
+    conn.execute(text("""
+        INSERT INTO news (url, url_hash, source_name, title, published_at)
+        VALUES (:url, :key, 'BBC', 'Title', :published_at)
+    """), {"url": url, "key": key, "published_at": published_at})
+
+
+def test_rehash_merges_rows_of_the_same_article(pg_engine):
+    """
+    Verifica que las filas antiguas (hash de la URL tal y como se guardó) pasan al hash
+    canónico, que las que son la misma noticia se fusionan conservando la fila ya
+    canónica y que las URLs guardadas no cambian.
+    """
+    day = datetime(2025, 8, 8, tzinfo=timezone.utc)
+    legacy = "http://Example.com/a/?utm_source=x"
+    current = "https://example.com/a?utm_medium=rss"
+    other = "https://example.com/b/?cid=1"
+    canonical = url_hash(canonicalize_url(current))
+
+    with pg_engine.begin() as conn:
+        _insert(conn, legacy, url_hash(legacy), day)
+        _insert(conn, current, canonical, day)
+        _insert(conn, other, url_hash(other), day)
+
+    assert rehash_urls(pg_engine) == {"scanned": 3, "rehashed": 1, "merged": 1}
+
+    with pg_engine.connect() as conn:
+        rows = dict(conn.execute(text("SELECT url, url_hash FROM news")).all())
+        source_count = conn.execute(text("SELECT SUM(articles) FROM news_stats_daily_source")).scalar()
+    assert rows == {current: canonical, other: url_hash(canonicalize_url(other))}
+    assert source_count == 2
+
+    # Idempotente: una segunda ejecución no cambia nada
+    assert rehash_urls(pg_engine) == {"scanned": 2, "rehashed": 0, "merged": 0}
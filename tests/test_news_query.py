@@ -0,0 +1,103 @@
+# tests/test_news_query.py
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from src.repositories.news import build_news_query
+
+# ---------------------------------------------------------
+# Pruebas de los filtros de GET /news. Las de EXPLAIN
+# necesitan un PostgreSQL de pruebas (TEST_DATABASE_URL,
+# ver la fijura `pg_engine`).
+# ---------------------------------------------------------
+
+
+def test_build_query_pushes_filters_and_projection():
+    """
+    Verifica que los filtros y la proyección se trasladan a la consulta SQL.
+    """
+    sql, params = build_news_query(
+        limit=10, fields=["url", "title"], source_name="BBC News", author="Jane Doe",
+        published_from=datetime(2025, 8, 1, tzinfo=timezone.utc),
+    )
+    sql = str(sql)
+    assert "SELECT url, title\n" in sql
+    assert "source_name = :source_name" in sql
+    assert "lower(author) = lower(:author)" in sql
+    assert "published_at >= :published_from" in sql
+    assert "published_to" not in sql
+    assert params["source_name"] == "BBC News" and params["limit"] == 10
+
+
+def test_build_query_rejects_unknown_fields():
+    """
+    Verifica que `fields` solo admite columnas públicas (sin inyección de SQL).
+    """
+    with pytest.raises(ValueError):
+        build_news_query(fields=["url", "id; DROP TABLE news"])
+
+
+@pytest.fixture
+def seeded_engine(pg_engine):
+    """
+    Motor con 20.000 noticias de 250 fuentes y 200 autores, con las páginas marcadas
+    como visibles (VACUUM) y estadísticas al día.
+    """
+    with pg_engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO news (url, url_hash, source_name, author, title, published_at)
+            SELECT 'https://example.com/' || g, g, 'source-' || (g % 250), 'Author ' || (g % 200),
+                   'Title ' || g, NOW() - g * INTERVAL '1 minute'
+            FROM generate_series(1, 20000) AS g
+        """))
+    # VACUUM no puede ejecutarse dentro de una transacción
+    with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE news"))
+    return pg_engine
+
+
+def _plan(engine, **filters) -> str:
+    sql, params = build_news_query(**filters)
+    with engine.connect() as conn:
+        rows = conn.execute(text("EXPLAIN " + sql.text), params).scalars().all()
+    return "\n".join(rows)
+
+
+def test_explain_source_filter_uses_composite_index(seeded_engine):
+    """
+    Verifica que el filtro por fuente usa (source_name, published_at DESC) sin ordenar.
+    """
+    plan = _plan(seeded_engine, source_name="source-7")
+    assert "idx_news_source_published" in plan
+    assert "Sort" not in plan
+
+
+def test_explain_author_filter_uses_expression_index(seeded_engine):
+    """
+    Verifica que el filtro por autor usa el índice sobre lower(author).
+    """
+    plan = _plan(seeded_engine, author="author 7")
+    assert "idx_news_author_published" in plan
+    assert "Sort" not in plan
+
+
+def test_explain_date_range_uses_published_index(seeded_engine):
+    """
+    Verifica que el rango de fechas se resuelve con el índice de published_at.
+    """
+    with seeded_engine.connect() as conn:
+        frm = conn.execute(text("SELECT NOW() - INTERVAL '2 hours'")).scalar()
+    plan = _plan(seeded_engine, published_from=frm)
+    assert "idx_news_published_covering" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_explain_small_projection_uses_index_only_scan(seeded_engine):
+    """
+    Verifica que pedir solo columnas del índice de published_at (clave o INCLUDE) se
+    resuelve con un Index Only Scan, sin leer la tabla.
+    """
+    plan = _plan(seeded_engine, fields=["source_name", "published_at"])
+    assert "Index Only Scan using idx_news_published_covering" in plan
+    assert "Sort" not in plan
@@ -0,0 +1,79 @@
+# tests/test_planner.py
+from datetime import datetime, timedelta, timezone
+from src.pipelines import planner
+
+# ---------------------------------------------------------
+# Pruebas de la política del planificador adaptativo
+# (funciones puras, sin BD ni NewsAPI).
+# ---------------------------------------------------------
+
+NOW = datetime(2025, 8, 8, 12, 0, tzinfo=timezone.utc)
+
+
+def test_tick_budget_spreads_remaining_quota():
+    """
+    Verifica que la cuota restante se reparte entre los ticks que quedan del día
+    y que no se gasta nada si la cuota está agotada.
+    """
+    # Quedan 12 h = 48 ticks de 15 min: 96 peticiones -> 2 por tick
+    assert planner.tick_budget(96, NOW, timedelta(minutes=15)) == 2
+    assert planner.tick_budget(1, NOW, timedelta(minutes=15)) == 1
+    assert planner.tick_budget(0, NOW, timedelta(minutes=15)) == 0
+
+
+def test_plan_prioritizes_high_yield_queries():
+    """
+    Verifica que, con presupuesto limitado, se consultan primero las queries
+    con más artículos nuevos por petición y se ignoran las que no tocan.
+    """
+    low = {**planner.new_state("low", NOW), "yield_ema": 1.0}
+    high = {**planner.new_state("high", NOW), "yield_ema": 95.0}
+    later = {**planner.new_state("later", NOW), "yield_ema": 99.0, "next_run_at": NOW + timedelta(hours=1)}
+
+    plan = planner.plan_tick([low, high, later], NOW, budget=3, page_size=100)
+    assert [(s["query"], pages) for s, pages in plan] == [("high", 3)]
+
+    plan = planner.plan_tick([low, high, later], NOW, budget=4, page_size=100)
+    assert [(s["query"], pages) for s, pages in plan] == [("high", 3), ("low", 1)]
+
+
+def test_update_state_backs_off_and_speeds_up():
+    """
+    Verifica que una query sin novedades se espacia y una productiva se acelera.
+    """
+    state = planner.new_state("q", NOW)
+    base = state["interval_secs"]
+
+    exhausted = planner.update_state(state, requests=1, new_articles=0, now=NOW, page_size=100)
+    assert exhausted["interval_secs"] == 2 * base
+    assert exhausted["yield_ema"] < state["yield_ema"]
+
+    productive = planner.update_state(state, requests=1, new_articles=80, now=NOW, page_size=100)
+    assert productive["interval_secs"] == base // 2
+    assert productive["next_run_at"] == NOW + timedelta(seconds=base // 2)
+
+
+def test_rate_limited_tick_marks_quota_exhausted(monkeypatch):
+    """
+    Verifica que, si NewsAPI responde `rateLimited`, el tick marca la cuota del día
+    como agotada y no consulta más queries.
+    """
+    from src.services.fetch_service import NewsAPIError
+
+    marked, calls = [], []
+    monkeypatch.setattr(planner, "get_api_requests", lambda engine, day: 0)
+    monkeypatch.setattr(planner, "set_api_requests", lambda engine, day, n: marked.append(n))
+    monkeypatch.setattr(planner, "load_query_states", lambda engine: {})
+    monkeypatch.setattr(planner, "save_query_state", lambda engine, state: None)
+    monkeypatch.setattr(planner, "build_q_from_db", lambda engine: ["q1", "q2"])
+
+    def fake_ingest(engine, **kw):
+        calls.append(kw["queries"])
+        raise NewsAPIError({"status": "error", "code": "rateLimited", "http_status": 429})
+
+    monkeypatch.setattr(planner, "ingest_window", fake_ingest)
+
+    summary = planner.run_planner_tick(engine=object(), now=NOW)
+    assert marked == [planner.NEWSAPI_DAILY_QUOTA]
+    assert len(calls) == 1
+    assert summary["requests"] == 0
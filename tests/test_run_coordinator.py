@@ -0,0 +1,101 @@
+# tests/test_run_coordinator.py
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from src.repositories import run_coordinator
+from src.repositories.run_coordinator import INGESTION_LOCK, RunInProgressError, run_exclusive
+
+# ---------------------------------------------------------
+# Pruebas de la coordinación de ingestas entre procesos con
+# advisory locks. Necesitan un PostgreSQL de pruebas
+# (TEST_DATABASE_URL, ver la fijura `pg_engine`).
+# ---------------------------------------------------------
+
+
+def _hold_lock(engine, lock_scope, release: threading.Event, held: threading.Event):
+    """
+    Simula otra ingesta en curso: toma el lock desde otra conexión hasta `release`.
+    """
+    key = run_coordinator.lock_key(lock_scope)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        conn.commit()
+        held.set()
+        release.wait(10)
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+        conn.commit()
+
+
+def test_identical_runs_are_coalesced(pg_engine):
+    """
+    Verifica que una llamada que llega durante una ejecución del mismo ámbito espera
+    y recibe su resultado sin volver a ejecutar `fn`.
+    """
+    calls, results = [], []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.5)
+        return {"inserted": 3}
+
+    def worker():
+        results.append(run_exclusive(pg_engine, "process_ingestion:7:100:1", fn,
+                                     poll_secs=0.05, lock_scope=INGESTION_LOCK))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+        time.sleep(0.05)
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(coalesced for _, coalesced in results) == [False, True, True]
+    assert all(result == {"inserted": 3} for result, _ in results)
+
+
+def test_different_scopes_share_the_ingestion_lock(pg_engine):
+    """
+    Verifica que dos ingestas con parámetros distintos no se solapan: la segunda espera
+    a la primera y después se ejecuta (no reutiliza un resultado ajeno).
+    """
+    release, held = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_lock, args=(pg_engine, INGESTION_LOCK, release, held))
+    holder.start()
+    held.wait(5)
+
+    # El tick del planificador se descarta mientras hay otra ingesta en curso
+    assert run_exclusive(pg_engine, "planner_tick", lambda: "tick", wait=False,
+                         lock_scope=INGESTION_LOCK) == (None, True)
+
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    started = time.monotonic()
+    result = run_exclusive(pg_engine, "process_ingestion:1:100:1", lambda: {"inserted": 1},
+                           poll_secs=0.05, lock_scope=INGESTION_LOCK)
+    assert result == ({"inserted": 1}, False)
+    assert time.monotonic() - started >= 0.25
+    holder.join()
+
+
+def test_wait_timeout_raises_and_releases_connections(pg_engine):
+    """
+    Verifica que la espera está acotada y que, mientras se espera, no se retiene
+    ninguna conexión del pool.
+    """
+    release, held = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_lock, args=(pg_engine, INGESTION_LOCK, release, held))
+    holder.start()
+    held.wait(5)
+    try:
+        checked_out = pg_engine.pool.checkedout()
+        with pytest.raises(RunInProgressError):
+            run_exclusive(pg_engine, "process_ingestion:7:100:1", lambda: None,
+                          timeout_secs=0.2, poll_secs=0.05, lock_scope=INGESTION_LOCK)
+        assert pg_engine.pool.checkedout() == checked_out
+    finally:
+        release.set()
+        holder.join()
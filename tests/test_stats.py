@@ -0,0 +1,112 @@
+# tests/test_stats.py
+import threading
+from collections import Counter
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from src.repositories import stats
+from src.repositories.news import upsert_news_counts
+from src.repositories.tags import load_keyword_automaton, tag_row
+
+# ---------------------------------------------------------
+# Pruebas de los agregados incrementales por día. Las de
+# concurrencia necesitan un PostgreSQL de pruebas
+# (TEST_DATABASE_URL, ver la fijura `pg_engine`).
+# ---------------------------------------------------------
+
+DAY = datetime(2025, 8, 8, 10, 0, tzinfo=timezone.utc)
+
+
+KEYWORDS = [(1, "AI", "AI"), (2, "machine learning", "AI"), (3, "marketing", "MARKETING")]
+
+
+def _automaton(fake_engine, keywords=KEYWORDS):
+    fake_engine.conn.rows = keywords
+    return load_keyword_automaton(fake_engine.conn)
+
+
+def test_count_rows_by_source_and_category(fake_engine):
+    """
+    Verifica que cada fila cuenta una vez por (día, fuente) y una vez por cada
+    categoría cuyas keywords contiene, y que se ignoran las filas sin fecha.
+    """
+    rows = [
+        {"published_at": DAY, "source_name": "BBC", "title": "AI and machine learning", "content": "marketing"},
+        {"published_at": DAY, "source_name": "BBC", "title": "Weather", "description": "rain"},
+        {"published_at": None, "source_name": "BBC", "title": "AI"},
+    ]
+    by_source, by_category = stats.count_rows(rows, _automaton(fake_engine))
+    assert by_source == Counter({(date(2025, 8, 8), "BBC"): 2})
+    assert by_category == Counter({(date(2025, 8, 8), "AI"): 1, (date(2025, 8, 8), "MARKETING"): 1})
+
+
+def test_diff_only_keeps_changed_keys():
+    """
+    Verifica que la diferencia es con signo y omite las claves sin cambios.
+    """
+    old = Counter({("d1", "BBC"): 2, ("d1", "CNN"): 1})
+    new = Counter({("d1", "BBC"): 2, ("d2", "CNN"): 1})
+    assert stats._diff(new, old) == {("d1", "CNN"): -1, ("d2", "CNN"): 1}
+
+
+def test_automaton_is_reused_until_keywords_change(fake_engine):
+    """
+    Verifica que el autómata no se recompila en cada upsert si las keywords no cambian.
+    """
+    first = _automaton(fake_engine)
+    assert _automaton(fake_engine) is first
+    assert _automaton(fake_engine, [(1, "AI", "AI")]) is not first
+
+
+def test_stats_categories_match_tags(fake_engine):
+    """
+    Verifica que las categorías que cuentan los agregados son las de las etiquetas
+    del artículo, incluidas las keywords solapadas y con guiones.
+    """
+    automaton = _automaton(fake_engine, KEYWORDS + [(4, "e-mail marketing", "MARKETING")])
+    row = {"title": "Machine-learning and e-mail marketing", "description": "AI_ops", "content": None}
+    assert stats.match_categories(row, automaton) == sorted({cat for _, cat in tag_row(row, automaton)})
+    assert stats.match_categories(row, automaton) == ["MARKETING"]
+
+
+def _article(url, **kw):
+    row = {"url": url, "title": "AI for marketing", "description": "d", "content": "c",
+           "author": "a", "published_at": DAY, "url_to_image": None, "source_id": None, "source_name": "BBC"}
+    row.update(kw)
+    return row
+
+
+def test_concurrent_upserts_of_same_new_url_count_once(pg_engine):
+    """
+    Verifica que dos transacciones que insertan a la vez la misma URL nueva la
+    cuentan una sola vez en los agregados y en `new`.
+    """
+    import pandas as pd
+    with pg_engine.begin() as conn:
+        conn.execute(text("INSERT INTO news_keywords (term, category, lang) VALUES ('AI', 'AI', 'en') "
+                          "ON CONFLICT DO NOTHING"))
+
+    batch = pd.DataFrame([_article(f"https://example.com/{i}") for i in range(50)])
+    barrier = threading.Barrier(4)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(upsert_news_counts(pg_engine, batch))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(r["new"] for r in results) == 50
+    with pg_engine.connect() as conn:
+        assert conn.execute(text("SELECT articles FROM news_stats_daily_source")).scalar() == 50
+        assert conn.execute(text("SELECT articles FROM news_stats_daily_category WHERE category = 'AI'")).scalar() == 50
+
+    # Repetir el lote (actualización sin cambios) no altera los agregados
+    assert upsert_news_counts(pg_engine, batch)["new"] == 0
+    with pg_engine.connect() as conn:
+        assert conn.execute(text("SELECT articles FROM news_stats_daily_source")).scalar() == 50
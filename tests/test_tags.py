@@ -0,0 +1,42 @@
+# tests/test_tags.py
+from src.utils.aho_corasick import AhoCorasick
+from src.repositories.tags import tag_row
+
+# ---------------------------------------------------------
+# Pruebas del etiquetado de keywords con Aho-Corasick
+# (sin BD: el autómata se construye a partir de tuplas).
+# ---------------------------------------------------------
+
+KEYWORDS = [
+    ("AI", (1, "AI")),
+    ("generative AI", (2, "AI")),
+    ("IA generativa", (3, "AI")),
+    ("aprendizaje automático", (4, "AI")),
+    ("marketing", (5, "MARKETING")),
+    ("email marketing", (6, "MARKETING")),
+]
+
+
+def test_matches_whole_words_case_insensitive():
+    """
+    Verifica que se encuentran los términos sin distinguir mayúsculas, incluidos
+    los que se solapan, y que no se aceptan coincidencias dentro de otra palabra.
+    """
+    ac = AhoCorasick(KEYWORDS)
+    assert ac.values_in("Generative ai for Email Marketing") == {(1, "AI"), (2, "AI"), (5, "MARKETING"), (6, "MARKETING")}
+    assert ac.values_in("She said the campaign was email-marketing driven") == {(5, "MARKETING")}
+    assert ac.values_in("trained models, aid, fair") == set()
+
+
+def test_tag_row_scans_all_languages_and_fields():
+    """
+    Verifica que un artículo se etiqueta con keywords de cualquier idioma
+    encontradas en título, descripción o contenido.
+    """
+    ac = AhoCorasick(KEYWORDS)
+    row = {
+        "title": "La IA generativa llega al retail",
+        "description": None,
+        "content": "Casos de aprendizaje automático en marketing… [+1200 chars]",
+    }
+    assert tag_row(row, ac) == {(3, "AI"), (4, "AI"), (5, "MARKETING")}
@@ -0,0 +1,75 @@
+# tests/test_ttl_cache.py
+import threading
+import time
+
+import pytest
+from src.utils.ttl_cache import SingleFlightCache
+
+# ---------------------------------------------------------
+# Pruebas de la caché single-flight con TTL de /preview.
+# ---------------------------------------------------------
+
+
+def test_concurrent_requests_share_one_computation():
+    """
+    Verifica que varias peticiones simultáneas de la misma clave ejecutan el
+    cálculo una sola vez y todas reciben el mismo resultado.
+    """
+    cache = SingleFlightCache(ttl_secs=60)
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"count": 3}
+
+    def worker():
+        results.append(cache.get_or_compute("k", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(value == {"count": 3} for value, _, _ in results)
+    assert sum(1 for _, cached, _ in results if not cached) == 1
+
+
+def test_expired_entries_and_errors_are_recomputed():
+    """
+    Verifica que un resultado caducado se recalcula y que los errores no se cachean.
+    """
+    cache = SingleFlightCache(ttl_secs=0.05)
+    assert cache.get_or_compute("k", lambda: 1) == (1, False, 0.0)
+    assert cache.get_or_compute("k", lambda: 2)[:2] == (1, True)
+    time.sleep(0.06)
+    assert cache.get_or_compute("k", lambda: 3)[:2] == (3, False)
+
+    def fail():
+        raise RuntimeError("NewsAPI error")
+
+    with pytest.raises(RuntimeError, match="NewsAPI error"):
+        cache.get_or_compute("err", fail)
+    assert cache.get_or_compute("err", lambda: "ok") == ("ok", False, 0.0)
+
+
+def test_followers_stop_waiting_for_a_stuck_computation():
+    """
+    Verifica que quien espera a un cálculo que no termina recibe TimeoutError
+    en lugar de quedarse bloqueado, y que el cálculo sigue su curso.
+    """
+    cache = SingleFlightCache(ttl_secs=60, wait_timeout_secs=0.05)
+    release = threading.Event()
+    leader = threading.Thread(target=cache.get_or_compute, args=("k", lambda: release.wait(5) and 1))
+    leader.start()
+    time.sleep(0.02)
+
+    with pytest.raises(TimeoutError):
+        cache.get_or_compute("k", lambda: 2)
+
+    release.set()
+    leader.join()
+    assert cache.get_or_compute("k", lambda: 2)[:2] == (1, True)